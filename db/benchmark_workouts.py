@@ -0,0 +1,194 @@
+#
+# Latency of the workout list queries on generated data
+#
+# python db/benchmark_workouts.py --workouts 10000
+# python db/benchmark_workouts.py --workouts 1000000 --runs 200
+#
+# Uses DB_URL of the application. The data is generated in a transaction which
+# is rolled back at the end, the database must be migrated to the latest version
+#
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+from sqlalchemy import and_, null, or_, select, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+import fitness_app.main  # noqa: F401 (registers all the models)
+from fitness_app.core.settings import AppSettings
+from fitness_app.exercises.catalogue import ExerciseCatalogue
+from fitness_app.workouts.models import Workout
+from fitness_app.workouts.repositories import WorkoutRepository
+
+SEED_STATEMENTS = [
+    """
+    INSERT INTO users (email, name, password_hash, role)
+    SELECT 'bench-coach-' || g || '@example.com', 'Coach ' || g, '', 'COACH'
+    FROM generate_series(1, :coaches) g
+    """,
+    """
+    INSERT INTO users (email, name, password_hash, role)
+    SELECT 'bench-customer-' || g || '@example.com', 'Customer ' || g, '', 'CUSTOMER'
+    FROM generate_series(1, :customers) g
+    """,
+    """
+    INSERT INTO coaches (speciality, user_id)
+    SELECT 'YOGA', id FROM users WHERE email LIKE 'bench-coach-%'
+    """,
+    """
+    INSERT INTO customers (user_id)
+    SELECT id FROM users WHERE email LIKE 'bench-customer-%'
+    """,
+    # Every coach gets an even share, a fifth of the workouts has no customer,
+    # one in a hundred has no owner at all
+    """
+    INSERT INTO workouts (coach_id, customer_id, name, time_start)
+    SELECT
+        CASE WHEN g % 100 = 0 THEN NULL
+            ELSE coach_ids[1 + g % cardinality(coach_ids)] END,
+        CASE WHEN g % 100 = 0 OR g % 5 = 0 THEN NULL
+            ELSE customer_ids[1 + (g / 7) % cardinality(customer_ids)] END,
+        'Workout ' || g,
+        CASE WHEN g % 50 = 1 THEN NULL
+            ELSE now() - (g % 525600) * interval '1 minute' END
+    FROM generate_series(1, :workouts) g,
+        (
+            SELECT array_agg(coaches.id) AS coach_ids FROM coaches
+            JOIN users ON users.id = coaches.user_id
+            WHERE users.email LIKE 'bench-coach-%'
+        ) AS bench_coaches,
+        (
+            SELECT array_agg(customers.id) AS customer_ids FROM customers
+            JOIN users ON users.id = customers.user_id
+            WHERE users.email LIKE 'bench-customer-%'
+        ) AS bench_customers
+    """,
+    "ANALYZE users, coaches, customers, workouts",
+]
+
+
+def previous_coach_statement(coach_id: int, size: int):
+    """The coach list before the union, for comparison"""
+    return (
+        select(Workout.id)
+        .where(
+            or_(
+                and_(Workout.coach_id == coach_id, Workout.customer_id == null()),
+                and_(Workout.coach_id == null(), Workout.customer_id == null()),
+            )
+        )
+        .order_by(Workout.time_start.asc().nulls_last(), Workout.id.asc())
+        .limit(size + 1)
+    )
+
+
+async def seed(session: AsyncSession, workouts: int):
+    parameters = {
+        "workouts": workouts,
+        "coaches": max(10, workouts // 1000),
+        "customers": max(50, workouts // 100),
+    }
+    for statement in SEED_STATEMENTS:
+        await session.execute(text(statement), parameters)
+
+    result = await session.execute(
+        text(
+            "SELECT coaches.id FROM coaches JOIN users ON users.id = coaches.user_id "
+            "WHERE users.email LIKE 'bench-coach-%'"
+        )
+    )
+    coach_ids = result.scalars().all()
+    result = await session.execute(
+        text(
+            "SELECT customers.id FROM customers "
+            "JOIN users ON users.id = customers.user_id "
+            "WHERE users.email LIKE 'bench-customer-%'"
+        )
+    )
+    return coach_ids, result.scalars().all()
+
+
+async def measure(name: str, runs: int, query):
+    timings = []
+    for _ in range(runs):
+        started_at = time.perf_counter()
+        await query()
+        timings.append((time.perf_counter() - started_at) * 1000)
+
+    timings.sort()
+    p95 = timings[max(0, int(len(timings) * 0.95) - 1)]
+    print(f"{name:<36} p50 {statistics.median(timings):8.2f} ms  p95 {p95:8.2f} ms")
+
+
+async def benchmark(workouts: int, runs: int, size: int):
+    engine = create_async_engine(AppSettings().db_url)
+    repository = WorkoutRepository(ExerciseCatalogue())
+    try:
+        async with AsyncSession(engine) as session:
+            started_at = time.perf_counter()
+            coach_ids, customer_ids = await seed(session, workouts)
+            print(
+                f"{workouts} workouts, {len(coach_ids)} coaches, "
+                f"{len(customer_ids)} customers "
+                f"(generated in {time.perf_counter() - started_at:.1f} s)"
+            )
+
+            async def previous_coach_ids():
+                statement = previous_coach_statement(random.choice(coach_ids), size)
+                (await session.execute(statement)).all()
+
+            async def coach_ids_page():
+                _, statement = repository._page_workouts(
+                    select(Workout.id),
+                    random.choice(coach_ids),
+                    None,
+                    None,
+                    0,
+                    size,
+                    None,
+                )
+                (await session.execute(statement)).all()
+
+            async def summaries(coach: bool, next_page: bool = False):
+                owner_ids = (
+                    (random.choice(coach_ids), None)
+                    if coach
+                    else (None, random.choice(customer_ids))
+                )
+                page = await repository.get_workout_summaries(
+                    session, *owner_ids, None, 0, size
+                )
+                if next_page and page.next_cursor:
+                    await repository.get_workout_summaries(
+                        session, *owner_ids, None, 0, size, page.next_cursor
+                    )
+
+            async def full_coach_page():
+                await repository.get_workouts_by_coach_id_or_customer_id(
+                    session, random.choice(coach_ids), None, None, 0, size
+                )
+                session.expunge_all()
+
+            await measure("coach ids, OR (previous)", runs, previous_coach_ids)
+            await measure("coach ids, UNION", runs, coach_ids_page)
+            await measure("coach summaries", runs, lambda: summaries(True))
+            await measure(
+                "coach summaries, two pages", runs, lambda: summaries(True, True)
+            )
+            await measure("customer summaries", runs, lambda: summaries(False))
+            await measure("coach full page", runs, full_coach_page)
+
+            await session.rollback()
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workouts", type=int, default=10000)
+    parser.add_argument("--runs", type=int, default=100)
+    parser.add_argument("--size", type=int, default=10)
+    arguments = parser.parse_args()
+    asyncio.run(benchmark(arguments.workouts, arguments.runs, arguments.size))
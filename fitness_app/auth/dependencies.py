@@ -1,10 +1,14 @@
 from typing import Annotated
 
-from fastapi import Depends
+from fastapi import Depends, Request
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
 from fitness_app.auth.permissions import BasePermission
-from fitness_app.core.dependencies import AuthServiceDep, DbSession
+from fitness_app.core.dependencies import (
+    AuthServiceDep,
+    DbManager,
+    is_primary_sticky,
+)
 from fitness_app.core.exceptions import UnauthorizedException
 from fitness_app.users.models import User
 
@@ -14,7 +18,8 @@ security_schema = HTTPBearer(
 
 
 async def authenticate_user(
-    session: DbSession,
+    request: Request,
+    db_manager: DbManager,
     auth_service: AuthServiceDep,
     credentials: Annotated[
         HTTPAuthorizationCredentials | None, Depends(security_schema)
@@ -22,7 +27,12 @@ async def authenticate_user(
 ):
     if credentials is None:
         return None
-    return await auth_service.authenticate_user(session, credentials.credentials)
+    # Looked up the same way as DbReadSession, the route session is not used
+    return await auth_service.authenticate_user(
+        db_manager,
+        credentials.credentials,
+        read_only=not is_primary_sticky(request, db_manager),
+    )
 
 
 AuthenticateUser = Annotated[User | None, Depends(authenticate_user)]
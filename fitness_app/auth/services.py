@@ -1,33 +1,95 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import UTC, datetime, timedelta
 
 import jwt
 from passlib.context import CryptContext
+from sqlalchemy import inspect
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
 
 from fitness_app.auth.schemas import (
     AuthTokenPayload,
     AuthTokenSchema,
     LoginCredentials,
 )
+from fitness_app.coaches.models import Coach
+from fitness_app.core.cache import CacheBackend, TTLCache
+from fitness_app.core.db_manager import DatabaseManager, on_commit
 from fitness_app.core.exceptions import UnauthorizedException
+from fitness_app.customers.models import Customer
+from fitness_app.users.models import User
 from fitness_app.users.repositories import UserRepository
 
 
 class PasswordService:
-    def __init__(self):
-        self._crypto_context = CryptContext(schemes=["bcrypt"])
+    """Runs bcrypt on a bounded thread pool so it never blocks the event loop"""
+
+    def __init__(self, max_workers: int = 4, bcrypt_rounds: int = 12):
+        self._crypto_context = CryptContext(
+            schemes=["bcrypt"],
+            bcrypt__rounds=bcrypt_rounds,
+            bcrypt__min_rounds=bcrypt_rounds,
+            bcrypt__max_rounds=bcrypt_rounds,
+        )
+        self._max_workers = max_workers
+        self._executor = ThreadPoolExecutor(
+            max_workers, thread_name_prefix="password-hashing"
+        )
+        self._semaphore = asyncio.Semaphore(max_workers)
+        self._active_count = 0
+        self._waiting_count = 0
+        self._max_waiting_count = 0
+        self._completed_count = 0
+
+    async def _run(self, function, *args):
+        if self._semaphore.locked():
+            self._waiting_count += 1
+            self._max_waiting_count = max(self._max_waiting_count, self._waiting_count)
+            try:
+                await self._semaphore.acquire()
+            finally:
+                self._waiting_count -= 1
+        else:
+            await self._semaphore.acquire()
+
+        self._active_count += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                self._executor, function, *args
+            )
+        finally:
+            self._active_count -= 1
+            self._completed_count += 1
+            self._semaphore.release()
+
+    async def get_password_hash(self, raw_password: str):
+        return await self._run(self._crypto_context.hash, raw_password)
+
+    async def compare_passwords(self, raw_password: str, hashed_password: str):
+        """Returns whether the password matches and a new hash if it needs rehash"""
+        return await self._run(
+            self._crypto_context.verify_and_update, raw_password, hashed_password
+        )
 
-    def get_password_hash(self, raw_password: str):
-        return self._crypto_context.hash(raw_password)
+    def get_stats(self):
+        return {
+            "max_workers": self._max_workers,
+            "active": self._active_count,
+            "waiting": self._waiting_count,
+            "max_waiting": self._max_waiting_count,
+            "completed_count": self._completed_count,
+        }
 
-    def compare_passwords(self, raw_password: str, hashed_password: str):
-        return self._crypto_context.verify(raw_password, hashed_password)
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
 
 
 class TokenService:
-    def __init__(self, secret_key: str, token_lifetime: int):
+    def __init__(self, secret_key: str, token_lifetime: int, cache_size: int = 10000):
         self._secret_key = secret_key
         self._token_lifetime = token_lifetime
+        self._verified_tokens = TTLCache(cache_size, token_lifetime)
 
     def create_auth_token(self, payload: AuthTokenPayload):
         claims = {"exp": datetime.now(UTC) + timedelta(seconds=self._token_lifetime)}
@@ -36,18 +98,86 @@ class TokenService:
         return jwt.encode(claims, self._secret_key, algorithm="HS256")
 
     def verify_auth_token(self, token: str):
+        payload = self._verified_tokens.get(token)
+        if payload is not None:
+            return payload
+
         try:
-            payload = jwt.decode(
+            claims = jwt.decode(
                 token,
                 self._secret_key,
                 algorithms=["HS256"],
                 options={"required": ["exp"], "verify_exp": True},
                 leeway=0.0,
             )
-            return AuthTokenPayload.model_validate(payload)
         except jwt.InvalidTokenError:
             return None
 
+        payload = AuthTokenPayload.model_validate(claims)
+        self._verified_tokens.set(
+            token, payload, claims["exp"] - datetime.now(UTC).timestamp()
+        )
+        return payload
+
+
+class PrincipalCache:
+    """Caches authenticated users together with their coach and customer info"""
+
+    def __init__(self, backend: CacheBackend):
+        self._backend = backend
+
+    @staticmethod
+    def _key(user_id: int):
+        return f"principal:{user_id}"
+
+    @staticmethod
+    def _dump(instance):
+        state = inspect(instance)
+        return {
+            column.key: state.dict[column.key]
+            for column in state.mapper.column_attrs
+            if column.key in state.dict
+        }
+
+    async def get(self, user_id: int):
+        """Detached instances, which a session of the request attaches when the
+        principal is changed"""
+        principal = await self._backend.get(self._key(user_id))
+        if principal is None:
+            return None
+
+        user = User(**principal["user"])
+        user.coach_info = (
+            Coach(**principal["coach_info"]) if principal["coach_info"] else None
+        )
+        user.customer_info = (
+            Customer(**principal["customer_info"])
+            if principal["customer_info"]
+            else None
+        )
+        for instance in (user, user.coach_info, user.customer_info):
+            if instance is not None:
+                make_transient_to_detached(instance)
+
+        return user
+
+    async def set(self, user: User):
+        principal = {
+            "user": self._dump(user),
+            "coach_info": self._dump(user.coach_info) if user.coach_info else None,
+            "customer_info": (
+                self._dump(user.customer_info) if user.customer_info else None
+            ),
+        }
+        await self._backend.set(self._key(user.id), principal)
+
+    async def invalidate(self, session: AsyncSession, user_id: int):
+        key = self._key(user_id)
+        # Deleted again after the commit, in case a concurrent request cached the
+        # principal before the change became visible
+        await self._backend.delete(key)
+        on_commit(session, lambda: self._backend.delete(key))
+
 
 class AuthService:
     def __init__(
@@ -55,33 +185,52 @@ class AuthService:
         password_service: PasswordService,
         token_service: TokenService,
         user_repository: UserRepository,
+        principal_cache: PrincipalCache,
     ):
         self._password_service = password_service
         self._token_service = token_service
         self._user_repository = user_repository
+        self._principal_cache = principal_cache
 
     async def login_user(self, session: AsyncSession, credentials: LoginCredentials):
         user = await self._user_repository.get_by_email(session, credentials.email)
         if user is None:
             raise UnauthorizedException()
 
-        if not self._password_service.compare_passwords(
+        is_valid, new_password_hash = await self._password_service.compare_passwords(
             credentials.password, user.password_hash
-        ):
+        )
+        if not is_valid:
             raise UnauthorizedException()
 
+        if new_password_hash is not None:
+            user.password_hash = new_password_hash
+            await self._user_repository.save(session, user)
+            await self._principal_cache.invalidate(session, user.id)
+
         payload = AuthTokenPayload(user_id=user.id)
         token = self._token_service.create_auth_token(payload)
 
         return AuthTokenSchema(token=token)
 
-    async def authenticate_user(self, session: AsyncSession, token: str):
+    async def authenticate_user(
+        self, db_manager: DatabaseManager, token: str, read_only: bool = True
+    ):
+        """Returns a detached user, a session is only opened on a cache miss"""
         payload = self._token_service.verify_auth_token(token)
         if payload is None:
             raise UnauthorizedException()
 
-        user = await self._user_repository.get_by_id(session, payload.user_id)
+        user = await self._principal_cache.get(payload.user_id)
+        if user is not None:
+            return user
+
+        async with db_manager.create_session(
+            read_only=read_only, unit_of_work=False
+        ) as session:
+            user = await self._user_repository.get_by_id(session, payload.user_id)
         if user is None:
             raise UnauthorizedException()
 
+        await self._principal_cache.set(user)
         return user
@@ -0,0 +1,37 @@
+from typing import Iterable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from fitness_app.core.cache import TTLCache
+from fitness_app.core.db_manager import on_commit
+
+
+class ChatMembershipCache:
+    """Short-lived per-process cache of confirmed chat memberships.
+
+    Only positive answers are kept, a failed check always goes to the database.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self._memberships = TTLCache(max_size, ttl)
+
+    def is_member(self, chat_id: int, user_id: int) -> bool:
+        return self._memberships.get((chat_id, user_id), False)
+
+    def add(self, chat_id: int, user_id: int):
+        self._memberships.set((chat_id, user_id), True)
+
+    def invalidate(self, session: AsyncSession, chat_id: int, user_ids: Iterable[int]):
+        keys = [(chat_id, user_id) for user_id in user_ids]
+
+        def delete():
+            for key in keys:
+                self._memberships.delete(key)
+
+        # Dropped again after the commit, in case a concurrent check cached the
+        # membership before the change became visible
+        delete()
+        on_commit(session, delete)
+
+    def __len__(self):
+        return len(self._memberships)
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 
 from sqlalchemy import ForeignKey, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
@@ -15,10 +15,14 @@ if TYPE_CHECKING:
 
 class Chat(Base):
     __tablename__ = "chats"
-    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    id: Mapped[int] = mapped_column(primary_key=True)
     last_timestamp: Mapped[datetime] = mapped_column(
         default=datetime.now, server_default=func.now()
     )
+    messages_count: Mapped[int] = mapped_column(default=0, server_default="0")
+    # Ordered member ids of a dialogue, unique together
+    dialogue_user1_id: Mapped[Optional[int]] = mapped_column(nullable=True)
+    dialogue_user2_id: Mapped[Optional[int]] = mapped_column(nullable=True)
 
     workout: Mapped["Workout"] = relationship(back_populates="chat")
     users: Mapped[list["User"]] = relationship(
@@ -35,3 +39,5 @@ class ChatsUsers(Base):
     id: Mapped[int] = mapped_column(primary_key=True)
     chat_id: Mapped[int] = mapped_column(ForeignKey("chats.id"))
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"))
+    last_read_message_id: Mapped[Optional[int]] = mapped_column(nullable=True)
+    read_messages_count: Mapped[int] = mapped_column(default=0, server_default="0")
@@ -1,8 +1,25 @@
-from sqlalchemy import func, select
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import (
+    case,
+    exists,
+    func,
+    literal,
+    literal_column,
+    select,
+    true,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import array, insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload, selectinload
+from sqlalchemy.orm import aliased, selectinload
 
 from fitness_app.chats.models import Chat, ChatsUsers
+from fitness_app.chats.schemas import ChatType
+from fitness_app.core.pagination import CountMode, Keyset, KeysetKey, count_rows
+from fitness_app.messages.models import Message
 from fitness_app.users.models import User
 
 
@@ -11,14 +28,121 @@ class ChatRepository:
     async def save(self, session: AsyncSession, chat: Chat):
         session.add(chat)
         await session.flush()
-        await session.commit()
         return chat
 
     async def delete(self, session: AsyncSession, chat: Chat):
         await session.delete(chat)
-        await session.commit()
+        await session.flush()
         return chat
 
+    async def increment_messages_count(
+        self, session: AsyncSession, chat_id: int, last_timestamp: datetime
+    ):
+        statement = (
+            update(Chat)
+            .where(Chat.id == chat_id)
+            .values(
+                messages_count=Chat.messages_count + 1, last_timestamp=last_timestamp
+            )
+        )
+        await session.execute(statement)
+
+    async def update_last_timestamp(
+        self, session: AsyncSession, chat_id: int, last_timestamp: datetime
+    ):
+        statement = (
+            update(Chat).where(Chat.id == chat_id).values(last_timestamp=last_timestamp)
+        )
+        await session.execute(statement)
+
+    async def get_messages_count(self, session: AsyncSession, chat_id: int):
+        statement = select(Chat.messages_count).where(Chat.id == chat_id)
+        result = await session.execute(statement)
+        return result.scalar_one()
+
+    async def check_membership(
+        self, session: AsyncSession, chat_id: int, user_id: int
+    ) -> Optional[bool]:
+        """None when the chat does not exist, otherwise whether the user is
+        a member. Both are answered by primary key and index lookups."""
+        statement = select(
+            exists()
+            .where(ChatsUsers.chat_id == Chat.id, ChatsUsers.user_id == user_id)
+            .label("is_member")
+        ).where(Chat.id == chat_id)
+        result = await session.execute(statement)
+        return result.scalar_one_or_none()
+
+    async def update_read_cursor(
+        self,
+        session: AsyncSession,
+        chat_id: int,
+        user_id: int,
+        message_id: Optional[int] = None,
+    ):
+        """Moves the member's read cursor to the message (the latest one by
+        default), never backwards. Returns the cursor and the unread count, or
+        None when the user is not a member or the message is not in the chat."""
+        ordering = (Message.timestamp.desc(), Message.id.desc())
+        if message_id is None:
+            last_read_message_id = (
+                select(Message.id)
+                .where(Message.chat_id == chat_id)
+                .order_by(*ordering)
+                .limit(1)
+                .scalar_subquery()
+            )
+            read_messages_count = Chat.messages_count
+        else:
+            message_timestamp = (
+                select(Message.timestamp)
+                .where(Message.id == message_id, Message.chat_id == chat_id)
+                .scalar_subquery()
+            )
+            # Only the messages after the cursor are counted, which is cheap
+            # with the (chat_id, timestamp, id) index
+            unread_messages_count = (
+                select(func.count())
+                .where(Message.chat_id == chat_id)
+                .where(
+                    tuple_(Message.timestamp, Message.id)
+                    > tuple_(message_timestamp, message_id)
+                )
+                .scalar_subquery()
+            )
+            last_read_message_id = literal(message_id)
+            read_messages_count = Chat.messages_count - unread_messages_count
+
+        statement = (
+            update(ChatsUsers)
+            .where(ChatsUsers.chat_id == Chat.id)
+            .where(ChatsUsers.chat_id == chat_id, ChatsUsers.user_id == user_id)
+            .values(
+                last_read_message_id=case(
+                    (
+                        read_messages_count >= ChatsUsers.read_messages_count,
+                        last_read_message_id,
+                    ),
+                    else_=ChatsUsers.last_read_message_id,
+                ),
+                read_messages_count=func.greatest(
+                    ChatsUsers.read_messages_count, read_messages_count
+                ),
+            )
+            .returning(
+                ChatsUsers.last_read_message_id,
+                (Chat.messages_count - ChatsUsers.read_messages_count).label(
+                    "unread_messages_count"
+                ),
+            )
+        )
+        if message_id is not None:
+            statement = statement.where(
+                exists().where(Message.id == message_id, Message.chat_id == chat_id)
+            )
+        result = await session.execute(statement)
+        return result.one_or_none()
+
     async def get_with_users_by_chat_id(
         self, session: AsyncSession, chat_id: int
     ) -> Chat:
@@ -28,51 +152,75 @@ class ChatRepository:
         result = await session.execute(statement)
         return result.scalar_one_or_none()
 
-    async def is_exist_by_users(
-        self, session: AsyncSession, user1: User, user2: User
-    ) -> Chat:
-        subquery1 = select(ChatsUsers.chat_id).where(ChatsUsers.user_id == user1.id)
-        subquery2 = select(ChatsUsers.chat_id).where(ChatsUsers.user_id == user2.id)
-        statement = (
-            select(Chat)
-            .where(Chat.id.in_(subquery1))
-            .where(Chat.id.in_(subquery2))
-            .where(Chat.type == "DIALOGUE")
+    @staticmethod
+    def _dialogue_key(user1_id: int, user2_id: int):
+        return tuple(sorted((user1_id, user2_id)))
+
+    async def get_or_create_dialogue(
+        self, session: AsyncSession, user1_id: int, user2_id: int
+    ) -> tuple[int, bool]:
+        """Returns the id of the dialogue between the users and whether it was
+        created. A single statement, concurrent calls get the same chat."""
+        dialogue_user1_id, dialogue_user2_id = self._dialogue_key(user1_id, user2_id)
+        insert_chat = insert(Chat).values(
+            type=ChatType.DIALOGUE,
+            dialogue_user1_id=dialogue_user1_id,
+            dialogue_user2_id=dialogue_user2_id,
+        )
+        chat = (
+            insert_chat.on_conflict_do_update(
+                index_elements=[Chat.dialogue_user1_id, Chat.dialogue_user2_id],
+                # A no-op update, so RETURNING also yields an existing row
+                set_={"dialogue_user1_id": insert_chat.excluded.dialogue_user1_id},
+            )
+            # xmax is only zero for a freshly inserted row
+            .returning(Chat.id, literal_column("xmax = 0").label("created")).cte("chat")
         )
+        members = (
+            insert(ChatsUsers)
+            .from_select(
+                [ChatsUsers.chat_id, ChatsUsers.user_id],
+                select(
+                    chat.c.id,
+                    func.unnest(array([dialogue_user1_id, dialogue_user2_id])),
+                ).where(chat.c.created),
+                # Server defaults fill the rest, bound defaults are not
+                # rendered within a CTE
+                include_defaults=False,
+            )
+            .cte("members")
+        )
+        statement = select(chat.c.id, chat.c.created).add_cte(members)
         result = await session.execute(statement)
-        chat = result.scalar_one_or_none()
-        return chat is not None
+        return tuple(result.one())
 
-    async def get_with_users_by_users(
-        self, session: AsyncSession, user1: User, user2: User
-    ) -> Chat:
-        subquery1 = select(ChatsUsers.chat_id).where(ChatsUsers.user_id == user1.id)
-        subquery2 = select(ChatsUsers.chat_id).where(ChatsUsers.user_id == user2.id)
+    async def get_dialogue_with_users(
+        self, session: AsyncSession, user1_id: int, user2_id: int
+    ) -> Optional[Chat]:
+        dialogue_user1_id, dialogue_user2_id = self._dialogue_key(user1_id, user2_id)
         statement = (
             select(Chat)
-            .where(Chat.id.in_(subquery1))
-            .where(Chat.id.in_(subquery2))
-            .where(Chat.type == "DIALOGUE")
+            .where(Chat.dialogue_user1_id == dialogue_user1_id)
+            .where(Chat.dialogue_user2_id == dialogue_user2_id)
             .options(selectinload(Chat.users))
         )
         result = await session.execute(statement)
-
         return result.scalar_one_or_none()
 
     async def count_chats(
         self,
         session: AsyncSession,
         user_id: int,
+        count_mode: CountMode = CountMode.EXACT,
     ):
         statement = (
-            select(func.count(Chat.id))
+            select(Chat.id)
             .select_from(User)
             .join(User.chats)
             .where(User.id == user_id)
             .where(Chat.type == "DIALOGUE")
         )
-        result = await session.execute(statement)
-        return result.scalar_one()
+        return await count_rows(session, statement, count_mode)
 
     async def get_chats(
         self,
@@ -80,16 +228,41 @@ class ChatRepository:
         user_id: int,
         page: int,
         size: int,
+        cursor: Optional[str] = None,
     ):
+        keyset = Keyset(
+            KeysetKey(Chat.last_timestamp, descending=True),
+            KeysetKey(Chat.id, descending=True),
+        )
+        # The latest message of every chat on the page is a single index probe
+        last_message = aliased(
+            Message,
+            select(Message)
+            .where(Message.chat_id == Chat.id)
+            .order_by(Message.timestamp.desc(), Message.id.desc())
+            .limit(1)
+            .lateral("last_message"),
+        )
         statement = (
-            select(Chat)
-            .join(Chat.users)
-            .where(User.id == user_id)
+            select(
+                Chat,
+                last_message,
+                (Chat.messages_count - ChatsUsers.read_messages_count).label(
+                    "unread_messages_count"
+                ),
+            )
+            .join(ChatsUsers, ChatsUsers.chat_id == Chat.id)
+            .outerjoin(last_message, true())
+            .where(ChatsUsers.user_id == user_id)
             .where(Chat.type == "DIALOGUE")
-            .order_by(Chat.last_timestamp.desc())
-            .offset(page * size)
-            .limit(size)
-            .options(joinedload(Chat.users))
+            .options(selectinload(Chat.users))
         )
+        statement = keyset.apply(statement, page, size, cursor)
         result = await session.execute(statement)
-        return result.unique().scalars().all()
+
+        chats = []
+        for chat, chat_last_message, unread_messages_count in result:
+            chat.last_message = chat_last_message
+            chat.unread_messages_count = unread_messages_count
+            chats.append(chat)
+        return keyset.get_page(chats, size)
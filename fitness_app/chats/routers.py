@@ -2,10 +2,22 @@ from fastapi import APIRouter, Depends
 
 from fitness_app.auth.dependencies import AuthenticateUser, HasPermission
 from fitness_app.auth.permissions import Authenticated
-from fitness_app.chats.schemas import ChatSchema
+from fitness_app.chats.schemas import (
+    ChatListItemSchema,
+    ChatReadCreateSchema,
+    ChatReadSchema,
+    ChatSchema,
+)
 from fitness_app.core.dependencies import ChatServiceDep, DbSession
+from fitness_app.core.pagination import CountMode
 from fitness_app.core.schemas import PageSchema
-from fitness_app.core.utils import IdField, PageField, SizeField
+from fitness_app.core.utils import (
+    CountField,
+    CursorField,
+    IdField,
+    PageField,
+    SizeField,
+)
 
 chats_router = APIRouter(prefix="/chats", tags=["Чаты"])
 
@@ -22,11 +34,14 @@ async def get_all(
     user: AuthenticateUser,
     page: PageField = 0,
     size: SizeField = 10,
+    cursor: CursorField = None,
+    count: CountField = CountMode.EXACT,
 ):
-    chats = await service.get_chats_by_user(session, user, page, size)
+    chats = await service.get_chats_by_user(session, user, page, size, cursor, count)
     return PageSchema(
         total_items_count=chats.total_items_count,
-        items=list(map(ChatSchema.model_validate, chats.items)),
+        items=list(map(ChatListItemSchema.model_validate, chats.items)),
+        next_cursor=chats.next_cursor,
     )
 
 
@@ -46,6 +61,22 @@ async def get_by_chat_id(
     return ChatSchema.model_validate(chat)
 
 
+@chats_router.post(
+    "/chat/{chat_id}/read",
+    response_model=ChatReadSchema,
+    summary="Отметить сообщения чата прочитанными (по умолчанию все)",
+    dependencies=[Depends(HasPermission(Authenticated()))],
+)
+async def mark_as_read(
+    session: DbSession,
+    service: ChatServiceDep,
+    user: AuthenticateUser,
+    chat_id: IdField,
+    read_schema: ChatReadCreateSchema = ChatReadCreateSchema(),
+):
+    return await service.mark_as_read(session, user, chat_id, read_schema.message_id)
+
+
 @chats_router.get(
     "/user/{user_id}",
     response_model=ChatSchema,
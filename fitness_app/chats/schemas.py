@@ -1,8 +1,10 @@
 from datetime import datetime
 from enum import StrEnum
+from typing import Optional
 
 from pydantic import BaseModel, ConfigDict
 
+from fitness_app.messages.schemas import MessageSchema
 from fitness_app.users.schemas import UserSchema
 
 
@@ -21,3 +23,19 @@ class ChatSchema(ChatCreateSchema):
     id: int
     users: list[UserSchema]
     last_timestamp: datetime
+
+
+class ChatListItemSchema(ChatSchema):
+    last_message: Optional[MessageSchema] = None
+    unread_messages_count: int = 0
+
+
+class ChatReadCreateSchema(BaseModel):
+    message_id: Optional[int] = None
+
+
+class ChatReadSchema(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    last_read_message_id: Optional[int]
+    unread_messages_count: int
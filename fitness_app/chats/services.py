@@ -1,44 +1,45 @@
+from datetime import datetime
+from typing import Optional
+
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from fitness_app.chats.membership import ChatMembershipCache
 from fitness_app.chats.models import Chat
 from fitness_app.chats.repositories import ChatRepository
-from fitness_app.chats.schemas import ChatCreateSchema, ChatSchema, ChatType
+from fitness_app.chats.schemas import (
+    ChatCreateSchema,
+    ChatReadSchema,
+    ChatSchema,
+    ChatType,
+)
 from fitness_app.core.exceptions import (
     BadRequestException,
     EntityNotFoundException,
     ForbiddenException,
 )
+from fitness_app.core.pagination import CountMode
 from fitness_app.core.schemas import PageSchema
 from fitness_app.users.models import User
-from fitness_app.users.schemas import UserSchema
-from fitness_app.users.services import UserService
 
 
 class ChatService:
     def __init__(
         self,
         chat_repository: ChatRepository,
-        user_service: UserService,
+        membership_cache: ChatMembershipCache,
     ):
         self._chat_repository = chat_repository
-        self._user_service = user_service
-
-    async def create(
-        self,
-        session: AsyncSession,
-        users: list,
-        type: ChatType = "DIALOGUE",
-    ):
-        if not await self._chat_repository.is_exist_by_users(
-            session, users[0], users[1]
-        ):
-            chat_create_schema = ChatCreateSchema(type=type)
-            chat = Chat(**chat_create_schema.model_dump())
-            chat.users = users
-            chat.messages = []
-
-            return await self._chat_repository.save(session, chat)
-        return await self.get_by_user_id(session, users[0], users[1].id)
+        self._membership_cache = membership_cache
+
+    async def create(self, session: AsyncSession, users: list[User]) -> int:
+        """Gets or creates the dialogue between two users, returns its id"""
+        user_ids = [user.id for user in users]
+        chat_id, created = await self._chat_repository.get_or_create_dialogue(
+            session, *user_ids
+        )
+        if created:
+            self._membership_cache.invalidate(session, chat_id, user_ids)
+        return chat_id
 
     async def create_new(
         self,
@@ -51,7 +52,14 @@ class ChatService:
         chat.users = users
         chat.messages = []
 
-        return await self._chat_repository.save(session, chat)
+        chat = await self._chat_repository.save(session, chat)
+        self._invalidate_members(session, chat)
+        return chat
+
+    def _invalidate_members(self, session: AsyncSession, chat: Chat):
+        self._membership_cache.invalidate(
+            session, chat.id, [user.id for user in chat.users]
+        )
 
     async def get_by_chat_id(
         self,
@@ -62,7 +70,7 @@ class ChatService:
         chat = await self._chat_repository.get_with_users_by_chat_id(session, chat_id)
         if chat is None:
             raise EntityNotFoundException("Chat with given id was not found")
-        if user not in chat.users:
+        if user.id not in {member.id for member in chat.users}:
             raise ForbiddenException("Authenticated user is not a member of this chat")
 
         return chat
@@ -70,37 +78,93 @@ class ChatService:
     async def get_by_user_id(self, session: AsyncSession, user: User, user_id: int):
         if user.id == user_id:
             raise BadRequestException("Given user id equals to authorized uzer")
-        user2 = await self._user_service.get_by_id(session, user_id)
-        chat = await self._chat_repository.get_with_users_by_users(session, user, user2)
+        chat = await self._chat_repository.get_dialogue_with_users(
+            session, user.id, user_id
+        )
         if chat is None:
             raise EntityNotFoundException("Chat with given user was not found")
 
         return chat
 
     async def is_accessed_chat(self, session: AsyncSession, user: User, chat_id: int):
-        chat = await self._chat_repository.get_with_users_by_chat_id(session, chat_id)
-        if chat is None:
+        if self._membership_cache.is_member(chat_id, user.id):
+            return True
+
+        is_member = await self._chat_repository.check_membership(
+            session, chat_id, user.id
+        )
+        if is_member is None:
             raise EntityNotFoundException("Chat with given id was not found")
-        if user not in chat.users:
+        if not is_member:
             raise ForbiddenException("Authenticated user is not a member of this chat")
 
+        self._membership_cache.add(chat_id, user.id)
         return True
 
+    async def increment_messages_count(
+        self, session: AsyncSession, chat_id: int, last_timestamp: datetime
+    ):
+        await self._chat_repository.increment_messages_count(
+            session, chat_id, last_timestamp
+        )
+
+    async def update_last_timestamp(
+        self, session: AsyncSession, chat_id: int, last_timestamp: datetime
+    ):
+        await self._chat_repository.update_last_timestamp(
+            session, chat_id, last_timestamp
+        )
+
+    async def get_messages_count(self, session: AsyncSession, chat_id: int):
+        return await self._chat_repository.get_messages_count(session, chat_id)
+
     async def get_chats_by_user(
         self,
         session: AsyncSession,
         user: User,
         page: int,
         size: int,
+        cursor: Optional[str] = None,
+        count_mode: CountMode = CountMode.EXACT,
+    ):
+        total_chats_count = await self._chat_repository.count_chats(
+            session, user.id, count_mode
+        )
+        chats = await self._chat_repository.get_chats(
+            session, user.id, page, size, cursor
+        )
+        return PageSchema(
+            total_items_count=total_chats_count,
+            items=chats.items,
+            next_cursor=chats.next_cursor,
+        )
+
+    async def mark_as_read(
+        self,
+        session: AsyncSession,
+        user: User,
+        chat_id: int,
+        message_id: Optional[int] = None,
+    ) -> ChatReadSchema:
+        await self.is_accessed_chat(session, user, chat_id)
+        read_cursor = await self.update_read_cursor(
+            session, user.id, chat_id, message_id
+        )
+        if read_cursor is None:
+            raise EntityNotFoundException("Message with given id was not found")
+
+        return ChatReadSchema.model_validate(read_cursor)
+
+    async def update_read_cursor(
+        self,
+        session: AsyncSession,
+        user_id: int,
+        chat_id: int,
+        message_id: Optional[int] = None,
     ):
-        total_chats_count = await self._chat_repository.count_chats(session, user.id)
-        chats = await self._chat_repository.get_chats(session, user.id, page, size)
-        chat_dicts = [chat.__dict__ for chat in chats]
-        for chat_dict in chat_dicts:
-            chat_dict["users"] = [
-                UserSchema.model_validate(user) for user in chat_dict["users"]
-            ]
-        return PageSchema(total_items_count=total_chats_count, items=chat_dicts)
+        return await self._chat_repository.update_read_cursor(
+            session, chat_id, user_id, message_id
+        )
 
     async def delete_by_id(
         self, session: AsyncSession, user: User, chat_id: int
@@ -108,5 +172,6 @@ class ChatService:
         chat = await self.get_by_chat_id(session, user, chat_id)
         schema = ChatSchema(**chat.__dict__)
 
+        self._invalidate_members(session, chat)
         await self._chat_repository.delete(session, chat)
         return schema
@@ -1,8 +1,11 @@
+from typing import Optional
+
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
 
 from fitness_app.coaches.models import Coach
+from fitness_app.core.pagination import CountMode, Keyset, KeysetKey, count_rows
 from fitness_app.customers.models import Customer
 from fitness_app.feedbacks.models import Feedback
 from fitness_app.users.models import CoachesCustomers
@@ -12,18 +15,17 @@ class CoachRepository:
     async def save(self, session: AsyncSession, coach: Coach):
         session.add(coach)
         await session.flush()
-        await session.commit()
         new_score = await self.get_average_rating(session, coach.id)
         if new_score is None:
             setattr(coach, "rating", 5)
         else:
             setattr(coach, "rating", new_score)
-        await session.commit()
+        await session.flush()
         return coach
 
     async def delete(self, session: AsyncSession, coach: Coach):
         await session.delete(coach)
-        await session.commit()
+        await session.flush()
         return coach
 
     async def get_all(
@@ -31,10 +33,12 @@ class CoachRepository:
         session: AsyncSession,
         page: int,
         size: int,
+        cursor: Optional[str] = None,
     ):
-        statement = select(Coach).order_by(Coach.id).offset(page * size).limit(size)
+        keyset = Keyset(KeysetKey(Coach.id))
+        statement = keyset.apply(select(Coach), page, size, cursor)
         result = await session.execute(statement)
-        return result.scalars().all()
+        return keyset.get_page(result.scalars().all(), size)
 
     async def get_by_id(
         self,
@@ -53,34 +57,35 @@ class CoachRepository:
         coach_id: int,
         page: int,
         size: int,
+        cursor: Optional[str] = None,
     ):
+        keyset = Keyset(KeysetKey(Customer.id))
         statement = (
             select(Customer)
             .join(CoachesCustomers, Customer.id == CoachesCustomers.customer_id)
             .where(CoachesCustomers.coach_id == coach_id)
-            .offset(page * size)
-            .limit(size)
         )
+        statement = keyset.apply(statement, page, size, cursor)
         result = await session.execute(statement)
-        return result.scalars().all()
+        return keyset.get_page(result.scalars().all(), size)
 
-    async def count_coaches_by_user_id(self, session: AsyncSession, coach_id: int):
-        statement = (
-            select(func.count(Customer.id))
-            .join(Coach.customers)
-            .where(Coach.id == coach_id)
+    async def count_coaches_by_user_id(
+        self,
+        session: AsyncSession,
+        coach_id: int,
+        count_mode: CountMode = CountMode.EXACT,
+    ):
+        statement = select(CoachesCustomers.customer_id).where(
+            CoachesCustomers.coach_id == coach_id
         )
-
-        result = await session.execute(statement)
-        return result.scalar_one()
+        return await count_rows(session, statement, count_mode)
 
     async def count_all(
         self,
         session: AsyncSession,
+        count_mode: CountMode = CountMode.EXACT,
     ):
-        statement = select(func.count()).select_from(Coach)
-        result = await session.execute(statement)
-        return result.scalar_one()
+        return await count_rows(session, select(Coach.id), count_mode)
 
     async def get_average_rating(self, session: AsyncSession, coach_id: int):
         statement = select(func.avg(Feedback.score)).where(
@@ -9,8 +9,15 @@ from fitness_app.coaches.schemas import (
     CoachUpdateSchema,
 )
 from fitness_app.core.dependencies import CoachServiceDep, DbSession
+from fitness_app.core.pagination import CountMode
 from fitness_app.core.schemas import PageSchema
-from fitness_app.core.utils import IdField, PageField, SizeField
+from fitness_app.core.utils import (
+    CountField,
+    CursorField,
+    IdField,
+    PageField,
+    SizeField,
+)
 from fitness_app.users.schemas import UserSchema
 
 coaches_router = APIRouter(prefix="/coaches", tags=["Тренеры"])
@@ -27,11 +34,14 @@ async def get_all(
     service: CoachServiceDep,
     page: PageField = 0,
     size: SizeField = 10,
+    cursor: CursorField = None,
+    count: CountField = CountMode.EXACT,
 ):
-    coaches = await service.get_all(session, page, size)
+    coaches = await service.get_all(session, page, size, cursor, count)
     return PageSchema(
         total_items_count=coaches.total_items_count,
         items=list(map(CoachSchema.model_validate, coaches.items)),
+        next_cursor=coaches.next_cursor,
     )
 
 
@@ -122,8 +132,12 @@ async def get_coaches(
     session: DbSession,
     page: PageField = 0,
     size: SizeField = 10,
+    cursor: CursorField = None,
+    count: CountField = CountMode.EXACT,
 ):
-    customers = await service.get_customers_by_user(session, user, page, size)
+    customers = await service.get_customers_by_user(
+        session, user, page, size, cursor, count
+    )
     return customers
 
 
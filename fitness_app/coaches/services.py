@@ -1,5 +1,8 @@
+from typing import Optional
+
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from fitness_app.auth.services import PrincipalCache
 from fitness_app.chats.services import ChatService
 from fitness_app.coaches.models import Coach
 from fitness_app.coaches.repositories import CoachRepository
@@ -9,6 +12,7 @@ from fitness_app.coaches.schemas import (
     CoachUpdateSchema,
 )
 from fitness_app.core.exceptions import EntityNotFoundException
+from fitness_app.core.pagination import CountMode
 from fitness_app.core.schemas import PageSchema
 from fitness_app.core.utils import update_model_by_schema
 from fitness_app.customers.models import Customer
@@ -26,11 +30,13 @@ class CoachService:
         user_repository: UserRepository,
         user_service: UserService,
         chat_service: ChatService,
+        principal_cache: PrincipalCache,
     ):
         self._coach_repository = coach_repository
         self._user_repository = user_repository
         self._user_service = user_service
         self._chat_service = chat_service
+        self._principal_cache = principal_cache
 
     async def create(self, session: AsyncSession, schema: CoachCreateSchema):
         userSchema = UserCreateSchema(**schema.model_dump())
@@ -52,12 +58,18 @@ class CoachService:
         session: AsyncSession,
         page: int,
         size: int,
+        cursor: Optional[str] = None,
+        count_mode: CountMode = CountMode.EXACT,
     ):
         total_products_count = await self._coach_repository.count_all(
-            session,
+            session, count_mode
+        )
+        coaches = await self._coach_repository.get_all(session, page, size, cursor)
+        return PageSchema(
+            total_items_count=total_products_count,
+            items=coaches.items,
+            next_cursor=coaches.next_cursor,
         )
-        coaches = await self._coach_repository.get_all(session, page, size)
-        return PageSchema(total_items_count=total_products_count, items=coaches)
 
     async def get_current(self, user: User):
         if user is None:
@@ -90,6 +102,7 @@ class CoachService:
             raise EntityNotFoundException("Coach with given id was not found")
 
         update_model_by_schema(coach, schema)
+        await self._principal_cache.invalidate(session, user.id)
 
         return await self._coach_repository.save(session, coach)
 
@@ -99,18 +112,21 @@ class CoachService:
         user: User,
         page: int,
         size: int,
+        cursor: Optional[str] = None,
+        count_mode: CountMode = CountMode.EXACT,
     ):
         if user.coach_info is None:
             raise EntityNotFoundException("User with given id is not a coach")
         own_coaches_count = await self._coach_repository.count_coaches_by_user_id(
-            session, user.coach_info.id
+            session, user.coach_info.id, count_mode
         )
         coaches = await self._coach_repository.get_coaches_by_id(
-            session, user.coach_info.id, page, size
+            session, user.coach_info.id, page, size, cursor
         )
         return PageSchema(
             total_items_count=own_coaches_count,
-            items=list(map(CustomerSchema.model_validate, coaches)),
+            items=list(map(CustomerSchema.model_validate, coaches.items)),
+            next_cursor=coaches.next_cursor,
         )
 
     async def assign_customer(
@@ -141,5 +157,6 @@ class CoachService:
         if coach is None:
             raise EntityNotFoundException("Coach with given id was not found")
         self._user_service.delete_by_id(session, coach.user_id)
+        await self._principal_cache.invalidate(session, coach.user_id)
 
         return await self._coach_repository.delete(session, coach)
@@ -1,64 +1,214 @@
-# flake8: noqa F401
+import inspect
+import itertools
 import logging
+import time
 from contextlib import asynccontextmanager
+from typing import Awaitable, Callable, Optional
 
-from sqlalchemy.ext.asyncio import AsyncAttrs, async_sessionmaker, create_async_engine
+from sqlalchemy.ext.asyncio import (
+    AsyncAttrs,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from fitness_app.core.migrations import SchemaMigrator
 
 
 class Base(AsyncAttrs, DeclarativeBase):
     pass
 
 
+def on_commit(session: AsyncSession, callback: Callable[[], Optional[Awaitable[None]]]):
+    """Runs the callback once the unit of work of the session is committed,
+    a returned awaitable is awaited"""
+    session.info.setdefault("on_commit", []).append(callback)
+
+
+async def _run_commit_callbacks(session: AsyncSession):
+    for callback in session.info.pop("on_commit", []):
+        try:
+            result = callback()
+            if inspect.isawaitable(result):
+                await result
+        except Exception as ex:
+            logging.error("Exception occurred in commit callback", exc_info=ex)
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool which records how long callers waited for a connection"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts_count = 0
+        self.total_wait_time = 0.0
+        self.max_wait_time = 0.0
+
+    def _do_get(self):
+        started_at = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            wait_time = time.perf_counter() - started_at
+            self.checkouts_count += 1
+            self.total_wait_time += wait_time
+            self.max_wait_time = max(self.max_wait_time, wait_time)
+
+
 class DatabaseManager:
-    def __init__(self, db_url: str):
+    def __init__(
+        self,
+        db_url: str,
+        pool_size: int = 5,
+        max_overflow: int = 10,
+        pool_pre_ping: bool = False,
+        pool_recycle: int = -1,
+        pool_timeout: float = 30.0,
+        prepare_threshold: int | None = 5,
+        statement_timeout: int | None = None,
+        replica_urls: list[str] | None = None,
+        replica_sticky_seconds: float = 5.0,
+    ):
         self._db_url = db_url
+        self._replica_urls = replica_urls or []
+        self._replica_sticky_seconds = replica_sticky_seconds
+        self._recent_writers: dict[str, float] = {}
+        self._pool_size = pool_size
+        self._max_overflow = max_overflow
+        self._pool_pre_ping = pool_pre_ping
+        self._pool_recycle = pool_recycle
+        self._pool_timeout = pool_timeout
+        self._prepare_threshold = prepare_threshold
+        self._statement_timeout = statement_timeout
 
-    async def initialize(self):
+    def _connect_args(self):
+        connect_args = {"prepare_threshold": self._prepare_threshold}
+        if self._statement_timeout is not None:
+            connect_args["options"] = f"-c statement_timeout={self._statement_timeout}"
+        return connect_args
+
+    def _create_engine(self, db_url: str):
+        return create_async_engine(
+            db_url,
+            poolclass=InstrumentedQueuePool,
+            pool_size=self._pool_size,
+            max_overflow=self._max_overflow,
+            pool_pre_ping=self._pool_pre_ping,
+            pool_recycle=self._pool_recycle,
+            pool_timeout=self._pool_timeout,
+            connect_args=self._connect_args(),
+        )
+
+    def _connect(self):
         try:
-            self._engine = create_async_engine(self._db_url)
+            self._engine = self._create_engine(self._db_url)
             self._sessionmaker = async_sessionmaker(
                 self._engine, expire_on_commit=False, autoflush=False
             )
-            logging.info("Successfully connected to database")
+            self._replica_engines = [
+                self._create_engine(replica_url) for replica_url in self._replica_urls
+            ]
+            self._replica_sessionmakers = itertools.cycle(
+                [
+                    async_sessionmaker(engine, expire_on_commit=False, autoflush=False)
+                    for engine in self._replica_engines
+                ]
+            )
+            logging.info(
+                "Successfully connected to database "
+                f"({len(self._replica_engines)} read replicas)"
+            )
         except Exception as ex:
             logging.error(
                 "Exception occurred during connection to database", exc_info=ex
             )
             raise
 
-        """Import all used models"""
-        from fitness_app.chats.models import Chat
-        from fitness_app.coaches.models import Coach
-        from fitness_app.customers.models import Customer
-        from fitness_app.diaries.models import DiaryEntry
-        from fitness_app.exercises.models import Exercise
-        from fitness_app.feedbacks.models import Feedback
-        from fitness_app.file_entities.models import FileEntity
-        from fitness_app.messages.models import Message
-        from fitness_app.steps.models import StepsEntry
-        from fitness_app.users.models import User
-        from fitness_app.workouts.models import Workout
-
-        async with self._engine.begin() as connection:
-            try:
-                await connection.run_sync(Base.metadata.create_all)
-                logging.info("Database tables were successfully created")
-            except Exception as ex:
-                logging.error(
-                    "Exception occurred during database tables creation", exc_info=ex
-                )
-                raise
+    async def initialize(self):
+        self._connect()
+
+        try:
+            await SchemaMigrator(self._engine).check()
+        except Exception as ex:
+            logging.error(
+                "Exception occurred during database schema version check", exc_info=ex
+            )
+            raise
+
+    async def migrate(self):
+        self._connect()
+
+        try:
+            await SchemaMigrator(self._engine).upgrade()
+        except Exception as ex:
+            logging.error(
+                "Exception occurred during database schema migration", exc_info=ex
+            )
+            raise
 
     async def dispose(self):
         await self._engine.dispose()
+        for engine in self._replica_engines:
+            await engine.dispose()
         logging.info("Closed connection with database")
 
+    def get_pool_stats(self):
+        pool: InstrumentedQueuePool = self._engine.pool
+        checkouts_count = pool.checkouts_count
+        return {
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": max(pool.overflow(), 0),
+            "max_overflow": self._max_overflow,
+            "checkouts_count": checkouts_count,
+            "average_wait_time": (
+                pool.total_wait_time / checkouts_count if checkouts_count else 0.0
+            ),
+            "max_wait_time": pool.max_wait_time,
+        }
+
+    @property
+    def has_replicas(self):
+        return bool(self._replica_engines)
+
+    @property
+    def replica_sticky_seconds(self):
+        return self._replica_sticky_seconds
+
+    def mark_recent_writer(self, writer_key: str):
+        now = time.monotonic()
+        if len(self._recent_writers) > 10000:
+            self._recent_writers = {
+                key: written_at
+                for key, written_at in self._recent_writers.items()
+                if now - written_at < self._replica_sticky_seconds
+            }
+        self._recent_writers[writer_key] = now
+
+    def is_recent_writer(self, writer_key: str):
+        written_at = self._recent_writers.get(writer_key)
+        return (
+            written_at is not None
+            and time.monotonic() - written_at < self._replica_sticky_seconds
+        )
+
     @asynccontextmanager
-    async def create_session(self):
-        async with self._sessionmaker() as session:
+    async def create_session(self, read_only: bool = False, unit_of_work: bool = True):
+        """Repositories only flush; a unit of work session commits once on exit"""
+        if read_only and self._replica_engines:
+            sessionmaker = next(self._replica_sessionmakers)
+        else:
+            sessionmaker = self._sessionmaker
+
+        async with sessionmaker() as session:
             try:
                 yield session
+                if unit_of_work and not read_only:
+                    await session.commit()
+                    await _run_commit_callbacks(session)
             except Exception as ex:
                 logging.error(
                     "Exception was thrown during database session. Rollback",
@@ -1,15 +1,18 @@
 from typing import Annotated
 
-from fastapi import Depends, Request
+from fastapi import Depends, Request, Response
+from fastapi.requests import HTTPConnection
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from fitness_app.auth.services import AuthService
+from fitness_app.auth.services import AuthService, PasswordService
 from fitness_app.chats.services import ChatService
 from fitness_app.coaches.services import CoachService
 from fitness_app.core.db_manager import DatabaseManager
+from fitness_app.core.pubsub import PubSubHub
 from fitness_app.customers.services import CustomerService
 from fitness_app.diaries.services import DiaryService
 from fitness_app.exercises.services import ExerciseService
+from fitness_app.exports.services import ExportService
 from fitness_app.feedbacks.services import FeedbackService
 from fitness_app.file_entities.services import FileEntityService
 from fitness_app.messages.services import MessageService
@@ -21,77 +24,132 @@ from fitness_app.workouts.ExerciseWorkoutService import ExerciseWorkoutService
 from fitness_app.workouts.WorkoutService import WorkoutService
 
 
-def db_manager(request: Request) -> DatabaseManager:
-    return request.app.state.database_manager
+def db_manager(connection: HTTPConnection) -> DatabaseManager:
+    return connection.app.state.database_manager
 
 
-async def db_session(db_manager: Annotated[DatabaseManager, Depends(db_manager)]):
+PRIMARY_STICKY_COOKIE = "db_primary_sticky"
+
+
+def _writer_key(request: Request):
+    return request.headers.get("Authorization")
+
+
+async def db_session(
+    request: Request,
+    response: Response,
+    db_manager: Annotated[DatabaseManager, Depends(db_manager)],
+):
+    if db_manager.has_replicas and request.method not in ("GET", "HEAD", "OPTIONS"):
+        writer_key = _writer_key(request)
+        if writer_key is not None:
+            db_manager.mark_recent_writer(writer_key)
+        response.set_cookie(
+            PRIMARY_STICKY_COOKIE,
+            "1",
+            max_age=max(int(db_manager.replica_sticky_seconds), 1),
+            httponly=True,
+        )
+
     async with db_manager.create_session() as session:
         yield session
 
 
-def auth_service(request: Request) -> AuthService:
-    return request.app.state.auth_service
+def is_primary_sticky(request: Request, db_manager: DatabaseManager):
+    """Whether the client wrote recently, so its reads must see the primary"""
+    writer_key = _writer_key(request)
+    return PRIMARY_STICKY_COOKIE in request.cookies or (
+        writer_key is not None and db_manager.is_recent_writer(writer_key)
+    )
+
+
+async def db_read_session(
+    request: Request,
+    db_manager: Annotated[DatabaseManager, Depends(db_manager)],
+):
+    read_only = not is_primary_sticky(request, db_manager)
+
+    async with db_manager.create_session(read_only=read_only) as session:
+        yield session
+
+
+def auth_service(connection: HTTPConnection) -> AuthService:
+    return connection.app.state.auth_service
+
+
+def password_service(connection: HTTPConnection) -> PasswordService:
+    return connection.app.state.password_service
+
+
+def user_service(connection: HTTPConnection) -> UserService:
+    return connection.app.state.user_service
+
+
+def water_entry_service(connection: HTTPConnection) -> WaterEntryService:
+    return connection.app.state.water_entry_service
 
 
-def user_service(request: Request) -> UserService:
-    return request.app.state.user_service
+def workout_service(connection: HTTPConnection) -> WorkoutService:
+    return connection.app.state.workout_service
 
 
-def water_entry_service(request: Request) -> WaterEntryService:
-    return request.app.state.water_entry_service
+def exercise_workout_service(connection: HTTPConnection) -> ExerciseWorkoutService:
+    return connection.app.state.exercise_workout_service
 
 
-def workout_service(request: Request) -> WorkoutService:
-    return request.app.state.workout_service
+def file_entity_service(connection: HTTPConnection) -> FileEntityService:
+    return connection.app.state.file_entity_service
 
 
-def exercise_workout_service(request: Request) -> ExerciseWorkoutService:
-    return request.app.state.exercise_workout_service
+def exercise_service(connection: HTTPConnection) -> ExerciseService:
+    return connection.app.state.exercise_service
 
 
-def file_entity_service(request: Request) -> FileEntityService:
-    return request.app.state.file_entity_service
+def coach_service(connection: HTTPConnection) -> CoachService:
+    return connection.app.state.coach_service
 
 
-def exercise_service(request: Request) -> ExerciseService:
-    return request.app.state.exercise_service
+def customer_service(connection: HTTPConnection) -> CustomerService:
+    return connection.app.state.customer_service
 
 
-def coach_service(request: Request) -> CoachService:
-    return request.app.state.coach_service
+def message_service(connection: HTTPConnection) -> MessageService:
+    return connection.app.state.message_service
 
 
-def customer_service(request: Request) -> CustomerService:
-    return request.app.state.customer_service
+def chat_service(connection: HTTPConnection) -> ChatService:
+    return connection.app.state.chat_service
 
 
-def message_service(request: Request) -> MessageService:
-    return request.app.state.message_service
+def steps_service(connection: HTTPConnection) -> StepsService:
+    return connection.app.state.steps_service
 
 
-def chat_service(request: Request) -> ChatService:
-    return request.app.state.chat_service
+def diary_service(connection: HTTPConnection) -> DiaryService:
+    return connection.app.state.diary_service
 
 
-def steps_service(request: Request) -> StepsService:
-    return request.app.state.steps_service
+def feedback_service(connection: HTTPConnection) -> FeedbackService:
+    return connection.app.state.feedback_service
 
 
-def diary_service(request: Request) -> DiaryService:
-    return request.app.state.diary_service
+def store_service(connection: HTTPConnection) -> StoreService:
+    return connection.app.state.store_service
 
 
-def feedback_service(request: Request) -> FeedbackService:
-    return request.app.state.feedback_service
+def pubsub_hub(connection: HTTPConnection) -> PubSubHub:
+    return connection.app.state.pubsub_hub
 
 
-def store_service(request: Request) -> StoreService:
-    return request.app.state.store_service
+def export_service(connection: HTTPConnection) -> ExportService:
+    return connection.app.state.export_service
 
 
+DbManager = Annotated[DatabaseManager, Depends(db_manager)]
 DbSession = Annotated[AsyncSession, Depends(db_session)]
+DbReadSession = Annotated[AsyncSession, Depends(db_read_session)]
 AuthServiceDep = Annotated[AuthService, Depends(auth_service)]
+PasswordServiceDep = Annotated[PasswordService, Depends(password_service)]
 UserServiceDep = Annotated[UserService, Depends(user_service)]
 WaterEntryServiceDep = Annotated[WaterEntryService, Depends(water_entry_service)]
 WorkoutServiceDep = Annotated[WorkoutService, Depends(workout_service)]
@@ -108,3 +166,5 @@ ChatServiceDep = Annotated[ChatService, Depends(chat_service)]
 DiaryServiceDep = Annotated[DiaryService, Depends(diary_service)]
 FeedbackServiceDep = Annotated[FeedbackService, Depends(feedback_service)]
 StoreServiceDep = Annotated[StoreService, Depends(store_service)]
+PubSubHubDep = Annotated[PubSubHub, Depends(pubsub_hub)]
+ExportServiceDep = Annotated[ExportService, Depends(export_service)]
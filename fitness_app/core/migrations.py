@@ -0,0 +1,125 @@
+import importlib
+import logging
+import pkgutil
+from types import ModuleType
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+import fitness_app.migrations
+
+MIGRATIONS_LOCK_KEY = 4_207_001
+
+
+class SchemaVersionMismatchError(Exception):
+    pass
+
+
+class Migration:
+    def __init__(self, version: int, description: str, statements: list[str]):
+        self.version = version
+        self.description = description
+        self.statements = statements
+
+    @classmethod
+    def from_module(cls, module: ModuleType):
+        return cls(module.version, module.description, module.statements)
+
+
+def load_migrations(package: ModuleType = fitness_app.migrations) -> list[Migration]:
+    migrations = [
+        Migration.from_module(
+            importlib.import_module(f"{package.__name__}.{module_info.name}")
+        )
+        for module_info in pkgutil.iter_modules(package.__path__)
+    ]
+    migrations.sort(key=lambda migration: migration.version)
+
+    versions = [migration.version for migration in migrations]
+    if len(versions) != len(set(versions)):
+        raise SchemaVersionMismatchError("Migration versions must be unique")
+
+    return migrations
+
+
+class SchemaMigrator:
+    def __init__(self, engine: AsyncEngine, migrations: list[Migration] | None = None):
+        self._engine = engine
+        self._migrations = load_migrations() if migrations is None else migrations
+
+    @property
+    def head_version(self):
+        return self._migrations[-1].version if self._migrations else 0
+
+    async def get_current_version(self, connection: AsyncConnection):
+        exists_result = await connection.execute(
+            text("SELECT to_regclass('schema_migrations') IS NOT NULL")
+        )
+        if not exists_result.scalar_one():
+            return 0
+
+        result = await connection.execute(
+            text("SELECT coalesce(max(version), 0) FROM schema_migrations")
+        )
+        return result.scalar_one()
+
+    async def check(self):
+        async with self._engine.connect() as connection:
+            current_version = await self.get_current_version(connection)
+
+        if current_version != self.head_version:
+            raise SchemaVersionMismatchError(
+                f"Database schema version is {current_version}, "
+                f"application expects {self.head_version}. Run migrations first"
+            )
+        logging.info(f"Database schema is up to date (version {current_version})")
+
+    async def upgrade(self):
+        async with self._engine.connect() as connection:
+            async with connection.begin():
+                await connection.execute(
+                    text("SELECT pg_advisory_lock(:key)"), {"key": MIGRATIONS_LOCK_KEY}
+                )
+                await connection.execute(
+                    text(
+                        "CREATE TABLE IF NOT EXISTS schema_migrations ("
+                        "version INTEGER PRIMARY KEY, "
+                        "description VARCHAR NOT NULL, "
+                        "applied_at TIMESTAMP WITHOUT TIME ZONE "
+                        "DEFAULT now() NOT NULL)"
+                    )
+                )
+
+            try:
+                async with connection.begin():
+                    current_version = await self.get_current_version(connection)
+
+                for migration in self._migrations:
+                    if migration.version <= current_version:
+                        continue
+
+                    async with connection.begin():
+                        for statement in migration.statements:
+                            await connection.exec_driver_sql(statement)
+                        await connection.execute(
+                            text(
+                                "INSERT INTO schema_migrations (version, description) "
+                                "VALUES (:version, :description)"
+                            ),
+                            {
+                                "version": migration.version,
+                                "description": migration.description,
+                            },
+                        )
+                    logging.info(
+                        f"Applied migration {migration.version}: "
+                        f"{migration.description}"
+                    )
+            finally:
+                async with connection.begin():
+                    await connection.execute(
+                        text("SELECT pg_advisory_unlock(:key)"),
+                        {"key": MIGRATIONS_LOCK_KEY},
+                    )
+
+        logging.info(f"Database schema was migrated to version {self.head_version}")
@@ -0,0 +1,224 @@
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import date, datetime
+from enum import StrEnum
+from typing import Any, Generic, Optional, Sequence, TypeVar
+
+from sqlalchemy import (
+    BigInteger,
+    Date,
+    DateTime,
+    Integer,
+    Select,
+    and_,
+    false,
+    func,
+    or_,
+    select,
+    tuple_,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+
+from fitness_app.core.exceptions import BadRequestException
+
+T = TypeVar("T")
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    return value
+
+
+def _decode_value(value):
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "d" in value:
+            return date.fromisoformat(value["d"])
+    return value
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    payload = json.dumps([_encode_value(value) for value in values])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, keys: Sequence["KeysetKey"]) -> list[Any]:
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = [_decode_value(value) for value in json.loads(payload)]
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError):
+        raise BadRequestException("Invalid pagination cursor")
+
+    if len(values) != len(keys) or not all(
+        key.accepts(value) for key, value in zip(keys, values)
+    ):
+        raise BadRequestException("Invalid pagination cursor")
+    return values
+
+
+@dataclass
+class KeysetPage(Generic[T]):
+    items: list[T]
+    next_cursor: Optional[str] = None
+
+
+class KeysetKey:
+    def __init__(
+        self,
+        column: InstrumentedAttribute,
+        descending: bool = False,
+        nullable: bool = False,
+    ):
+        self.column = column
+        self.descending = descending
+        self.nullable = nullable
+
+    def accepts(self, value) -> bool:
+        """Whether a cursor value can be compared with the column, so a
+        tampered cursor fails before reaching the database"""
+        if value is None:
+            return self.nullable
+
+        column_type = self.column.type
+        if isinstance(column_type, Integer):
+            limit = 2**63 if isinstance(column_type, BigInteger) else 2**31
+            return (
+                isinstance(value, int)
+                and not isinstance(value, bool)
+                and -limit <= value < limit
+            )
+        if isinstance(column_type, DateTime):
+            return isinstance(value, datetime)
+        if isinstance(column_type, Date):
+            return isinstance(value, date) and not isinstance(value, datetime)
+        return isinstance(value, column_type.python_type)
+
+    def order_by(self):
+        order = self.column.desc() if self.descending else self.column.asc()
+        # NULLS LAST is only spelled out when needed, so DESC keys can still use
+        # a backward scan of a plain index
+        return order.nulls_last() if self.nullable else order
+
+    def equals(self, value):
+        if value is None:
+            return self.column.is_(None)
+        return self.column == value
+
+    def follows(self, value):
+        """Rows placed after the value; nulls always go last"""
+        if value is None:
+            return false()
+
+        condition = self.column < value if self.descending else self.column > value
+        if self.nullable:
+            return or_(condition, self.column.is_(None))
+        return condition
+
+
+class Keyset:
+    """Orders a statement by the given keys and pages through it with cursors.
+
+    The last key must be unique (usually the primary key). Without a cursor
+    the page number is used as an offset, so old clients keep working.
+    """
+
+    def __init__(self, *keys: KeysetKey):
+        self._keys = keys
+
+    def _after(self, values: list[Any]):
+        directions = {key.descending for key in self._keys}
+        if len(directions) == 1 and not any(key.nullable for key in self._keys):
+            columns = tuple_(*(key.column for key in self._keys))
+            if self._keys[0].descending:
+                return columns < tuple_(*values)
+            return columns > tuple_(*values)
+
+        return or_(
+            *(
+                and_(
+                    *(
+                        previous_key.equals(previous_value)
+                        for previous_key, previous_value in zip(
+                            self._keys[:index], values[:index]
+                        )
+                    ),
+                    key.follows(values[index]),
+                )
+                for index, key in enumerate(self._keys)
+            )
+        )
+
+    def apply(self, statement: Select, page: int, size: int, cursor: Optional[str]):
+        statement = statement.order_by(*(key.order_by() for key in self._keys))
+        if cursor:
+            statement = statement.where(self._after(decode_cursor(cursor, self._keys)))
+        else:
+            statement = statement.offset(page * size)
+
+        return statement.limit(size + 1)
+
+    def apply_to_branch(
+        self, statement: Select, page: int, size: int, cursor: Optional[str]
+    ):
+        """Like apply, but keeps all the rows up to the end of the page. Used for
+        the branches of a UNION which is paged again as a whole."""
+        statement = statement.order_by(*(key.order_by() for key in self._keys))
+        if cursor:
+            statement = statement.where(self._after(decode_cursor(cursor, self._keys)))
+            return statement.limit(size + 1)
+
+        return statement.limit((page + 1) * size + 1)
+
+    def get_page(self, rows: Sequence[T], size: int) -> KeysetPage[T]:
+        items = list(rows[:size])
+        if len(rows) <= size:
+            return KeysetPage(items)
+
+        last_item = items[-1]
+        return KeysetPage(
+            items,
+            encode_cursor([getattr(last_item, key.column.key) for key in self._keys]),
+        )
+
+
+class CountMode(StrEnum):
+    EXACT = "exact"
+    ESTIMATED = "estimated"
+    NONE = "none"
+
+
+async def estimate_rows(session: AsyncSession, statement: Select) -> int:
+    """Row count the planner expects for the statement, without running it"""
+    compiled = statement.compile(
+        dialect=session.get_bind().dialect,
+        compile_kwargs={"render_postcompile": True},
+    )
+    connection = await session.connection()
+    result = await connection.exec_driver_sql(
+        f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params
+    )
+    plan = result.scalar_one()
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+async def count_rows(
+    session: AsyncSession, statement: Select, count_mode: CountMode
+) -> Optional[int]:
+    if count_mode == CountMode.NONE:
+        return None
+    if count_mode == CountMode.ESTIMATED:
+        return await estimate_rows(session, statement)
+
+    result = await session.execute(
+        select(func.count()).select_from(statement.subquery())
+    )
+    return result.scalar_one()
@@ -0,0 +1,175 @@
+import asyncio
+import json
+import logging
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Any, Callable, Optional
+
+import psycopg
+from psycopg import sql
+from sqlalchemy import func, select
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from fitness_app.core.db_manager import on_commit
+
+# Delivered instead of an event when some events may have been lost,
+# subscribers should reload their state
+RESYNC = None
+
+Deliver = Callable[[Optional[str], Any], None]
+
+
+class PubSubBackend(ABC):
+    """Carries published events to the hubs of all application workers.
+
+    Events are published within the session and delivered only after it
+    commits. A None topic is delivered to every subscriber.
+    """
+
+    @abstractmethod
+    async def start(self, deliver: Deliver) -> None: ...
+
+    @abstractmethod
+    async def publish(self, session: AsyncSession, topic: str, data: Any) -> None: ...
+
+    async def close(self):
+        pass
+
+
+class InMemoryPubSubBackend(PubSubBackend):
+    """Delivers events within the process, suitable for a single worker"""
+
+    async def start(self, deliver: Deliver):
+        self._deliver = deliver
+
+    async def publish(self, session: AsyncSession, topic: str, data: Any):
+        on_commit(session, lambda: self._deliver(topic, data))
+
+
+class PostgresPubSubBackend(PubSubBackend):
+    """Sends events with NOTIFY, which Postgres delivers on commit, and
+    listens on a dedicated connection outside of the pool"""
+
+    MAX_PAYLOAD_SIZE = 7900
+
+    def __init__(
+        self, db_url: str, channel: str = "app_events", reconnect_delay: float = 1.0
+    ):
+        self._conninfo = (
+            make_url(db_url).set(drivername="postgresql").render_as_string(False)
+        )
+        self._channel = channel
+        self._reconnect_delay = reconnect_delay
+        self._task: asyncio.Task | None = None
+
+    async def start(self, deliver: Deliver):
+        self._deliver = deliver
+        self._task = asyncio.create_task(self._listen())
+
+    async def _listen(self):
+        reconnect = False
+        while True:
+            try:
+                async with await psycopg.AsyncConnection.connect(
+                    self._conninfo, autocommit=True
+                ) as connection:
+                    await connection.execute(
+                        sql.SQL("LISTEN {}").format(sql.Identifier(self._channel))
+                    )
+                    logging.info(f"Listening for events on '{self._channel}'")
+                    if reconnect:
+                        self._deliver(None, RESYNC)
+
+                    async for notify in connection.notifies():
+                        event = json.loads(notify.payload)
+                        self._deliver(event["topic"], event["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as ex:
+                logging.error(
+                    "Exception occurred while listening for events", exc_info=ex
+                )
+            reconnect = True
+            await asyncio.sleep(self._reconnect_delay)
+
+    async def publish(self, session: AsyncSession, topic: str, data: Any):
+        payload = json.dumps({"topic": topic, "data": data})
+        if len(payload.encode()) > self.MAX_PAYLOAD_SIZE:
+            payload = json.dumps({"topic": topic, "data": RESYNC})
+
+        await session.execute(select(func.pg_notify(self._channel, payload)))
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+
+class Subscription:
+    def __init__(self, max_size: int):
+        self._queue: asyncio.Queue = asyncio.Queue(max_size)
+
+    def put(self, data: Any):
+        try:
+            self._queue.put_nowait(data)
+        except asyncio.QueueFull:
+            # A slow subscriber gets a single resync instead of stale events
+            while not self._queue.empty():
+                self._queue.get_nowait()
+            self._queue.put_nowait(RESYNC)
+
+    async def get(self):
+        return await self._queue.get()
+
+
+class PubSubHub:
+    """Fans events out to the subscribers of a topic within the process"""
+
+    def __init__(self, backend: PubSubBackend, queue_size: int = 100):
+        self._backend = backend
+        self._queue_size = queue_size
+        self._subscriptions: defaultdict[str, set[Subscription]] = defaultdict(set)
+
+    async def start(self):
+        await self._backend.start(self._dispatch)
+
+    async def close(self):
+        await self._backend.close()
+
+    async def publish(self, session: AsyncSession, topic: str, data: Any):
+        await self._backend.publish(session, topic, data)
+
+    def _dispatch(self, topic: Optional[str], data: Any):
+        if topic is None:
+            subscriptions = [
+                subscription
+                for topic_subscriptions in self._subscriptions.values()
+                for subscription in topic_subscriptions
+            ]
+        else:
+            subscriptions = list(self._subscriptions.get(topic, ()))
+
+        for subscription in subscriptions:
+            subscription.put(data)
+
+    @contextmanager
+    def subscribe(self, topic: str):
+        subscription = Subscription(self._queue_size)
+        self._subscriptions[topic].add(subscription)
+        try:
+            yield subscription
+        finally:
+            self._subscriptions[topic].discard(subscription)
+            if not self._subscriptions[topic]:
+                del self._subscriptions[topic]
+
+    def get_stats(self):
+        return {
+            "topics": len(self._subscriptions),
+            "subscriptions": sum(map(len, self._subscriptions.values())),
+        }
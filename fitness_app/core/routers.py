@@ -0,0 +1,50 @@
+from fastapi import APIRouter, Depends
+
+from fitness_app.auth.dependencies import HasPermission
+from fitness_app.auth.permissions import Authenticated
+from fitness_app.core.dependencies import DbManager, PasswordServiceDep, PubSubHubDep
+from fitness_app.core.schemas import (
+    PasswordHashingStatsSchema,
+    PoolStatsSchema,
+    PubSubStatsSchema,
+)
+
+service_router = APIRouter(
+    prefix="/service",
+    tags=["Сервис"],
+    dependencies=[Depends(HasPermission(Authenticated()))],
+)
+
+
+@service_router.get(
+    "/db/pool",
+    summary="Получить статистику пула соединений с базой данных",
+    response_model=PoolStatsSchema,
+    response_description=(
+        "Время ожидания соединения (`average_wait_time`, `max_wait_time`) "
+        "указано в секундах"
+    ),
+)
+async def get_db_pool_stats(db_manager: DbManager):
+    return PoolStatsSchema(**db_manager.get_pool_stats())
+
+
+@service_router.get(
+    "/password-hashing",
+    summary="Получить статистику пула хеширования паролей",
+    response_model=PasswordHashingStatsSchema,
+    response_description=(
+        "`waiting` - количество операций, ожидающих свободного потока"
+    ),
+)
+async def get_password_hashing_stats(password_service: PasswordServiceDep):
+    return PasswordHashingStatsSchema(**password_service.get_stats())
+
+
+@service_router.get(
+    "/pubsub",
+    summary="Получить количество подписок на события в этом процессе",
+    response_model=PubSubStatsSchema,
+)
+async def get_pubsub_stats(pubsub_hub: PubSubHubDep):
+    return PubSubStatsSchema(**pubsub_hub.get_stats())
@@ -1,4 +1,4 @@
-from typing import Generic, TypeVar
+from typing import Generic, Optional, TypeVar
 
 from pydantic import BaseModel
 
@@ -6,5 +6,30 @@ T = TypeVar("T")
 
 
 class PageSchema(BaseModel, Generic[T]):
-    total_items_count: int
+    total_items_count: Optional[int] = None
     items: list[T]
+    next_cursor: Optional[str] = None
+
+
+class PoolStatsSchema(BaseModel):
+    size: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+    max_overflow: int
+    checkouts_count: int
+    average_wait_time: float
+    max_wait_time: float
+
+
+class PubSubStatsSchema(BaseModel):
+    topics: int
+    subscriptions: int
+
+
+class PasswordHashingStatsSchema(BaseModel):
+    max_workers: int
+    active: int
+    waiting: int
+    max_waiting: int
+    completed_count: int
@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -5,16 +7,41 @@ class AppSettings(BaseSettings):
     model_config = SettingsConfigDict(secrets_dir="/run/secrets")
 
     db_url: str
+    db_pool_size: int = 10
+    db_max_overflow: int = 20
+    db_pool_pre_ping: bool = True
+    db_pool_recycle: int = 1800
+    db_pool_timeout: float = 10.0
+    db_prepare_threshold: int | None = 5
+    db_statement_timeout: int | None = 30000
+    db_replica_urls: list[str] = []
+    db_replica_sticky_seconds: float = 5.0
     cors_allowed_origins: list[str]
     auth_token_lifetime: int = 86400
     auth_token_secret_key: str
+    auth_token_cache_size: int = 10000
+    auth_principal_cache_size: int = 10000
+    auth_principal_cache_ttl: float = 60.0
+    password_hashing_workers: int = 4
+    password_bcrypt_rounds: int = 12
+    chat_membership_cache_size: int = 10000
+    chat_membership_cache_ttl: float = 30.0
+    pubsub_backend: Literal["memory", "postgres"] = "memory"
+    pubsub_queue_size: int = 100
 
     default_steps_goal: int = 8000
     goal_water_volume: int = 8000
 
-    region: str
-    aws_access_key_id: str
-    aws_secret_access_key: str
-    bucket_name: str
-    aws_endpoint: str
-    aws_access_domain_name: str
+    storage_driver: Literal["s3", "local", "memory"] = "s3"
+    storage_local_path: str = "media"
+    storage_public_url: str = "/files/content/"
+
+    region: str | None = None
+    aws_access_key_id: str | None = None
+    aws_secret_access_key: str | None = None
+    bucket_name: str | None = None
+    aws_endpoint: str | None = None
+    aws_access_domain_name: str | None = None
+    s3_max_workers: int = 8
+    s3_multipart_threshold: int = 8 * 1024 * 1024
+    s3_multipart_chunksize: int = 8 * 1024 * 1024
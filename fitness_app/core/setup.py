@@ -9,18 +9,33 @@ from fastapi.middleware.cors import CORSMiddleware
 from fitness_app.core.db_manager import DatabaseManager  # isort: split
 
 from fitness_app.auth.routers import auth_router
-from fitness_app.auth.services import AuthService, PasswordService, TokenService
+from fitness_app.auth.services import (
+    AuthService,
+    PasswordService,
+    PrincipalCache,
+    TokenService,
+)
+from fitness_app.chats.membership import ChatMembershipCache
 from fitness_app.chats.repositories import ChatRepository
 from fitness_app.chats.routers import chats_router
 from fitness_app.chats.services import ChatService
 from fitness_app.coaches.repositories import CoachRepository
 from fitness_app.coaches.routers import coaches_router
 from fitness_app.coaches.services import CoachService
+from fitness_app.core.cache import InMemoryCacheBackend
 from fitness_app.core.exceptions import (
     AppException,
     handle_app_exception,
     handle_validation_exception,
 )
+from fitness_app.core.pagination import NEXT_CURSOR_HEADER
+from fitness_app.core.pubsub import (
+    InMemoryPubSubBackend,
+    PostgresPubSubBackend,
+    PubSubBackend,
+    PubSubHub,
+)
+from fitness_app.core.routers import service_router
 from fitness_app.core.settings import AppSettings
 from fitness_app.customers.repositories import CustomerRepository
 from fitness_app.customers.routers import customers_router
@@ -28,18 +43,29 @@ from fitness_app.customers.services import CustomerService
 from fitness_app.diaries.repositories import DiaryRepository
 from fitness_app.diaries.routers import diaries_router
 from fitness_app.diaries.services import DiaryService
+from fitness_app.exercises.catalogue import ExerciseCatalogue
 from fitness_app.exercises.repositories import ExerciseRepository
 from fitness_app.exercises.routers import exercises_router
 from fitness_app.exercises.services import ExerciseService
+from fitness_app.exports.routers import exports_router
+from fitness_app.exports.services import ExportService
 from fitness_app.feedbacks.repositories import FeedbackRepository
 from fitness_app.feedbacks.routers import feedbacks_router
 from fitness_app.feedbacks.services import FeedbackService
 from fitness_app.file_entities.repositories import FileEntityRepository
 from fitness_app.file_entities.routers import file_entities_router
 from fitness_app.file_entities.services import FileEntityService
+from fitness_app.file_entities.storage import (
+    InMemoryStorage,
+    LocalStorage,
+    S3Storage,
+    StorageDriver,
+)
 from fitness_app.messages.repositories import MessageRepository
 from fitness_app.messages.routers import messages_router
 from fitness_app.messages.services import MessageService
+from fitness_app.rollups.repositories import RollupRepository
+from fitness_app.rollups.services import RollupService
 from fitness_app.steps.repositories import StepsRepository
 from fitness_app.steps.routers import steps_router
 from fitness_app.steps.services import StepsService
@@ -89,6 +115,7 @@ def create_app(settings: AppSettings | None = None) -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=[NEXT_CURSOR_HEADER],
     )
 
     """ Setup routers """
@@ -108,6 +135,8 @@ def create_app(settings: AppSettings | None = None) -> FastAPI:
     app.include_router(diaries_router)
     app.include_router(feedbacks_router)
     app.include_router(store_router)
+    app.include_router(exports_router)
+    app.include_router(service_router)
 
     """ Setup exception handlers """
     app.add_exception_handler(AppException, handle_app_exception)
@@ -118,9 +147,21 @@ def create_app(settings: AppSettings | None = None) -> FastAPI:
 
 def _setup_app_dependencies(app: FastAPI, settings: AppSettings):
     app.state.settings = settings
-    app.state.database_manager = DatabaseManager(settings.db_url)
+    app.state.database_manager = DatabaseManager(
+        settings.db_url,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_pre_ping=settings.db_pool_pre_ping,
+        pool_recycle=settings.db_pool_recycle,
+        pool_timeout=settings.db_pool_timeout,
+        prepare_threshold=settings.db_prepare_threshold,
+        statement_timeout=settings.db_statement_timeout,
+        replica_urls=settings.db_replica_urls,
+        replica_sticky_seconds=settings.db_replica_sticky_seconds,
+    )
 
-    workout_repository = WorkoutRepository()
+    exercise_catalogue = ExerciseCatalogue()
+    workout_repository = WorkoutRepository(exercise_catalogue)
     exercise_workout_repository = ExerciseWorkoutRepository()
     user_repository = UserRepository()
     water_entry_repository = WaterEntryRepository()
@@ -134,35 +175,52 @@ def _setup_app_dependencies(app: FastAPI, settings: AppSettings):
     diary_repository = DiaryRepository()
     feedback_repository = FeedbackRepository()
     store_repository = StoreRepository()
+    rollup_repository = RollupRepository()
 
-    password_service = PasswordService()
-    password_service = PasswordService()
+    password_service = PasswordService(
+        settings.password_hashing_workers, settings.password_bcrypt_rounds
+    )
     token_service = TokenService(
-        settings.auth_token_secret_key, settings.auth_token_lifetime
+        settings.auth_token_secret_key,
+        settings.auth_token_lifetime,
+        settings.auth_token_cache_size,
     )
-    auth_service = AuthService(password_service, token_service, user_repository)
-    user_service = UserService(password_service, user_repository)
+    principal_cache = PrincipalCache(
+        InMemoryCacheBackend(
+            settings.auth_principal_cache_size, settings.auth_principal_cache_ttl
+        )
+    )
+    auth_service = AuthService(
+        password_service, token_service, user_repository, principal_cache
+    )
+    user_service = UserService(password_service, user_repository, principal_cache)
+    rollup_service = RollupService(rollup_repository)
     water_entry_service = WaterEntryService(
-        water_entry_repository, settings.goal_water_volume
+        water_entry_repository, rollup_service, settings.goal_water_volume
     )
+    file_storage = _create_file_storage(settings)
     file_entity_service = FileEntityService(
-        settings.region,
-        settings.aws_access_key_id,
-        settings.aws_secret_access_key,
-        settings.bucket_name,
-        settings.aws_endpoint,
-        settings.aws_access_domain_name,
+        file_storage,
         file_entity_repository,
         exercise_repository,
     )
-    chat_service = ChatService(chat_repository, user_service)
+    chat_membership_cache = ChatMembershipCache(
+        settings.chat_membership_cache_size, settings.chat_membership_cache_ttl
+    )
+    chat_service = ChatService(chat_repository, chat_membership_cache)
     coach_service = CoachService(
-        coach_repository, user_repository, user_service, chat_service
+        coach_repository, user_repository, user_service, chat_service, principal_cache
     )
     customer_service = CustomerService(
-        customer_repository, user_repository, user_service, chat_service
+        customer_repository,
+        user_repository,
+        user_service,
+        chat_service,
+        principal_cache,
+    )
+    exercise_service = ExerciseService(
+        exercise_repository, file_entity_service, exercise_catalogue
     )
-    exercise_service = ExerciseService(exercise_repository, file_entity_service)
     workout_service = WorkoutService(
         workout_repository,
         exercise_workout_repository,
@@ -175,31 +233,72 @@ def _setup_app_dependencies(app: FastAPI, settings: AppSettings):
     exercise_workout_service = ExerciseWorkoutService(
         workout_service, exercise_workout_repository, exercise_service
     )
+    pubsub_hub = PubSubHub(_create_pubsub_backend(settings), settings.pubsub_queue_size)
     message_service = MessageService(
-        message_repository, chat_service, file_entity_service
+        message_repository, chat_service, file_entity_service, pubsub_hub
+    )
+    steps_service = StepsService(
+        steps_repository, rollup_service, settings.default_steps_goal
     )
-    steps_service = StepsService(steps_repository, settings.default_steps_goal)
     diary_service = DiaryService(diary_repository, file_entity_service)
     feedback_service = FeedbackService(
-        feedback_repository, user_repository, coach_repository, coach_service
+        feedback_repository,
+        user_repository,
+        coach_repository,
+        coach_service,
+        principal_cache,
     )
     store_service = StoreService(store_repository)
+    export_service = ExportService(
+        steps_repository, water_entry_repository, diary_repository, workout_repository
+    )
 
     app.state.workout_service = workout_service
     app.state.exercise_workout_service = exercise_workout_service
     app.state.auth_service = auth_service
+    app.state.password_service = password_service
     app.state.user_service = user_service
     app.state.water_entry_service = water_entry_service
     app.state.file_entity_service = file_entity_service
+    app.state.file_storage = file_storage
     app.state.exercise_service = exercise_service
+    app.state.exercise_catalogue = exercise_catalogue
     app.state.coach_service = coach_service
     app.state.customer_service = customer_service
     app.state.chat_service = chat_service
     app.state.message_service = message_service
+    app.state.pubsub_hub = pubsub_hub
     app.state.steps_service = steps_service
     app.state.diary_service = diary_service
     app.state.feedback_service = feedback_service
     app.state.store_service = store_service
+    app.state.export_service = export_service
+
+
+def _create_file_storage(settings: AppSettings) -> StorageDriver:
+    if settings.storage_driver == "local":
+        return LocalStorage(settings.storage_local_path, settings.storage_public_url)
+    if settings.storage_driver == "memory":
+        return InMemoryStorage(settings.storage_public_url)
+
+    return S3Storage(
+        settings.region,
+        settings.aws_access_key_id,
+        settings.aws_secret_access_key,
+        settings.bucket_name,
+        settings.aws_endpoint,
+        settings.aws_access_domain_name,
+        max_workers=settings.s3_max_workers,
+        multipart_threshold=settings.s3_multipart_threshold,
+        multipart_chunksize=settings.s3_multipart_chunksize,
+    )
+
+
+def _create_pubsub_backend(settings: AppSettings) -> PubSubBackend:
+    if settings.pubsub_backend == "postgres":
+        return PostgresPubSubBackend(settings.db_url)
+
+    return InMemoryPubSubBackend()
 
 
 @asynccontextmanager
@@ -209,6 +308,13 @@ async def _app_lifespan(app: FastAPI):
 
     await db.initialize()
 
+    exercise_catalogue: ExerciseCatalogue = app.state.exercise_catalogue
+    async with db.create_session(read_only=True) as session:
+        await exercise_catalogue.warm(session)
+
+    pubsub_hub: PubSubHub = app.state.pubsub_hub
+    await pubsub_hub.start()
+
     # if settings.initial_user is not None:
     #     user_service: UserService = app.state.user_service
     #     async with db.create_session() as session:
@@ -219,4 +325,9 @@ async def _app_lifespan(app: FastAPI):
     #             logging.info("Initial user already exists. Skipped")
 
     yield
+    await pubsub_hub.close()
     await db.dispose()
+    password_service: PasswordService = app.state.password_service
+    password_service.shutdown()
+    file_storage: StorageDriver = app.state.file_storage
+    file_storage.close()
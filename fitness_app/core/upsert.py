@@ -0,0 +1,96 @@
+from typing import Any, Iterable, NamedTuple, Optional
+
+from sqlalchemy import and_, cast, exists, literal, null, select, union_all, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from fitness_app.core.exceptions import InternalServerError
+
+PREVIOUS_PREFIX = "previous_"
+
+
+class UpsertResult(NamedTuple):
+    entity: Any
+    # Column values before the update, None when the row was created
+    previous: Optional[dict[str, Any]]
+
+
+async def upsert(
+    session: AsyncSession,
+    model,
+    key: dict[str, Any],
+    values: dict[str, Any],
+    update_columns: Iterable[str],
+    max_attempts: int = 3,
+) -> UpsertResult:
+    """Creates the row with the key and values, or updates the given columns of
+    the existing row, in a single statement.
+
+    The existing row is locked before the update, so the previous values are
+    exact even with concurrent writers. When the row appears after the
+    statement snapshot, the insert does nothing and the statement is repeated,
+    now seeing the row.
+    """
+    table = model.__table__
+    row = {**values, **key}
+    update_columns = list(update_columns)
+
+    previous = (
+        select(table)
+        .where(and_(*(table.c[name] == value for name, value in key.items())))
+        .with_for_update()
+        .cte("previous")
+    )
+    updated = (
+        update(table)
+        .where(
+            and_(*(column == previous.c[column.key] for column in table.primary_key))
+        )
+        .values({name: row[name] for name in update_columns})
+        .returning(
+            *table.c,
+            *(
+                previous.c[column.key].label(PREVIOUS_PREFIX + column.key)
+                for column in table.c
+            ),
+        )
+        .cte("updated")
+    )
+    inserted = (
+        insert(table)
+        .from_select(
+            list(row),
+            select(
+                *(literal(value, table.c[name].type) for name, value in row.items())
+            ).where(~exists(previous.select())),
+            include_defaults=False,
+        )
+        .on_conflict_do_nothing(index_elements=list(key))
+        .returning(
+            *table.c,
+            *(
+                cast(null(), column.type).label(PREVIOUS_PREFIX + column.key)
+                for column in table.c
+            ),
+        )
+        .cte("inserted")
+    )
+    upserted = union_all(select(updated), select(inserted)).subquery("upserted")
+    previous_columns = [upserted.c[PREVIOUS_PREFIX + column.key] for column in table.c]
+    statement = select(aliased(model, upserted), *previous_columns).execution_options(
+        populate_existing=True
+    )
+
+    for _ in range(max_attempts):
+        result = (await session.execute(statement)).one_or_none()
+        if result is None:
+            continue
+
+        entity, *previous_values = result
+        previous_row = dict(zip(table.c.keys(), previous_values))
+        if all(previous_row[column.key] is None for column in table.primary_key):
+            return UpsertResult(entity, None)
+        return UpsertResult(entity, previous_row)
+
+    raise InternalServerError(f"Could not upsert {table.name} row")
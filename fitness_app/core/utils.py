@@ -1,12 +1,24 @@
-from typing import Annotated
+from typing import Annotated, Optional
 
 from fastapi import Path, Query
 from pydantic import BaseModel, Field, StringConstraints
 
+from fitness_app.core.pagination import CountMode
+
 NonEmptyStr = Annotated[str, StringConstraints(strip_whitespace=True, min_length=1)]
 IdField = Annotated[int, Path(), Field(ge=1)]
 PageField = Annotated[int, Query(), Field(ge=0)]
 SizeField = Annotated[int, Query(), Field(ge=1, le=100)]
+CursorField = Annotated[Optional[str], Query()]
+CountField = Annotated[
+    CountMode,
+    Query(
+        description=(
+            "`exact` - точное количество, `estimated` - оценка планировщика, "
+            "`none` - не считать"
+        )
+    ),
+]
 
 
 def update_model_by_schema(model, schema: BaseModel):
@@ -1,8 +1,11 @@
-from sqlalchemy import func, select
+from typing import Optional
+
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
 
 from fitness_app.coaches.models import Coach
+from fitness_app.core.pagination import CountMode, Keyset, KeysetKey, count_rows
 from fitness_app.customers.models import Customer
 from fitness_app.users.models import CoachesCustomers
 
@@ -12,12 +15,11 @@ class CustomerRepository:
     async def save(self, session: AsyncSession, customer: Customer):
         session.add(customer)
         await session.flush()
-        await session.commit()
         return customer
 
     async def delete(self, session: AsyncSession, customer: Customer):
         await session.delete(customer)
-        await session.commit()
+        await session.flush()
         return customer
 
     async def get_all(
@@ -25,12 +27,12 @@ class CustomerRepository:
         session: AsyncSession,
         page: int,
         size: int,
+        cursor: Optional[str] = None,
     ):
-        statement = (
-            select(Customer).order_by(Customer.id).offset(page * size).limit(size)
-        )
+        keyset = Keyset(KeysetKey(Customer.id))
+        statement = keyset.apply(select(Customer), page, size, cursor)
         result = await session.execute(statement)
-        return result.scalars().all()
+        return keyset.get_page(result.scalars().all(), size)
 
     async def get_by_id(
         self,
@@ -48,10 +50,9 @@ class CustomerRepository:
     async def count_all(
         self,
         session: AsyncSession,
+        count_mode: CountMode = CountMode.EXACT,
     ):
-        statement = select(func.count()).select_from(Customer)
-        result = await session.execute(statement)
-        return result.scalar_one()
+        return await count_rows(session, select(Customer.id), count_mode)
 
     async def get_coaches_by_customer_id(
         self,
@@ -59,23 +60,25 @@ class CustomerRepository:
         customer_id: int,
         page: int,
         size: int,
+        cursor: Optional[str] = None,
     ):
+        keyset = Keyset(KeysetKey(Coach.id))
         statement = (
             select(Coach)
             .join(CoachesCustomers, Coach.id == CoachesCustomers.coach_id)
             .where(CoachesCustomers.customer_id == customer_id)
-            .offset(page * size)
-            .limit(size)
         )
+        statement = keyset.apply(statement, page, size, cursor)
         result = await session.execute(statement)
-        return result.scalars().all()
+        return keyset.get_page(result.scalars().all(), size)
 
-    async def count_coaches_by_user_id(self, session: AsyncSession, customer_id: int):
-        statement = (
-            select(func.count(Coach.id))
-            .join(Customer.coaches)
-            .where(Customer.id == customer_id)
+    async def count_coaches_by_user_id(
+        self,
+        session: AsyncSession,
+        customer_id: int,
+        count_mode: CountMode = CountMode.EXACT,
+    ):
+        statement = select(CoachesCustomers.coach_id).where(
+            CoachesCustomers.customer_id == customer_id
         )
-
-        result = await session.execute(statement)
-        return result.scalar_one()
+        return await count_rows(session, statement, count_mode)
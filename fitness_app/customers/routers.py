@@ -5,8 +5,15 @@ from fastapi import APIRouter, Depends, Path
 from fitness_app.auth.dependencies import AuthenticateUser, HasPermission
 from fitness_app.auth.permissions import IsCustomer
 from fitness_app.core.dependencies import CustomerServiceDep, DbSession
+from fitness_app.core.pagination import CountMode
 from fitness_app.core.schemas import PageSchema
-from fitness_app.core.utils import IdField, PageField, SizeField
+from fitness_app.core.utils import (
+    CountField,
+    CursorField,
+    IdField,
+    PageField,
+    SizeField,
+)
 from fitness_app.customers.schemas import (
     CustomerCreateSchema,
     CustomerSchema,
@@ -27,11 +34,14 @@ async def get_all(
     service: CustomerServiceDep,
     page: PageField = 0,
     size: SizeField = 10,
+    cursor: CursorField = None,
+    count: CountField = CountMode.EXACT,
 ):
-    customers = await service.get_all(session, page, size)
+    customers = await service.get_all(session, page, size, cursor, count)
     return PageSchema(
         total_items_count=customers.total_items_count,
         items=list(map(CustomerSchema.model_validate, customers.items)),
+        next_cursor=customers.next_cursor,
     )
 
 
@@ -121,8 +131,12 @@ async def get_coaches(
     session: DbSession,
     page: PageField = 0,
     size: SizeField = 10,
+    cursor: CursorField = None,
+    count: CountField = CountMode.EXACT,
 ):
-    coaches = await service.get_coaches_by_user(session, user, page, size)
+    coaches = await service.get_coaches_by_user(
+        session, user, page, size, cursor, count
+    )
     return coaches
 
 
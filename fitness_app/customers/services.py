@@ -1,9 +1,13 @@
+from typing import Optional
+
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from fitness_app.auth.services import PrincipalCache
 from fitness_app.chats.services import ChatService
 from fitness_app.coaches.models import Coach
 from fitness_app.coaches.schemas import CoachSchema
 from fitness_app.core.exceptions import EntityNotFoundException
+from fitness_app.core.pagination import CountMode
 from fitness_app.core.schemas import PageSchema
 from fitness_app.core.utils import update_model_by_schema
 from fitness_app.customers.models import Customer
@@ -26,11 +30,13 @@ class CustomerService:
         user_repository: UserRepository,
         user_service: UserService,
         chat_service: ChatService,
+        principal_cache: PrincipalCache,
     ):
         self._customer_repository = customer_repository
         self._user_repository = user_repository
         self._user_service = user_service
         self._chat_service = chat_service
+        self._principal_cache = principal_cache
 
     async def create(self, session: AsyncSession, schema: CustomerCreateSchema):
         userSchema = UserCreateSchema(**schema.model_dump())
@@ -51,12 +57,18 @@ class CustomerService:
         session: AsyncSession,
         page: int,
         size: int,
+        cursor: Optional[str] = None,
+        count_mode: CountMode = CountMode.EXACT,
     ):
         total_products_count = await self._customer_repository.count_all(
-            session,
+            session, count_mode
+        )
+        coaches = await self._customer_repository.get_all(session, page, size, cursor)
+        return PageSchema(
+            total_items_count=total_products_count,
+            items=coaches.items,
+            next_cursor=coaches.next_cursor,
         )
-        coaches = await self._customer_repository.get_all(session, page, size)
-        return PageSchema(total_items_count=total_products_count, items=coaches)
 
     async def get_current(self, user: User):
         if user is None:
@@ -71,18 +83,21 @@ class CustomerService:
         user: User,
         page: int,
         size: int,
+        cursor: Optional[str] = None,
+        count_mode: CountMode = CountMode.EXACT,
     ):
         if user.customer_info is None:
             raise EntityNotFoundException("User with given id is not a customer")
         own_coaches_count = await self._customer_repository.count_coaches_by_user_id(
-            session, user.customer_info.id
+            session, user.customer_info.id, count_mode
         )
         coaches = await self._customer_repository.get_coaches_by_customer_id(
-            session, user.customer_info.id, page, size
+            session, user.customer_info.id, page, size, cursor
         )
         return PageSchema(
             total_items_count=own_coaches_count,
-            items=list(map(CoachSchema.model_validate, coaches)),
+            items=list(map(CoachSchema.model_validate, coaches.items)),
+            next_cursor=coaches.next_cursor,
         )
 
     async def get_by_id(self, session: AsyncSession, customer_id: int):
@@ -127,6 +142,7 @@ class CustomerService:
             raise EntityNotFoundException("User with given id is not a customer")
 
         update_model_by_schema(customer, schema)
+        await self._principal_cache.invalidate(session, user.id)
 
         return await self._customer_repository.save(session, customer)
 
@@ -135,4 +151,5 @@ class CustomerService:
         if customer is None:
             raise EntityNotFoundException("Coach with given id was not found")
         self._user_service.delete_by_id(session, customer.user_id)
+        await self._principal_cache.invalidate(session, customer.user_id)
         return await self._customer_repository.delete(session, customer)
@@ -1,9 +1,11 @@
 from datetime import date
+from typing import Iterable
 
-from sqlalchemy import exists, select
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncResult, AsyncSession
 from sqlalchemy.orm import joinedload
 
+from fitness_app.core.upsert import UpsertResult, upsert
 from fitness_app.diaries.models import DiaryEntry
 
 
@@ -11,19 +13,24 @@ class DiaryRepository:
     async def save(self, session: AsyncSession, diary: DiaryEntry):
         session.add(diary)
         await session.flush()
-        await session.commit()
         return diary
 
-    async def get_by_user_id_and_date(
-        self, session: AsyncSession, user_id: int, date_field: date
-    ):
-        q = (
-            select(DiaryEntry)
-            .where(DiaryEntry.user_id == user_id, DiaryEntry.date_field == date_field)
-            .options(joinedload(DiaryEntry.voice_note))
+    async def upsert(
+        self,
+        session: AsyncSession,
+        user_id: int,
+        date_field: date,
+        values: dict,
+        update_columns: Iterable[str],
+    ) -> UpsertResult:
+        """Creates the entry of the day or updates the given columns of it"""
+        return await upsert(
+            session,
+            DiaryEntry,
+            {"user_id": user_id, "date_field": date_field},
+            values,
+            update_columns,
         )
-        s = await session.execute(q)
-        return s.scalar_one_or_none()
 
     async def get_by_dates(
         self, session: AsyncSession, user_id: int, date_start: date, date_finish: date
@@ -31,7 +38,7 @@ class DiaryRepository:
         q = (
             select(DiaryEntry)
             .where(
-                user_id == user_id,
+                DiaryEntry.user_id == user_id,
                 DiaryEntry.date_field >= date_start,
                 DiaryEntry.date_field <= date_finish,
             )
@@ -41,13 +48,15 @@ class DiaryRepository:
         s = await session.execute(q)
         return s.scalars().all()
 
-    async def exists_by_user_id_and_date(
-        self, session: AsyncSession, user_id: int, date_field: date
-    ):
-        q = select(
-            exists().where(
-                DiaryEntry.user_id == user_id, DiaryEntry.date_field == date_field
-            )
+    async def stream_by_user_id(
+        self, session: AsyncSession, user_id: int, batch_size: int = 500
+    ) -> AsyncResult:
+        """All entries of the user as plain rows, fetched from a server-side
+        cursor in batches"""
+        statement = (
+            select(*DiaryEntry.__table__.columns)
+            .where(DiaryEntry.user_id == user_id)
+            .order_by(DiaryEntry.date_field)
+            .execution_options(yield_per=batch_size)
         )
-        s = await session.execute(q)
-        return s.scalar_one()
+        return await session.stream(statement)
@@ -5,6 +5,7 @@ from fastapi import APIRouter, Depends, status
 from fitness_app.auth.dependencies import AuthenticateUser, HasPermission
 from fitness_app.auth.permissions import Authenticated
 from fitness_app.core.dependencies import (
+    DbReadSession,
     DbSession,
     DiaryServiceDep,
     FileEntityServiceDep,
@@ -15,14 +16,12 @@ from fitness_app.diaries.schemas import DiaryCreateSchema, DiarySchema
 diaries_router = APIRouter(prefix="/diaries", tags=["Дневники"])
 
 
-async def diary_to_schema(
-    session: DbSession, file_service: FileEntityServiceDep, diary: DiaryEntry
+def diary_to_schema(
+    file_service: FileEntityServiceDep, diary: DiaryEntry
 ) -> DiarySchema:
 
     if diary.voice_note:
-        diary.voice_note.full_url = await file_service.get_by_filename(
-            session, diary.voice_note.filename
-        )
+        diary.voice_note.full_url = file_service.get_url(diary.voice_note.filename)
     return diary
 
 
@@ -38,7 +37,7 @@ async def diary_to_schema(
     dependencies=[Depends(HasPermission(Authenticated()))],
 )
 async def get_diaries_by_dates(
-    session: DbSession,
+    session: DbReadSession,
     service: DiaryServiceDep,
     file_service: FileEntityServiceDep,
     user: AuthenticateUser,
@@ -46,7 +45,7 @@ async def get_diaries_by_dates(
     date_finish: date,
 ) -> list[DiarySchema]:
     diaries = await service.get_by_dates(session, user.id, date_start, date_finish)
-    diaries = [await diary_to_schema(session, file_service, diary) for diary in diaries]
+    diaries = [diary_to_schema(file_service, diary) for diary in diaries]
     return diaries
 
 
@@ -64,4 +63,4 @@ async def create_or_update_today_diary(
     schema: DiaryCreateSchema,
 ) -> DiarySchema:
     diary = await service.create_or_update(session, user.id, schema)
-    return await diary_to_schema(session, file_service, diary)
+    return diary_to_schema(file_service, diary)
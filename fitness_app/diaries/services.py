@@ -1,12 +1,13 @@
 from datetime import date
+from typing import Optional
 
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
 
 from fitness_app.core.exceptions import BadRequestException
-from fitness_app.core.utils import update_model_by_schema
-from fitness_app.diaries.models import DiaryEntry
 from fitness_app.diaries.repositories import DiaryRepository
 from fitness_app.diaries.schemas import DiaryCreateSchema
+from fitness_app.file_entities.models import FileEntity
 from fitness_app.file_entities.services import FileEntityService
 
 
@@ -25,72 +26,36 @@ class DiaryService:
         )
         return diaries
 
-    async def create(
-        self,
-        session: AsyncSession,
-        user_id: int,
-        schema: DiaryCreateSchema,
-        date_field: date,
-    ):
-        diary = DiaryEntry(
-            **schema.model_dump(),
-            user_id=user_id,
-            date_field=date_field,
-        )
-
-        if schema.file_entity_id:
-            file_entity = await self._file_entity_service.get_by_id(
-                session, schema.file_entity_id
-            )
-            if file_entity.exercise_id:
-                raise BadRequestException("File already belongs to exercise")
-
-            diary.voice_note = file_entity
-
-        return diary
-
-    async def update(
-        self,
-        session: AsyncSession,
-        user_id: int,
-        schema: DiaryCreateSchema,
-        date_field: date,
-    ):
-        diary = await self._diary_repository.get_by_user_id_and_date(
-            session, user_id=user_id, date_field=date_field
-        )
+    async def get_voice_note(
+        self, session: AsyncSession, file_entity_id: Optional[int]
+    ) -> Optional[FileEntity]:
+        if not file_entity_id:
+            return None
 
-        if diary.file_entity_id != schema.file_entity_id:
-            if diary.file_entity_id:
-                await self._file_entity_service.delete_by_id(
-                    session, diary.file_entity_id
-                )
+        file_entity = await self._file_entity_service.get_by_id(session, file_entity_id)
+        if file_entity.exercise_id:
+            raise BadRequestException("File already belongs to exercise")
 
-                await session.refresh(diary)
-
-            if schema.file_entity_id:
-                file_entity = await self._file_entity_service.get_by_id(
-                    session, schema.file_entity_id
-                )
-                if file_entity.exercise_id:
-                    raise BadRequestException("File already belongs to exercise")
-
-                diary.voice_note = file_entity
-
-        update_model_by_schema(diary, schema)
-
-        return diary
+        return file_entity
 
     async def create_or_update(
         self, session: AsyncSession, user_id: int, schema: DiaryCreateSchema
     ):
-        date_field = date.today()
+        voice_note = await self.get_voice_note(session, schema.file_entity_id)
 
-        if await self._diary_repository.exists_by_user_id_and_date(
-            session, user_id, date_field
+        values = schema.model_dump()
+        diary, previous = await self._diary_repository.upsert(
+            session, user_id, date.today(), values, values.keys()
+        )
+        set_committed_value(diary, "voice_note", voice_note)
+
+        # The replaced voice note is not referenced anymore
+        if previous is not None and previous["file_entity_id"] not in (
+            None,
+            diary.file_entity_id,
         ):
-            diary = await self.update(session, user_id, schema, date_field)
-        else:
-            diary = await self.create(session, user_id, schema, date_field)
+            await self._file_entity_service.delete_by_id(
+                session, previous["file_entity_id"]
+            )
 
-        return await self._diary_repository.save(session, diary)
+        return diary
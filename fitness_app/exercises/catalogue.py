@@ -0,0 +1,88 @@
+import logging
+from typing import Iterable, NamedTuple, Optional
+
+from sqlalchemy import inspect, null, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached, selectinload
+
+from fitness_app.exercises.models import Exercise
+from fitness_app.file_entities.models import FileEntity
+
+
+class CatalogueRecord(NamedTuple):
+    exercise: dict
+    photos: tuple[dict, ...]
+
+
+class ExerciseCatalogue:
+    """Process-level read-through cache of the shared exercises (user_id IS NULL).
+
+    Keeps plain column snapshots, so every session gets its own instances
+    merged into the identity map without a query.
+    """
+
+    def __init__(self):
+        self._records: dict[int, CatalogueRecord] = {}
+
+    @staticmethod
+    def _dump(instance):
+        state = inspect(instance)
+        return {
+            column.key: state.dict[column.key]
+            for column in state.mapper.column_attrs
+            if column.key in state.dict
+        }
+
+    async def warm(self, session: AsyncSession):
+        statement = (
+            select(Exercise)
+            .where(Exercise.user_id == null())
+            .options(selectinload(Exercise.photos))
+        )
+        result = await session.execute(statement)
+        self._records = {}
+        for exercise in result.scalars():
+            self.add(exercise)
+        logging.info(f"Exercise catalogue was loaded ({len(self._records)} items)")
+
+    def add(self, exercise: Exercise):
+        if exercise.user_id is not None:
+            return
+
+        self._records[exercise.id] = CatalogueRecord(
+            self._dump(exercise),
+            tuple(self._dump(photo) for photo in exercise.photos),
+        )
+
+    def invalidate(self, exercise_id: int):
+        self._records.pop(exercise_id, None)
+
+    def __len__(self):
+        return len(self._records)
+
+    async def get(self, session: AsyncSession, exercise_id: int) -> Optional[Exercise]:
+        record = self._records.get(exercise_id)
+        if record is None:
+            return None
+
+        exercise = Exercise(**record.exercise)
+        exercise.photos = [FileEntity(**photo) for photo in record.photos]
+        make_transient_to_detached(exercise)
+        for photo in exercise.photos:
+            make_transient_to_detached(photo)
+
+        exercise = await session.merge(exercise, load=False)
+        # The identity map holds clean objects weakly; keep merged exercises alive
+        # for the session, so an expired many-to-one finds them without a query
+        session.info.setdefault("exercise_catalogue", []).append(exercise)
+        return exercise
+
+    async def get_many(
+        self, session: AsyncSession, exercise_ids: Iterable[int]
+    ) -> dict[int, Exercise]:
+        exercises = {}
+        for exercise_id in set(exercise_ids):
+            exercise = await self.get(session, exercise_id)
+            if exercise is not None:
+                exercises[exercise_id] = exercise
+        return exercises
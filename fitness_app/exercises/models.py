@@ -1,6 +1,7 @@
 from typing import TYPE_CHECKING
 
-from sqlalchemy import ForeignKey
+from sqlalchemy import FetchedValue, ForeignKey
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from fitness_app.core.db_manager import Base
@@ -24,6 +25,10 @@ class Exercise(Base):
     equipment: Mapped[str] = mapped_column(nullable=True)
     difficulty: Mapped[str] = mapped_column(nullable=True)
     description: Mapped[str] = mapped_column(nullable=True)
+    # Generated by the database (see migration 3), never loaded with the entity
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR, server_default=FetchedValue(), deferred=True
+    )
 
     user: Mapped["User"] = relationship(back_populates="exercises")
     photos: Mapped[list["FileEntity"]] = relationship(
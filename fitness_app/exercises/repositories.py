@@ -1,18 +1,21 @@
 from typing import Optional
 
-from sqlalchemy import desc, null, or_, select
+from sqlalchemy import Select, func, literal_column, null, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from fitness_app.core.exceptions import BadRequestException
+from fitness_app.core.pagination import Keyset, KeysetKey, KeysetPage
 from fitness_app.exercises.models import Exercise
 from fitness_app.exercises.schemas import ExerciseFindSchema
 
+SEARCH_CONFIG = literal_column("'russian'::regconfig")
+
 
 class ExerciseRepository:
     async def save(self, session: AsyncSession, exercise: Exercise):
         session.add(exercise)
         await session.flush()
-        await session.commit()
         return exercise
 
     async def get_by_id(self, session: AsyncSession, id: int):
@@ -24,6 +27,15 @@ class ExerciseRepository:
         result = await session.execute(statement)
         return result.scalar_one_or_none()
 
+    async def get_by_ids(self, session: AsyncSession, ids: list[int]):
+        statement = (
+            select(Exercise)
+            .where(Exercise.id.in_(ids))
+            .options(selectinload(Exercise.photos))
+        )
+        result = await session.execute(statement)
+        return result.scalars().all()
+
     async def get_by_user_id(
         self,
         session: AsyncSession,
@@ -31,46 +43,89 @@ class ExerciseRepository:
         find_schema: Optional[ExerciseFindSchema],
         page: int,
         size: int,
+        cursor: Optional[str] = None,
     ):
+        keyset = Keyset(KeysetKey(Exercise.id, descending=True))
         statement = select(Exercise).where(
             or_(Exercise.user_id == null(), Exercise.user_id == user_id)
         )
         if find_schema:
-            if find_schema.name:
-                statement = statement.where(Exercise.name.icontains(find_schema.name))
-            if find_schema.muscle:
-                statement = statement.where(
-                    Exercise.muscle.icontains(find_schema.muscle)
-                )
-            if find_schema.additionalMuscle:
-                statement = statement.where(
-                    Exercise.additionalMuscle.icontains(find_schema.additionalMuscle)
-                )
-            if find_schema.type:
-                statement = statement.where(Exercise.type == find_schema.type)
-            if find_schema.equipment:
-                statement = statement.where(
-                    Exercise.equipment.icontains(find_schema.equipment)
-                )
-            if find_schema.difficulty:
-                statement = statement.where(
-                    Exercise.difficulty == find_schema.difficulty
-                )
-            if find_schema.description:
-                statement = statement.where(
-                    Exercise.description.icontains(find_schema.description)
+            if find_schema.q and find_schema.q.strip():
+                return await self._search(
+                    session, statement, find_schema, page, size, cursor
                 )
+            statement = self._apply_filters(statement, find_schema)
+        statement = keyset.apply(
+            statement.options(selectinload(Exercise.photos)), page, size, cursor
+        )
+
+        result = await session.execute(statement)
+        return keyset.get_page(result.scalars().all(), size)
+
+    @staticmethod
+    def _apply_filters(statement: Select, find_schema: ExerciseFindSchema):
+        if find_schema.name:
+            statement = statement.where(Exercise.name.icontains(find_schema.name))
+        if find_schema.muscle:
+            statement = statement.where(Exercise.muscle.icontains(find_schema.muscle))
+        if find_schema.additionalMuscle:
+            statement = statement.where(
+                Exercise.additionalMuscle.icontains(find_schema.additionalMuscle)
+            )
+        if find_schema.type:
+            statement = statement.where(Exercise.type == find_schema.type)
+        if find_schema.equipment:
+            statement = statement.where(
+                Exercise.equipment.icontains(find_schema.equipment)
+            )
+        if find_schema.difficulty:
+            statement = statement.where(Exercise.difficulty == find_schema.difficulty)
+        if find_schema.description:
+            statement = statement.where(
+                Exercise.description.icontains(find_schema.description)
+            )
+        return statement
+
+    async def _search(
+        self,
+        session: AsyncSession,
+        statement: Select,
+        find_schema: ExerciseFindSchema,
+        page: int,
+        size: int,
+        cursor: Optional[str],
+    ):
+        """Ranked search: full-text match on the generated search_vector,
+        plus trigram word similarity on the name to tolerate typos.
+
+        Rank is not a stable pagination key, so results are paged by offset.
+        """
+        if cursor:
+            raise BadRequestException("Cursor can not be used with a search query")
+
+        q = find_schema.q.strip()
+        query = func.websearch_to_tsquery(SEARCH_CONFIG, q)
+        rank = func.ts_rank_cd(Exercise.search_vector, query) + func.word_similarity(
+            q, Exercise.name
+        )
         statement = (
-            statement.offset(page * size)
-            .limit(size)
-            .order_by(desc(Exercise.id))
+            self._apply_filters(statement, find_schema)
+            .where(
+                or_(
+                    Exercise.search_vector.bool_op("@@")(query),
+                    Exercise.name.bool_op("%>")(q),
+                )
+            )
             .options(selectinload(Exercise.photos))
+            .order_by(rank.desc(), Exercise.id.desc())
+            .offset(page * size)
+            .limit(size)
         )
 
         result = await session.execute(statement)
-        return result.scalars().all()
+        return KeysetPage(list(result.scalars().all()))
 
     async def delete(self, session: AsyncSession, exercise: Exercise):
         await session.delete(exercise)
-        await session.commit()
+        await session.flush()
         return exercise
@@ -1,15 +1,17 @@
 from typing import Annotated, Optional
 
-from fastapi import APIRouter, Depends, Path, Query, status
+from fastapi import APIRouter, Depends, Path, Query, Response, status
 
 from fitness_app.auth.dependencies import AuthenticateUser, HasPermission
 from fitness_app.auth.permissions import Authenticated
 from fitness_app.core.dependencies import (
+    DbReadSession,
     DbSession,
     ExerciseServiceDep,
     FileEntityServiceDep,
 )
-from fitness_app.core.utils import PageField, SizeField
+from fitness_app.core.pagination import NEXT_CURSOR_HEADER
+from fitness_app.core.utils import CursorField, PageField, SizeField
 from fitness_app.exercises.models import Exercise
 from fitness_app.exercises.schemas import (
     Difficulty,
@@ -21,16 +23,19 @@ from fitness_app.exercises.schemas import (
 )
 
 
-async def exercise_to_schema(
-    session: DbSession, file_service: FileEntityServiceDep, exercise: Exercise
+def exercise_to_schema(
+    file_service: FileEntityServiceDep, exercise: Exercise
 ) -> ExerciseSchema:
 
     for photo in exercise.photos:
-        photo.full_url = await file_service.get_by_filename(session, photo.filename)
+        photo.full_url = file_service.get_url(photo.filename)
     return exercise
 
 
 def get_exercise_find_schema(
+    q: Optional[str] = Query(
+        None, description="Поиск по названию, мышцам, оборудованию и описанию"
+    ),
     name: Optional[str] = Query(None),
     muscle: Optional[str] = Query(None),
     additionalMuscle: Optional[str] = Query(None),
@@ -40,6 +45,7 @@ def get_exercise_find_schema(
     description: Optional[str] = Query(None),
 ) -> ExerciseFindSchema:
     return ExerciseFindSchema(
+        q=q,
         name=name,
         muscle=muscle,
         additionalMuscle=additionalMuscle,
@@ -67,7 +73,7 @@ async def create(
     schema: ExerciseCreateSchema,
 ) -> ExerciseSchema:
     exercise = await service.create(session, schema, user.id)
-    return await exercise_to_schema(session, file_service, exercise)
+    return exercise_to_schema(file_service, exercise)
 
 
 @exercises_router.get(
@@ -82,13 +88,13 @@ async def create(
     dependencies=[Depends(HasPermission(Authenticated()))],
 )
 async def get_by_id(
-    session: DbSession,
+    session: DbReadSession,
     service: ExerciseServiceDep,
     file_service: FileEntityServiceDep,
     id: Annotated[int, Path],
 ) -> ExerciseSchema:
     exercise = await service.get_by_id(session, id)
-    return await exercise_to_schema(session, file_service, exercise)
+    return exercise_to_schema(file_service, exercise)
 
 
 @exercises_router.get(
@@ -98,18 +104,23 @@ async def get_by_id(
     dependencies=[Depends(HasPermission(Authenticated()))],
 )
 async def get_by_user_id(
-    session: DbSession,
+    response: Response,
+    session: DbReadSession,
     service: ExerciseServiceDep,
     file_service: FileEntityServiceDep,
     user: AuthenticateUser,
     find_schema: Optional[ExerciseFindSchema] = Depends(get_exercise_find_schema),
     page: PageField = 0,
     size: SizeField = 10,
+    cursor: CursorField = None,
 ) -> list[ExerciseSchema]:
-    exercises = await service.get_by_user_id(session, user.id, find_schema, page, size)
+    exercises = await service.get_by_user_id(
+        session, user.id, find_schema, page, size, cursor
+    )
+    if exercises.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = exercises.next_cursor
     exercises_schema = [
-        await exercise_to_schema(session, file_service, exercise)
-        for exercise in exercises
+        exercise_to_schema(file_service, exercise) for exercise in exercises.items
     ]
     return exercises_schema
 
@@ -136,7 +147,7 @@ async def update_by_id(
     schema: ExerciseUpdateSchema,
 ) -> ExerciseSchema:
     exercise = await service.update_by_id(session, user.id, schema)
-    return await exercise_to_schema(session, file_service, exercise)
+    return exercise_to_schema(file_service, exercise)
 
 
 @exercises_router.delete(
@@ -64,6 +64,7 @@ class ExerciseUpdateSchema(BaseModel):
 
 
 class ExerciseFindSchema(BaseModel):
+    q: Optional[str] = None
     name: Optional[str] = None
     muscle: Optional[str] = None
     additionalMuscle: Optional[str] = None
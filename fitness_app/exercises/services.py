@@ -8,6 +8,7 @@ from fitness_app.core.exceptions import (
     ForbiddenException,
 )
 from fitness_app.core.utils import update_model_by_schema
+from fitness_app.exercises.catalogue import ExerciseCatalogue
 from fitness_app.exercises.models import Exercise
 from fitness_app.exercises.repositories import ExerciseRepository
 from fitness_app.exercises.schemas import (
@@ -23,9 +24,11 @@ class ExerciseService:
         self,
         exercise_repository: ExerciseRepository,
         file_entity_service: FileEntityService,
+        exercise_catalogue: ExerciseCatalogue,
     ):
         self._exercise_repository = exercise_repository
         self._file_entity_service = file_entity_service
+        self._exercise_catalogue = exercise_catalogue
 
     async def create(
         self,
@@ -53,12 +56,32 @@ class ExerciseService:
         return await self._exercise_repository.save(session, exercise)
 
     async def get_by_id(self, session: AsyncSession, id: int):
+        exercise = await self._exercise_catalogue.get(session, id)
+        if exercise:
+            return exercise
+
         exercise = await self._exercise_repository.get_by_id(session, id)
         if not exercise:
             raise EntityNotFoundException("Упражнения с указанным id не найдено")
 
+        self._exercise_catalogue.add(exercise)
         return exercise
 
+    async def get_by_ids(self, session: AsyncSession, ids: list[int]):
+        exercises = await self._exercise_catalogue.get_many(session, ids)
+        missing_ids = set(ids) - exercises.keys()
+        if missing_ids:
+            for exercise in await self._exercise_repository.get_by_ids(
+                session, missing_ids
+            ):
+                self._exercise_catalogue.add(exercise)
+                exercises[exercise.id] = exercise
+
+        if len(exercises) != len(set(ids)):
+            raise EntityNotFoundException("Упражнения с указанным id не найдено")
+
+        return exercises
+
     async def get_by_user_id(
         self,
         session: AsyncSession,
@@ -66,9 +89,10 @@ class ExerciseService:
         find_schema: Optional[ExerciseFindSchema],
         page: int,
         size: int,
+        cursor: Optional[str] = None,
     ):
         return await self._exercise_repository.get_by_user_id(
-            session, user_id, find_schema, page, size
+            session, user_id, find_schema, page, size, cursor
         )
 
     async def update_by_id(
@@ -87,6 +111,7 @@ class ExerciseService:
 
         update_model_by_schema(exercise, schema)
         exercise = await self._exercise_repository.save(session, exercise)
+        self._exercise_catalogue.invalidate(exercise.id)
 
         if schema.photo_ids or schema.photo_ids == []:
             existing_set = set(photo.id for photo in exercise.photos)
@@ -121,4 +146,5 @@ class ExerciseService:
                     session, exercise.photos[i].id
                 )
 
+        self._exercise_catalogue.invalidate(exercise.id)
         return await self._exercise_repository.delete(session, exercise)
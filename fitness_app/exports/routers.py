@@ -0,0 +1,39 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+
+from fitness_app.auth.dependencies import AuthenticateUser, HasPermission
+from fitness_app.auth.permissions import Authenticated
+from fitness_app.core.dependencies import DbManager, ExportServiceDep
+from fitness_app.exports.schemas import ExportFormat
+
+exports_router = APIRouter(prefix="/export", tags=["Экспорт"])
+
+MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv",
+}
+
+
+@exports_router.get(
+    "/history",
+    summary="Выгрузить всю историю шагов, воды, дневника и тренировок",
+    response_class=StreamingResponse,
+    dependencies=[Depends(HasPermission(Authenticated()))],
+)
+async def export_history(
+    db_manager: DbManager,
+    service: ExportServiceDep,
+    user: AuthenticateUser,
+    export_format: Annotated[ExportFormat, Query(alias="format")] = (
+        ExportFormat.NDJSON
+    ),
+):
+    return StreamingResponse(
+        service.export_history(db_manager, user, export_format),
+        media_type=MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="history.{export_format}"'
+        },
+    )
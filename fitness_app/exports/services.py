@@ -0,0 +1,151 @@
+import csv
+import io
+import json
+from typing import AsyncIterator, NamedTuple
+
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncResult, AsyncSession
+
+from fitness_app.core.db_manager import DatabaseManager
+from fitness_app.diaries.repositories import DiaryRepository
+from fitness_app.diaries.schemas import DiarySchema
+from fitness_app.exports.schemas import ExportFormat
+from fitness_app.steps.repositories import StepsRepository
+from fitness_app.steps.schemas import StepsSchema
+from fitness_app.users.models import User
+from fitness_app.users.schemas import Role
+from fitness_app.water_entries.repositories import WaterEntryRepository
+from fitness_app.water_entries.schemas import WaterEntrySchema
+from fitness_app.workouts.repositories import WorkoutRepository
+from fitness_app.workouts.schemas import WorkoutSchema
+
+# One wide table for all record types, a record leaves foreign columns empty
+CSV_COLUMNS = [
+    "type",
+    "id",
+    "date_field",
+    "steps",
+    "goal_steps",
+    "water_volume",
+    "goal_water_volume",
+    "feeling",
+    "reason",
+    "note",
+    "file_entity_id",
+    "name",
+    "type_connection",
+    "time_start",
+    "coach_id",
+    "customer_id",
+    "chat_id",
+]
+
+
+class ExportSource(NamedTuple):
+    type: str
+    schema: type[BaseModel]
+    rows: AsyncResult
+    exclude: frozenset[str] = frozenset()
+
+
+class ExportService:
+    def __init__(
+        self,
+        steps_repository: StepsRepository,
+        water_entry_repository: WaterEntryRepository,
+        diary_repository: DiaryRepository,
+        workout_repository: WorkoutRepository,
+        batch_size: int = 500,
+    ):
+        self._steps_repository = steps_repository
+        self._water_entry_repository = water_entry_repository
+        self._diary_repository = diary_repository
+        self._workout_repository = workout_repository
+        self._batch_size = batch_size
+
+    async def _get_sources(self, session: AsyncSession, user: User):
+        yield ExportSource(
+            "steps",
+            StepsSchema,
+            await self._steps_repository.stream_by_user_id(
+                session, user.id, self._batch_size
+            ),
+            frozenset({"user_id"}),
+        )
+        yield ExportSource(
+            "water",
+            WaterEntrySchema,
+            await self._water_entry_repository.stream_by_user_id(
+                session, user.id, self._batch_size
+            ),
+            frozenset({"user_id"}),
+        )
+        yield ExportSource(
+            "diary",
+            DiarySchema,
+            await self._diary_repository.stream_by_user_id(
+                session, user.id, self._batch_size
+            ),
+            frozenset({"user_id", "voice_note"}),
+        )
+
+        if user.role == Role.COACH:
+            coach_id, customer_id = user.coach_info.id, None
+        else:
+            coach_id, customer_id = None, user.customer_info.id
+        yield ExportSource(
+            "workout",
+            WorkoutSchema,
+            await self._workout_repository.stream_by_coach_id_or_customer_id(
+                session, coach_id, customer_id, self._batch_size
+            ),
+            frozenset({"exercise_workouts", "customer", "coach", "chat"}),
+        )
+
+    async def _get_records(
+        self, session: AsyncSession, user: User
+    ) -> AsyncIterator[list[dict]]:
+        # Sources are read one after another, each one is closed before the next
+        # cursor is opened
+        async for source in self._get_sources(session, user):
+            async for rows in source.rows.partitions():
+                yield [
+                    {
+                        "type": source.type,
+                        **source.schema.model_validate(row).model_dump(
+                            mode="json", exclude=source.exclude
+                        ),
+                    }
+                    for row in rows
+                ]
+
+    @staticmethod
+    def _to_ndjson(records: list[dict]):
+        return "".join(
+            json.dumps(record, ensure_ascii=False) + "\n" for record in records
+        )
+
+    @staticmethod
+    def _to_csv(records: list[dict], header: bool = False):
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, CSV_COLUMNS)
+        if header:
+            writer.writeheader()
+        writer.writerows(records)
+        return buffer.getvalue()
+
+    async def export_history(
+        self, db_manager: DatabaseManager, user: User, export_format: ExportFormat
+    ) -> AsyncIterator[str]:
+        """Steps, water, diary and workouts of the user, one chunk per batch of
+        rows. The session lives as long as the response is streamed, so it is
+        opened here rather than taken from the request."""
+        async with db_manager.create_session(read_only=True) as session:
+            if export_format == ExportFormat.CSV:
+                yield self._to_csv([], header=True)
+
+            async for records in self._get_records(session, user):
+                if export_format == ExportFormat.CSV:
+                    yield self._to_csv(records)
+                else:
+                    yield self._to_ndjson(records)
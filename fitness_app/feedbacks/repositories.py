@@ -9,12 +9,11 @@ class FeedbackRepository:
     async def save(self, session: AsyncSession, feedback: Feedback):
         session.add(feedback)
         await session.flush()
-        await session.commit()
         return feedback
 
     async def delete(self, session: AsyncSession, feedback: Feedback):
         await session.delete(feedback)
-        await session.commit()
+        await session.flush()
         return feedback
 
     async def is_exists(self, session: AsyncSession, coach_id: int, customer_id: int):
@@ -1,5 +1,6 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from fitness_app.auth.services import PrincipalCache
 from fitness_app.coaches.models import Coach
 from fitness_app.coaches.repositories import CoachRepository
 from fitness_app.coaches.services import CoachService
@@ -19,11 +20,13 @@ class FeedbackService:
         user_repository: UserRepository,
         coach_repository: CoachRepository,
         coach_service: CoachService,
+        principal_cache: PrincipalCache,
     ):
         self._feedback_repository = feedback_repository
         self._user_repository = user_repository
         self._coach_repository = coach_repository
         self._coach_service = coach_service
+        self._principal_cache = principal_cache
 
     async def create(
         self,
@@ -49,6 +52,7 @@ class FeedbackService:
         setattr(feedback, "coach", coach)
         feedback = await self._feedback_repository.save(session, feedback)
         await self._coach_repository.add_feedback(session, coach_id, feedback)
+        await self._principal_cache.invalidate(session, coach.user_id)
 
         return feedback
 
@@ -74,4 +78,5 @@ class FeedbackService:
         update_model_by_schema(feedback, schema)
         await self._feedback_repository.save(session, feedback)
         await self._coach_repository.save(session, coach)
+        await self._principal_cache.invalidate(session, coach.user_id)
         return feedback
@@ -1,6 +1,5 @@
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
 
 from fitness_app.file_entities.models import FileEntity
 
@@ -9,7 +8,6 @@ class FileEntityRepository:
     async def save(self, session: AsyncSession, file_entity: FileEntity):
         session.add(file_entity)
         await session.flush()
-        await session.commit()
         return file_entity
 
     async def get_by_id(self, session: AsyncSession, id: int):
@@ -17,16 +15,14 @@ class FileEntityRepository:
         result = await session.execute(statement)
         return result.scalar_one_or_none()
 
-    async def get_by_filename(self, session: AsyncSession, filename: str):
-        statement = (
-            select(FileEntity)
-            .where(FileEntity.filename == filename)
-            .options(joinedload(FileEntity.exercise))
+    async def get_existing_filenames(self, session: AsyncSession, filenames: set[str]):
+        statement = select(FileEntity.filename).where(
+            FileEntity.filename.in_(filenames)
         )
         result = await session.execute(statement)
-        return result.scalar_one_or_none()
+        return set(result.scalars().all())
 
     async def delete(self, session: AsyncSession, file_entity: FileEntity):
         await session.delete(file_entity)
-        await session.commit()
+        await session.flush()
         return file_entity
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, UploadFile, status
+from fastapi import APIRouter, Depends, Response, UploadFile, status
 
 from fitness_app.auth.dependencies import HasPermission
 from fitness_app.auth.permissions import Authenticated
@@ -8,6 +8,21 @@ from fitness_app.file_entities.schemas import FileEntitySchema
 file_entities_router = APIRouter(prefix="/files", tags=["Файлы"])
 
 
+@file_entities_router.get(
+    "/content/{filename}",
+    responses={
+        status.HTTP_404_NOT_FOUND: {
+            "description": "Файла с указанным filename не найдено"
+        }
+    },
+    response_class=Response,
+    summary="Получение содержимого файла по filename",
+    dependencies=[Depends(HasPermission(Authenticated()))],
+)
+async def get_content(service: FileEntityServiceDep, filename: str):
+    return await service.get_content(filename)
+
+
 @file_entities_router.get(
     "/{filename:path}",
     responses={
@@ -39,5 +54,5 @@ async def create(
     file: UploadFile,
 ) -> FileEntitySchema:
     file_entity = await service.create(session, file)
-    full_url = await service.get_by_filename(session, file_entity.filename)
+    full_url = service.get_url(file_entity.filename)
     return FileEntitySchema(**file_entity.__dict__, full_url=full_url)
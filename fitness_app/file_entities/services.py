@@ -1,8 +1,7 @@
 import os
 import uuid
-from urllib.parse import urljoin
 
-import boto3
+from boto3.exceptions import S3UploadFailedError
 from botocore.exceptions import ClientError
 from fastapi import UploadFile
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -15,35 +14,19 @@ from fitness_app.core.exceptions import (
 from fitness_app.exercises.repositories import ExerciseRepository
 from fitness_app.file_entities.models import FileEntity
 from fitness_app.file_entities.repositories import FileEntityRepository
+from fitness_app.file_entities.storage import StorageDriver
 
 
 class FileEntityService:
     def __init__(
         self,
-        region: str,
-        aws_access_key_id: str,
-        aws_secret_access_key: str,
-        bucket_name: str,
-        aws_endpoint: str,
-        aws_access_domain_name: str,
+        storage: StorageDriver,
         file_entity_repository: FileEntityRepository,
         exercise_repository: ExerciseRepository,
     ):
-        self._region = region
-        self._aws_access_key_id = aws_access_key_id
-        self._aws_secret_access_key = aws_secret_access_key
-        self._bucket_name = bucket_name
-        self._aws_endpoint = aws_endpoint
-        self._aws_access_domain_name = aws_access_domain_name
+        self._storage = storage
         self._file_entity_repository = file_entity_repository
         self._exercise_repository = exercise_repository
-        self._s3_client = boto3.client(
-            "s3",
-            aws_access_key_id=aws_access_key_id,
-            aws_secret_access_key=aws_secret_access_key,
-            region_name=region,
-            endpoint_url=aws_endpoint,
-        )
 
     async def add_to_s3(self, file: UploadFile):
         cur_uuid = str(uuid.uuid4())
@@ -52,8 +35,8 @@ class FileEntityService:
             cur_uuid += file_extension
 
         try:
-            self._s3_client.upload_fileobj(file.file, self._bucket_name, cur_uuid)
-        except ClientError as e:
+            await self._storage.upload(file.file, cur_uuid)
+        except (ClientError, S3UploadFailedError) as e:
             raise InternalServerError(str(e))
 
         return cur_uuid
@@ -77,17 +60,36 @@ class FileEntityService:
 
         return file_entity
 
-    async def get_by_filename(self, session: AsyncSession, filename: str):
-        file_entity = await self._file_entity_repository.get_by_filename(
-            session, filename
+    def get_url(self, filename: str):
+        return self._storage.get_url(filename)
+
+    async def get_urls_by_filenames(self, session: AsyncSession, filenames: list[str]):
+        if not filenames:
+            return []
+
+        existing_filenames = await self._file_entity_repository.get_existing_filenames(
+            session, set(filenames)
         )
-        if not file_entity:
+        if len(existing_filenames) != len(set(filenames)):
             raise EntityNotFoundException(
                 "FileEntity with given filename was not found"
             )
 
-        full_url = urljoin(self._aws_access_domain_name, filename)
-        return full_url
+        return [self.get_url(filename) for filename in filenames]
+
+    async def get_by_filename(self, session: AsyncSession, filename: str):
+        full_urls = await self.get_urls_by_filenames(session, [filename])
+        return full_urls[0]
+
+    async def get_content(self, filename: str):
+        try:
+            exists = await self._storage.exists(filename)
+        except ValueError:
+            exists = False
+        if not exists:
+            raise EntityNotFoundException("File with given filename was not found")
+
+        return await self._storage.get_response(filename)
 
     async def add_exercise_id_by_id(
         self, session: AsyncSession, exercise_id: int, id: int
@@ -110,9 +112,7 @@ class FileEntityService:
             raise EntityNotFoundException("FileEntity with given id was not found")
 
         try:
-            self._s3_client.delete_object(
-                Bucket=self._bucket_name, Key=file_entity.filename
-            )
+            await self._storage.delete(file_entity.filename)
         except ClientError as e:
             raise InternalServerError(str(e))
 
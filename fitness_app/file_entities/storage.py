@@ -0,0 +1,162 @@
+import asyncio
+import mimetypes
+import os
+import shutil
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import BinaryIO
+from urllib.parse import urljoin
+
+import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
+from fastapi.responses import FileResponse, RedirectResponse, Response
+
+
+class StorageDriver(ABC):
+    """Stores uploaded files by key and tells clients where to fetch them"""
+
+    def __init__(self, public_url: str):
+        self._public_url = public_url
+
+    @abstractmethod
+    async def upload(self, file: BinaryIO, key: str) -> None: ...
+
+    @abstractmethod
+    async def delete(self, key: str) -> None: ...
+
+    @abstractmethod
+    async def exists(self, key: str) -> bool: ...
+
+    @abstractmethod
+    async def get_response(self, key: str) -> Response: ...
+
+    def get_url(self, key: str):
+        return urljoin(self._public_url, key)
+
+    def close(self):
+        pass
+
+
+class S3Storage(StorageDriver):
+    """Runs blocking boto3 calls on a dedicated thread pool with a shared client"""
+
+    def __init__(
+        self,
+        region: str,
+        aws_access_key_id: str,
+        aws_secret_access_key: str,
+        bucket_name: str,
+        aws_endpoint: str,
+        public_url: str,
+        max_workers: int = 8,
+        multipart_threshold: int = 8 * 1024 * 1024,
+        multipart_chunksize: int = 8 * 1024 * 1024,
+    ):
+        super().__init__(public_url)
+        self._bucket_name = bucket_name
+        self._client = boto3.client(
+            "s3",
+            aws_access_key_id=aws_access_key_id,
+            aws_secret_access_key=aws_secret_access_key,
+            region_name=region,
+            endpoint_url=aws_endpoint,
+            config=Config(max_pool_connections=max_workers * 2),
+        )
+        self._transfer_config = TransferConfig(
+            multipart_threshold=multipart_threshold,
+            multipart_chunksize=multipart_chunksize,
+        )
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix="s3")
+
+    async def _run(self, function, *args, **kwargs):
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, partial(function, *args, **kwargs)
+        )
+
+    async def upload(self, file: BinaryIO, key: str):
+        await self._run(
+            self._client.upload_fileobj,
+            file,
+            self._bucket_name,
+            key,
+            Config=self._transfer_config,
+        )
+
+    async def delete(self, key: str):
+        await self._run(self._client.delete_object, Bucket=self._bucket_name, Key=key)
+
+    async def exists(self, key: str):
+        response = await self._run(
+            self._client.list_objects_v2,
+            Bucket=self._bucket_name,
+            Prefix=key,
+            MaxKeys=1,
+        )
+        return any(item["Key"] == key for item in response.get("Contents", []))
+
+    async def get_response(self, key: str):
+        return RedirectResponse(self.get_url(key))
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+        self._client.close()
+
+
+class LocalStorage(StorageDriver):
+    """Keeps files in a local directory, served by the app with sendfile"""
+
+    def __init__(self, root_path: str, public_url: str):
+        super().__init__(public_url)
+        self._root_path = os.path.abspath(root_path)
+        os.makedirs(self._root_path, exist_ok=True)
+
+    def _get_path(self, key: str):
+        if not key or os.path.basename(key) != key:
+            raise ValueError("Storage key must be a plain filename")
+        return os.path.join(self._root_path, key)
+
+    @staticmethod
+    def _write(file: BinaryIO, path: str):
+        with open(path, "wb") as destination:
+            shutil.copyfileobj(file, destination, 1024 * 1024)
+
+    async def upload(self, file: BinaryIO, key: str):
+        await asyncio.to_thread(self._write, file, self._get_path(key))
+
+    async def delete(self, key: str):
+        try:
+            await asyncio.to_thread(os.remove, self._get_path(key))
+        except FileNotFoundError:
+            pass
+
+    async def exists(self, key: str):
+        return await asyncio.to_thread(os.path.isfile, self._get_path(key))
+
+    async def get_response(self, key: str):
+        # FileResponse uses the ASGI pathsend extension when the server supports it
+        return FileResponse(self._get_path(key))
+
+
+class InMemoryStorage(StorageDriver):
+    """Keeps files in process memory, intended for local runs and benchmarks"""
+
+    def __init__(self, public_url: str):
+        super().__init__(public_url)
+        self._files: dict[str, bytes] = {}
+
+    async def upload(self, file: BinaryIO, key: str):
+        self._files[key] = file.read()
+
+    async def delete(self, key: str):
+        self._files.pop(key, None)
+
+    async def exists(self, key: str):
+        return key in self._files
+
+    async def get_response(self, key: str):
+        media_type, _ = mimetypes.guess_type(key)
+        return Response(
+            self._files[key], media_type=media_type or "application/octet-stream"
+        )
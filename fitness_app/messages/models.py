@@ -14,7 +14,7 @@ class Message(Base):
     __tablename__ = "messages"
 
     chat: Mapped["Chat"] = relationship("Chat", back_populates="messages")
-    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    id: Mapped[int] = mapped_column(primary_key=True)
     content: Mapped[Optional[str]] = mapped_column(nullable=True)
     timestamp: Mapped[datetime] = mapped_column(
         default=datetime.now, server_default=func.now()
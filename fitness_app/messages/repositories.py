@@ -1,6 +1,10 @@
-from sqlalchemy import func, select
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import exists, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from fitness_app.core.pagination import Keyset, KeysetKey
 from fitness_app.messages.models import Message
 
 
@@ -9,36 +13,64 @@ class MessageRepository:
     async def save(self, session: AsyncSession, message: Message):
         session.add(message)
         await session.flush()
-        await session.commit()
         return message
 
     async def delete(self, session: AsyncSession, message: Message):
         await session.delete(message)
-        await session.commit()
+        await session.flush()
         return message
 
-    async def count_messages(
+    async def get_messagees(
         self,
         session: AsyncSession,
         chat_id: int,
+        page: int,
+        size: int,
+        cursor: Optional[str] = None,
     ):
-        statement = select(func.count(Message.id)).where(Message.chat_id == chat_id)
+        keyset = Keyset(
+            KeysetKey(Message.timestamp, descending=True),
+            KeysetKey(Message.id, descending=True),
+        )
+        statement = keyset.apply(
+            select(Message).where(Message.chat_id == chat_id), page, size, cursor
+        )
+        result = await session.execute(statement)
+        return keyset.get_page(result.scalars().all(), size)
+
+    async def exists_in_chat(
+        self, session: AsyncSession, chat_id: int, message_id: int
+    ) -> bool:
+        statement = select(
+            exists().where(Message.id == message_id, Message.chat_id == chat_id)
+        )
         result = await session.execute(statement)
         return result.scalar_one()
 
-    async def get_messagees(
+    async def get_messages_since(
         self,
         session: AsyncSession,
         chat_id: int,
-        page: int,
-        size: int,
+        since_id: Optional[int],
+        since_timestamp: Optional[datetime],
+        limit: int,
     ):
-        statement = (
-            select(Message)
-            .where(Message.chat_id == chat_id)
-            .order_by(Message.timestamp.desc())
-            .offset(page * size)
-            .limit(size)
-        )
+        """Messages after the given one (or time) in ascending order, both filters
+        follow the (chat_id, timestamp, id) index"""
+        statement = select(Message).where(Message.chat_id == chat_id)
+        if since_id is not None:
+            since_message_timestamp = (
+                select(Message.timestamp)
+                .where(Message.id == since_id, Message.chat_id == chat_id)
+                .scalar_subquery()
+            )
+            statement = statement.where(
+                tuple_(Message.timestamp, Message.id)
+                > tuple_(since_message_timestamp, since_id)
+            )
+        if since_timestamp is not None:
+            statement = statement.where(Message.timestamp > since_timestamp)
+
+        statement = statement.order_by(Message.timestamp, Message.id).limit(limit)
         result = await session.execute(statement)
         return result.scalars().all()
@@ -1,14 +1,38 @@
-from fastapi import APIRouter, Depends
+import asyncio
+from datetime import datetime
+from typing import Annotated, Optional
+
+from fastapi import APIRouter, Depends, Query, WebSocket, WebSocketDisconnect, status
 
 from fitness_app.auth.dependencies import AuthenticateUser, HasPermission
 from fitness_app.auth.permissions import Authenticated
-from fitness_app.core.dependencies import DbSession, MessageServiceDep
+from fitness_app.core.dependencies import (
+    AuthServiceDep,
+    ChatServiceDep,
+    DbManager,
+    DbSession,
+    MessageServiceDep,
+    PubSubHubDep,
+)
+from fitness_app.core.exceptions import AppException
+from fitness_app.core.pagination import CountMode
+from fitness_app.core.pubsub import RESYNC
 from fitness_app.core.schemas import PageSchema
-from fitness_app.core.utils import IdField, PageField, SizeField
+from fitness_app.core.utils import (
+    CountField,
+    CursorField,
+    IdField,
+    PageField,
+    SizeField,
+)
 from fitness_app.messages.schemas import MessageCreateSchema, MessageSchema
+from fitness_app.messages.services import chat_topic
 
 messages_router = APIRouter(prefix="/messages", tags=["Сообщения"])
 
+RESYNC_EVENT = {"type": "resync"}
+MAX_LONG_POLL_WAIT = 30
+
 
 @messages_router.get(
     "/{chat_id}",
@@ -23,14 +47,49 @@ async def get_all(
     user: AuthenticateUser,
     page: PageField = 0,
     size: SizeField = 10,
+    cursor: CursorField = None,
+    count: CountField = CountMode.EXACT,
 ):
-    messages = await service.get_messages_by_chat_id(session, user, chat_id, page, size)
+    messages = await service.get_messages_by_chat_id(
+        session, user, chat_id, page, size, cursor, count
+    )
     return PageSchema(
         total_items_count=messages.total_items_count,
         items=list(map(MessageSchema.model_validate, messages.items)),
+        next_cursor=messages.next_cursor,
     )
 
 
+@messages_router.get(
+    "/{chat_id}/updates",
+    summary="Получить новые сообщения чата после указанного сообщения или времени",
+    response_model=list[MessageSchema],
+    response_description="Сообщения в порядке возрастания времени отправки",
+    dependencies=[Depends(HasPermission(Authenticated()))],
+)
+async def get_updates(
+    db_manager: DbManager,
+    service: MessageServiceDep,
+    chat_id: IdField,
+    user: AuthenticateUser,
+    since_id: Annotated[Optional[int], Query(ge=1)] = None,
+    since_timestamp: Annotated[Optional[datetime], Query()] = None,
+    limit: SizeField = 100,
+    wait: Annotated[
+        float,
+        Query(
+            ge=0,
+            le=MAX_LONG_POLL_WAIT,
+            description="Сколько секунд ждать новых сообщений, если их еще нет",
+        ),
+    ] = 0,
+):
+    messages = await service.get_messages_since(
+        db_manager, user, chat_id, since_id, since_timestamp, limit, wait
+    )
+    return list(map(MessageSchema.model_validate, messages))
+
+
 @messages_router.post(
     "/{chat_id}",
     summary="Отправить сообщение в чат",
@@ -46,3 +105,61 @@ async def send(
 ):
     message = await service.create(session, user, schema, chat_id)
     return MessageSchema.model_validate(message)
+
+
+async def _wait_for_disconnect(websocket: WebSocket):
+    try:
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+
+
+@messages_router.websocket("/{chat_id}/ws")
+async def subscribe(
+    websocket: WebSocket,
+    db_manager: DbManager,
+    auth_service: AuthServiceDep,
+    chat_service: ChatServiceDep,
+    pubsub_hub: PubSubHubDep,
+    chat_id: IdField,
+    token: Annotated[Optional[str], Query()] = None,
+):
+    """Pushes new messages of the chat as `{"type": "message.created", ...}`.
+
+    `{"type": "resync"}` means some events were lost and the client should
+    reload the messages. The token may be passed in the query, since browsers
+    can not set headers on a websocket handshake.
+    """
+    authorization = websocket.headers.get("Authorization", "")
+    if token is None and authorization.startswith("Bearer "):
+        token = authorization.removeprefix("Bearer ")
+
+    try:
+        # The session is only needed for the checks, the connection is not held
+        user = await auth_service.authenticate_user(db_manager, token or "")
+        async with db_manager.create_session(read_only=True) as session:
+            await chat_service.is_accessed_chat(session, user, chat_id)
+    except AppException as ex:
+        await websocket.close(status.WS_1008_POLICY_VIOLATION, ex.details)
+        return
+
+    with pubsub_hub.subscribe(chat_topic(chat_id)) as subscription:
+        await websocket.accept()
+        disconnect = asyncio.create_task(_wait_for_disconnect(websocket))
+        try:
+            while True:
+                event = asyncio.create_task(subscription.get())
+                await asyncio.wait(
+                    (event, disconnect), return_when=asyncio.FIRST_COMPLETED
+                )
+                if disconnect.done():
+                    event.cancel()
+                    break
+
+                data = event.result()
+                await websocket.send_json(data if data is not RESYNC else RESYNC_EVENT)
+        except WebSocketDisconnect:
+            pass
+        finally:
+            disconnect.cancel()
@@ -1,28 +1,47 @@
+import asyncio
 from datetime import datetime
+from typing import Optional
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from fitness_app.chats.services import ChatService
-from fitness_app.core.exceptions import EntityNotFoundException, ForbiddenException
+from fitness_app.core.db_manager import DatabaseManager
+from fitness_app.core.exceptions import (
+    BadRequestException,
+    EntityNotFoundException,
+    ForbiddenException,
+)
+from fitness_app.core.pagination import CountMode
+from fitness_app.core.pubsub import PubSubHub
 from fitness_app.core.schemas import PageSchema
 from fitness_app.core.utils import update_model_by_schema
 from fitness_app.file_entities.services import FileEntityService
 from fitness_app.messages.models import Message
 from fitness_app.messages.repositories import MessageRepository
-from fitness_app.messages.schemas import MessageBaseSchema, MessageCreateSchema
+from fitness_app.messages.schemas import (
+    MessageBaseSchema,
+    MessageCreateSchema,
+    MessageSchema,
+)
 from fitness_app.users.models import User
 
 
+def chat_topic(chat_id: int):
+    return f"chat:{chat_id}"
+
+
 class MessageService:
     def __init__(
         self,
         message_repository: MessageRepository,
         chat_service: ChatService,
         file_service: FileEntityService,
+        pubsub_hub: PubSubHub,
     ):
         self._message_repository = message_repository
         self._chat_service = chat_service
         self._file_service = file_service
+        self._pubsub_hub = pubsub_hub
 
     async def get_mesage_by_id(
         self,
@@ -31,7 +50,7 @@ class MessageService:
         message_id,
     ):
         message = await session.get(Message, message_id)
-        await self._chat_service.get_by_chat_id(
+        await self._chat_service.is_accessed_chat(
             session, user, message.chat_id
         )  # access checking
         return message
@@ -43,15 +62,76 @@ class MessageService:
         chat_id: int,
         page: int,
         size: int,
+        cursor: Optional[str] = None,
+        count_mode: CountMode = CountMode.EXACT,
     ):
-        await self._chat_service.get_by_chat_id(session, user, chat_id)
-        total_messages_count = await self._message_repository.count_messages(
-            session, chat_id
+        await self._chat_service.is_accessed_chat(session, user, chat_id)
+        total_messages_count = (
+            None
+            if count_mode == CountMode.NONE
+            else await self._chat_service.get_messages_count(session, chat_id)
         )
         messages = await self._message_repository.get_messagees(
-            session, chat_id, page, size
+            session, chat_id, page, size, cursor
+        )
+        return PageSchema(
+            total_items_count=total_messages_count,
+            items=messages.items,
+            next_cursor=messages.next_cursor,
         )
-        return PageSchema(total_items_count=total_messages_count, items=messages)
+
+    async def get_messages_since(
+        self,
+        db_manager: DatabaseManager,
+        user: User,
+        chat_id: int,
+        since_id: Optional[int],
+        since_timestamp: Optional[datetime],
+        limit: int,
+        wait: float = 0,
+    ):
+        """Newer messages in ascending order. With `wait` the request is held
+        until a message is sent to the chat or the timeout passes. No connection
+        is held while waiting, so each query opens its own short session (on the
+        primary, the replicas may not have the notified message yet)."""
+        if since_id is None and since_timestamp is None:
+            raise BadRequestException("since_id or since_timestamp is required")
+
+        async with db_manager.create_session(unit_of_work=False) as session:
+            await self._chat_service.is_accessed_chat(session, user, chat_id)
+            if since_id is not None and not (
+                await self._message_repository.exists_in_chat(
+                    session, chat_id, since_id
+                )
+            ):
+                raise EntityNotFoundException(
+                    "Message with given since_id was not found in the chat"
+                )
+            messages = await self._message_repository.get_messages_since(
+                session, chat_id, since_id, since_timestamp, limit
+            )
+        if messages or wait <= 0:
+            return messages
+
+        with self._pubsub_hub.subscribe(chat_topic(chat_id)) as subscription:
+            # Checked again after subscribing, so a message sent in between
+            # is not missed
+            async with db_manager.create_session(unit_of_work=False) as session:
+                messages = await self._message_repository.get_messages_since(
+                    session, chat_id, since_id, since_timestamp, limit
+                )
+            if messages:
+                return messages
+
+            try:
+                await asyncio.wait_for(subscription.get(), wait)
+            except asyncio.TimeoutError:
+                return []
+
+        async with db_manager.create_session(unit_of_work=False) as session:
+            return await self._message_repository.get_messages_since(
+                session, chat_id, since_id, since_timestamp, limit
+            )
 
     async def create(
         self,
@@ -60,26 +140,38 @@ class MessageService:
         create_schema: MessageCreateSchema,
         chat_id: int,
     ):
-        chat = await self._chat_service.get_by_chat_id(session, user, chat_id)
+        await self._chat_service.is_accessed_chat(session, user, chat_id)
         create_schema_dict = create_schema.model_dump(
             exclude=["filenames", "voice_filename"]
         )
         create_schema_dict["sender_id"] = user.id
         create_schema_dict["chat_id"] = chat_id
-        create_schema_dict["files_urls"] = []
-        for filename in create_schema.filenames:
-            file_url = await self._file_service.get_by_filename(session, filename)
-            create_schema_dict["files_urls"].append(file_url)
+        filenames = list(create_schema.filenames)
         if create_schema.voice_filename:
-            create_schema_dict["voice_url"] = await self._file_service.get_by_filename(
-                session, create_schema.voice_filename
-            )
+            filenames.append(create_schema.voice_filename)
+        urls = await self._file_service.get_urls_by_filenames(session, filenames)
+        create_schema_dict["files_urls"] = urls[: len(create_schema.filenames)]
+        if create_schema.voice_filename:
+            create_schema_dict["voice_url"] = urls[-1]
 
         messageSchema = MessageBaseSchema(**create_schema_dict)
         message = Message(**messageSchema.model_dump())
         saved_message = await self._message_repository.save(session, message)
-        chat.last_timestamp = saved_message.timestamp
-        await session.commit()
+        await self._chat_service.increment_messages_count(
+            session, chat_id, saved_message.timestamp
+        )
+        # The sender has read everything up to their own message
+        await self._chat_service.update_read_cursor(session, user.id, chat_id)
+        await self._pubsub_hub.publish(
+            session,
+            chat_topic(chat_id),
+            {
+                "type": "message.created",
+                "message": MessageSchema.model_validate(saved_message).model_dump(
+                    mode="json"
+                ),
+            },
+        )
         return saved_message
 
     async def update(
@@ -93,29 +185,25 @@ class MessageService:
         if message is None:
             raise EntityNotFoundException("message with given id not found")
         chat_id = message.chat_id
-        chat = await self._chat_service.get_by_chat_id(
-            session,
-            user,
-            chat_id,
-        )
+        await self._chat_service.is_accessed_chat(session, user, chat_id)
         if message.sender_id != user.id:
             raise ForbiddenException("only sender can edit message")
         udpate_schema_dict = udate_schema.model_dump(
             exclude=["filenames", "voice_filename"]
         )
-        udpate_schema_dict["files_urls"] = []
-        for filename in udate_schema.filenames:
-            file_url = await self._file_service.get_by_filename(session, filename)
-            udpate_schema_dict["files_urls"].append(file_url)
+        filenames = list(udate_schema.filenames)
         if udate_schema.voice_filename:
-            udpate_schema_dict["voice_url"] = await self._file_service.get_by_filename(
-                session, udate_schema.voice_filename
-            )
+            filenames.append(udate_schema.voice_filename)
+        urls = await self._file_service.get_urls_by_filenames(session, filenames)
+        udpate_schema_dict["files_urls"] = urls[: len(udate_schema.filenames)]
+        if udate_schema.voice_filename:
+            udpate_schema_dict["voice_url"] = urls[-1]
         udpate_schema_dict["timestamp"] = datetime.now(datetime.UTC)
 
         messageSchema = MessageBaseSchema(**udpate_schema_dict)
         update_model_by_schema(message, messageSchema)
         saved_message = await self._message_repository.save(session, message)
-        chat.last_timestamp = saved_message.timestamp
-        await session.commit()
+        await self._chat_service.update_last_timestamp(
+            session, chat_id, saved_message.timestamp
+        )
         return saved_message
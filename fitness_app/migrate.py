@@ -0,0 +1,19 @@
+import asyncio
+import logging
+import sys
+
+from fitness_app.core.db_manager import DatabaseManager
+from fitness_app.core.settings import AppSettings
+
+
+async def migrate(settings: AppSettings):
+    db = DatabaseManager(settings.db_url, pool_size=1, max_overflow=0)
+    try:
+        await db.migrate()
+    finally:
+        await db.dispose()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(stream=sys.stdout, level=logging.INFO)
+    asyncio.run(migrate(AppSettings()))
@@ -0,0 +1,231 @@
+"""Baseline schema: every table that was previously created by create_all"""
+
+
+def _create_enum(name: str, values: list[str]):
+    labels = ", ".join(f"'{value}'" for value in values)
+    return (
+        f"DO $$ BEGIN CREATE TYPE {name} AS ENUM ({labels}); "
+        "EXCEPTION WHEN duplicate_object THEN NULL; END $$"
+    )
+
+
+version = 1
+description = "baseline"
+statements = [
+    _create_enum("chattype", ["DIALOGUE", "WORKOUT"]),
+    _create_enum("productcategory", ["NEW", "POPULAR", "FOOD", "EQUIPMENT"]),
+    _create_enum("sex", ["MALE", "FEMALE"]),
+    _create_enum("role", ["COACH", "CUSTOMER"]),
+    _create_enum("speciality", ["KIDS", "ADULT", "YOGA"]),
+    _create_enum("usergoal", ["BE_ACTIVE", "BE_STRONG", "LOSE_WEIGHT"]),
+    _create_enum(
+        "fitnesslevel", ["NOVICE", "BEGINNER", "INTERMEDIATE", "ADVANCED", "ATHLETE"]
+    ),
+    _create_enum(
+        "exercisepreference",
+        ["JOGGING", "WALKING", "WEIGHTLIFT", "CARDIO", "YOGA", "OTHER"],
+    ),
+    _create_enum("feeling", ["ANGRY", "SAD", "NEUTRAL", "CALM", "EXCITED"]),
+    _create_enum(
+        "reason",
+        ["FAMILY", "SELF_ESTEEM", "WORK", "WEATHER", "SLEEP", "FOOD", "SOCIAL"],
+    ),
+    _create_enum("stages", ["WARM_UP", "MAIN", "COOL_DOWN"]),
+    """
+    CREATE TABLE IF NOT EXISTS chats (
+        id SERIAL NOT NULL,
+        last_timestamp TIMESTAMP WITHOUT TIME ZONE DEFAULT now() NOT NULL,
+        type chattype NOT NULL,
+        PRIMARY KEY (id)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_chats_id ON chats (id)",
+    """
+    CREATE TABLE IF NOT EXISTS products (
+        id SERIAL NOT NULL,
+        name VARCHAR NOT NULL,
+        description VARCHAR NOT NULL,
+        price INTEGER NOT NULL,
+        category productcategory NOT NULL,
+        link VARCHAR NOT NULL,
+        images VARCHAR[] NOT NULL,
+        PRIMARY KEY (id),
+        UNIQUE (id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS users (
+        id SERIAL NOT NULL,
+        email VARCHAR NOT NULL,
+        name VARCHAR NOT NULL,
+        sex sex,
+        birth_date DATE,
+        password_hash VARCHAR NOT NULL,
+        role role DEFAULT 'CUSTOMER' NOT NULL,
+        PRIMARY KEY (id),
+        UNIQUE (email)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS chats_users (
+        id SERIAL NOT NULL,
+        chat_id INTEGER NOT NULL,
+        user_id INTEGER NOT NULL,
+        PRIMARY KEY (id),
+        FOREIGN KEY (chat_id) REFERENCES chats (id),
+        FOREIGN KEY (user_id) REFERENCES users (id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS coaches (
+        id SERIAL NOT NULL,
+        speciality speciality NOT NULL,
+        user_id INTEGER NOT NULL,
+        rating FLOAT DEFAULT '5.0' NOT NULL,
+        PRIMARY KEY (id),
+        FOREIGN KEY (user_id) REFERENCES users (id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS customers (
+        id SERIAL NOT NULL,
+        goal usergoal,
+        fitness_level fitnesslevel,
+        preference exercisepreference,
+        user_id INTEGER NOT NULL,
+        PRIMARY KEY (id),
+        FOREIGN KEY (user_id) REFERENCES users (id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS exercises (
+        id SERIAL NOT NULL,
+        user_id INTEGER,
+        "originalUri" VARCHAR,
+        name VARCHAR NOT NULL,
+        muscle VARCHAR,
+        "additionalMuscle" VARCHAR,
+        type VARCHAR,
+        equipment VARCHAR,
+        difficulty VARCHAR,
+        description VARCHAR,
+        PRIMARY KEY (id),
+        FOREIGN KEY (user_id) REFERENCES users (id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS messages (
+        id SERIAL NOT NULL,
+        content VARCHAR,
+        timestamp TIMESTAMP WITHOUT TIME ZONE DEFAULT now() NOT NULL,
+        files_urls TEXT[] NOT NULL,
+        voice_url VARCHAR,
+        chat_id INTEGER NOT NULL,
+        sender_id INTEGER NOT NULL,
+        PRIMARY KEY (id),
+        FOREIGN KEY (chat_id) REFERENCES chats (id),
+        FOREIGN KEY (sender_id) REFERENCES users (id)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_messages_id ON messages (id)",
+    """
+    CREATE TABLE IF NOT EXISTS steps_entries (
+        id SERIAL NOT NULL,
+        user_id INTEGER NOT NULL,
+        steps INTEGER NOT NULL,
+        goal_steps INTEGER NOT NULL,
+        date_field DATE NOT NULL,
+        PRIMARY KEY (id),
+        CONSTRAINT uq_steps_user_date UNIQUE (user_id, date_field),
+        FOREIGN KEY (user_id) REFERENCES users (id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS water_entries (
+        id SERIAL NOT NULL,
+        user_id INTEGER NOT NULL,
+        water_volume INTEGER NOT NULL,
+        goal_water_volume INTEGER NOT NULL,
+        date_field DATE NOT NULL,
+        PRIMARY KEY (id),
+        CONSTRAINT uq_water_entities_user_date UNIQUE (user_id, date_field),
+        FOREIGN KEY (user_id) REFERENCES users (id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS coaches_customers (
+        customer_id INTEGER NOT NULL,
+        coach_id INTEGER NOT NULL,
+        PRIMARY KEY (customer_id, coach_id),
+        CONSTRAINT idx_unique_customer_coach UNIQUE (customer_id, coach_id),
+        FOREIGN KEY (customer_id) REFERENCES customers (id),
+        FOREIGN KEY (coach_id) REFERENCES coaches (id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS feedbacks (
+        customer_id INTEGER NOT NULL,
+        coach_id INTEGER NOT NULL,
+        score INTEGER NOT NULL,
+        PRIMARY KEY (customer_id, coach_id),
+        CONSTRAINT idx_unique_feedback UNIQUE (customer_id, coach_id),
+        FOREIGN KEY (customer_id) REFERENCES customers (id),
+        FOREIGN KEY (coach_id) REFERENCES coaches (id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS file_entities (
+        id SERIAL NOT NULL,
+        exercise_id INTEGER,
+        filename VARCHAR NOT NULL,
+        PRIMARY KEY (id),
+        FOREIGN KEY (exercise_id) REFERENCES exercises (id),
+        UNIQUE (filename)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS workouts (
+        id SERIAL NOT NULL,
+        coach_id INTEGER,
+        customer_id INTEGER,
+        chat_id INTEGER,
+        name VARCHAR NOT NULL,
+        type_connection VARCHAR,
+        time_start TIMESTAMP WITHOUT TIME ZONE,
+        PRIMARY KEY (id),
+        FOREIGN KEY (coach_id) REFERENCES coaches (id),
+        FOREIGN KEY (customer_id) REFERENCES customers (id),
+        FOREIGN KEY (chat_id) REFERENCES chats (id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS diaries_entries (
+        id SERIAL NOT NULL,
+        user_id INTEGER NOT NULL,
+        file_entity_id INTEGER,
+        date_field DATE NOT NULL,
+        feeling feeling,
+        reason reason,
+        note VARCHAR,
+        PRIMARY KEY (id),
+        CONSTRAINT uq_diary_user_date UNIQUE (user_id, date_field),
+        FOREIGN KEY (user_id) REFERENCES users (id),
+        FOREIGN KEY (file_entity_id) REFERENCES file_entities (id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS exercise_workouts (
+        id SERIAL NOT NULL,
+        exercise_id INTEGER NOT NULL,
+        workout_id INTEGER NOT NULL,
+        num_order INTEGER NOT NULL,
+        num_sets INTEGER,
+        num_sets_done INTEGER NOT NULL,
+        num_reps INTEGER,
+        stage stages NOT NULL,
+        PRIMARY KEY (id),
+        FOREIGN KEY (exercise_id) REFERENCES exercises (id),
+        FOREIGN KEY (workout_id) REFERENCES workouts (id)
+    )
+    """,
+]
@@ -0,0 +1,15 @@
+"""Per-chat message counter, so message pages do not need a COUNT query"""
+
+version = 2
+description = "chat messages count"
+statements = [
+    "ALTER TABLE chats ADD COLUMN IF NOT EXISTS "
+    "messages_count INTEGER DEFAULT 0 NOT NULL",
+    """
+    UPDATE chats SET messages_count = counts.messages_count
+    FROM (
+        SELECT chat_id, count(*) AS messages_count FROM messages GROUP BY chat_id
+    ) AS counts
+    WHERE chats.id = counts.chat_id
+    """,
+]
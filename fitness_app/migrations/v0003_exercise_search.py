@@ -0,0 +1,33 @@
+"""Full-text and trigram search over the exercise catalogue"""
+
+_SEARCH_VECTOR = (
+    "setweight(to_tsvector('russian'::regconfig, coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('russian'::regconfig, "
+    "coalesce(muscle, '') || ' ' || coalesce(\"additionalMuscle\", '')), 'B') || "
+    "setweight(to_tsvector('russian'::regconfig, "
+    "coalesce(type, '') || ' ' || coalesce(equipment, '')), 'C') || "
+    "setweight(to_tsvector('russian'::regconfig, coalesce(description, '')), 'D')"
+)
+
+
+def _create_trigram_index(column: str):
+    return (
+        f"CREATE INDEX IF NOT EXISTS ix_exercises_{column.lower()}_trgm "
+        f'ON exercises USING gin ("{column}" gin_trgm_ops)'
+    )
+
+
+version = 3
+description = "exercise search"
+statements = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "ALTER TABLE exercises ADD COLUMN IF NOT EXISTS search_vector tsvector "
+    f"GENERATED ALWAYS AS ({_SEARCH_VECTOR}) STORED",
+    "CREATE INDEX IF NOT EXISTS ix_exercises_search_vector "
+    "ON exercises USING gin (search_vector)",
+    _create_trigram_index("name"),
+    _create_trigram_index("muscle"),
+    _create_trigram_index("additionalMuscle"),
+    _create_trigram_index("equipment"),
+    _create_trigram_index("description"),
+]
@@ -0,0 +1,47 @@
+"""Indexes for foreign keys and the filter/order columns of list queries"""
+
+
+def _create_index(name: str, table: str, columns: str):
+    return f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({columns})"
+
+
+version = 4
+description = "query indexes"
+statements = [
+    # Duplicates of the primary keys
+    "DROP INDEX IF EXISTS ix_chats_id",
+    "DROP INDEX IF EXISTS ix_messages_id",
+    # Message pages: chat_id = ? ORDER BY timestamp DESC, id DESC
+    _create_index(
+        "ix_messages_chat_id_timestamp", "messages", "chat_id, timestamp DESC, id DESC"
+    ),
+    _create_index("ix_messages_sender_id", "messages", "sender_id"),
+    # Chats of a user and members of a chat
+    _create_index("ix_chats_users_user_id_chat_id", "chats_users", "user_id, chat_id"),
+    _create_index("ix_chats_users_chat_id", "chats_users", "chat_id"),
+    # Workout lists: coach_id / customer_id = ? ORDER BY time_start, id
+    _create_index(
+        "ix_workouts_coach_id_time_start", "workouts", "coach_id, time_start, id"
+    ),
+    _create_index(
+        "ix_workouts_customer_id_time_start", "workouts", "customer_id, time_start, id"
+    ),
+    _create_index("ix_workouts_chat_id", "workouts", "chat_id"),
+    _create_index(
+        "ix_exercise_workouts_workout_id", "exercise_workouts", "workout_id, num_order"
+    ),
+    _create_index(
+        "ix_exercise_workouts_exercise_id", "exercise_workouts", "exercise_id"
+    ),
+    _create_index("ix_exercises_user_id", "exercises", "user_id"),
+    _create_index("ix_file_entities_exercise_id", "file_entities", "exercise_id"),
+    _create_index(
+        "ix_diaries_entries_file_entity_id", "diaries_entries", "file_entity_id"
+    ),
+    # One-to-one profiles are loaded by user_id with every principal
+    _create_index("ix_coaches_user_id", "coaches", "user_id"),
+    _create_index("ix_customers_user_id", "customers", "user_id"),
+    # The primary keys start with customer_id, coach lookups need their own
+    _create_index("ix_coaches_customers_coach_id", "coaches_customers", "coach_id"),
+    _create_index("ix_feedbacks_coach_id", "feedbacks", "coach_id"),
+]
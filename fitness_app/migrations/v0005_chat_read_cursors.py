@@ -0,0 +1,22 @@
+"""Per-member read cursors, so the chat list can show unread counters"""
+
+version = 5
+description = "chat read cursors"
+statements = [
+    "ALTER TABLE chats_users ADD COLUMN IF NOT EXISTS last_read_message_id INTEGER",
+    "ALTER TABLE chats_users ADD COLUMN IF NOT EXISTS "
+    "read_messages_count INTEGER DEFAULT 0 NOT NULL",
+    # Existing history is treated as read
+    """
+    UPDATE chats_users SET
+        read_messages_count = chats.messages_count,
+        last_read_message_id = (
+            SELECT messages.id FROM messages
+            WHERE messages.chat_id = chats.id
+            ORDER BY messages.timestamp DESC, messages.id DESC
+            LIMIT 1
+        )
+    FROM chats
+    WHERE chats.id = chats_users.chat_id
+    """,
+]
@@ -0,0 +1,32 @@
+"""Canonical key of a dialogue: the ordered pair of its member ids"""
+
+version = 6
+description = "dialogue key"
+statements = [
+    "ALTER TABLE chats ADD COLUMN IF NOT EXISTS dialogue_user1_id INTEGER",
+    "ALTER TABLE chats ADD COLUMN IF NOT EXISTS dialogue_user2_id INTEGER",
+    # Dialogues duplicated by concurrent assignments keep their history, but
+    # only the oldest one gets the key and is found by the pair afterwards
+    """
+    UPDATE chats SET
+        dialogue_user1_id = pairs.user1_id,
+        dialogue_user2_id = pairs.user2_id
+    FROM (
+        SELECT DISTINCT ON (user1_id, user2_id) chat_id, user1_id, user2_id
+        FROM (
+            SELECT chats_users.chat_id,
+                min(chats_users.user_id) AS user1_id,
+                max(chats_users.user_id) AS user2_id
+            FROM chats_users
+            JOIN chats ON chats.id = chats_users.chat_id
+            WHERE chats.type = 'DIALOGUE'
+            GROUP BY chats_users.chat_id
+            HAVING count(DISTINCT chats_users.user_id) = 2
+        ) AS members
+        ORDER BY user1_id, user2_id, chat_id
+    ) AS pairs
+    WHERE chats.id = pairs.chat_id
+    """,
+    "CREATE UNIQUE INDEX IF NOT EXISTS ux_chats_dialogue_users "
+    "ON chats (dialogue_user1_id, dialogue_user2_id)",
+]
@@ -0,0 +1,12 @@
+"""Partial indexes for the branches of the coach workout list"""
+
+version = 7
+description = "workout owner indexes"
+statements = [
+    # coach_id = ? AND customer_id IS NULL ORDER BY time_start, id
+    "CREATE INDEX IF NOT EXISTS ix_workouts_coach_id_time_start_unassigned "
+    "ON workouts (coach_id, time_start, id) WHERE customer_id IS NULL",
+    # coach_id IS NULL AND customer_id IS NULL ORDER BY time_start, id
+    "CREATE INDEX IF NOT EXISTS ix_workouts_time_start_ownerless "
+    "ON workouts (time_start, id) WHERE coach_id IS NULL AND customer_id IS NULL",
+]
@@ -0,0 +1,39 @@
+"""Daily, weekly and monthly totals of steps and water per user"""
+
+version = 8
+description = "activity rollups"
+statements = [
+    """
+    CREATE TABLE IF NOT EXISTS activity_rollups (
+        user_id INTEGER NOT NULL REFERENCES users (id) ON DELETE CASCADE,
+        metric VARCHAR NOT NULL,
+        period VARCHAR NOT NULL,
+        period_start DATE NOT NULL,
+        entries_count INTEGER DEFAULT 0 NOT NULL,
+        total BIGINT DEFAULT 0 NOT NULL,
+        goal_hits INTEGER DEFAULT 0 NOT NULL,
+        PRIMARY KEY (user_id, metric, period, period_start)
+    )
+    """,
+    """
+    INSERT INTO activity_rollups
+        (user_id, metric, period, period_start, entries_count, total, goal_hits)
+    SELECT user_id, 'steps', period,
+        date_trunc(period, date_field::timestamp)::date,
+        count(*), sum(steps), count(*) FILTER (WHERE steps >= goal_steps)
+    FROM steps_entries, unnest(ARRAY['day', 'week', 'month']) AS period
+    GROUP BY user_id, period, date_trunc(period, date_field::timestamp)::date
+    ON CONFLICT DO NOTHING
+    """,
+    """
+    INSERT INTO activity_rollups
+        (user_id, metric, period, period_start, entries_count, total, goal_hits)
+    SELECT user_id, 'water', period,
+        date_trunc(period, date_field::timestamp)::date,
+        count(*), sum(water_volume),
+        count(*) FILTER (WHERE water_volume >= goal_water_volume)
+    FROM water_entries, unnest(ARRAY['day', 'week', 'month']) AS period
+    GROUP BY user_id, period, date_trunc(period, date_field::timestamp)::date
+    ON CONFLICT DO NOTHING
+    """,
+]
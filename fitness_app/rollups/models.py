@@ -0,0 +1,21 @@
+from datetime import date
+
+from sqlalchemy import BigInteger, ForeignKey, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from fitness_app.core.db_manager import Base
+
+
+class ActivityRollup(Base):
+    __tablename__ = "activity_rollups"
+
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    # Plain strings holding RollupMetric and RollupPeriod values
+    metric: Mapped[str] = mapped_column(String, primary_key=True)
+    period: Mapped[str] = mapped_column(String, primary_key=True)
+    period_start: Mapped[date] = mapped_column(primary_key=True)
+    entries_count: Mapped[int] = mapped_column(default=0, server_default="0")
+    total: Mapped[int] = mapped_column(BigInteger, default=0, server_default="0")
+    goal_hits: Mapped[int] = mapped_column(default=0, server_default="0")
@@ -0,0 +1,76 @@
+from datetime import date
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from fitness_app.rollups.models import ActivityRollup
+from fitness_app.rollups.schemas import RollupMetric, RollupPeriod
+
+
+class RollupRepository:
+    async def add(
+        self,
+        session: AsyncSession,
+        user_id: int,
+        metric: RollupMetric,
+        day: date,
+        entries_count: int,
+        total: int,
+        goal_hits: int,
+    ):
+        """Adds the deltas to the buckets of every period containing the day.
+        Additions commute, so concurrent changes of different days can not
+        overwrite each other."""
+        statement = insert(ActivityRollup).values(
+            [
+                {
+                    "user_id": user_id,
+                    "metric": metric.value,
+                    "period": period.value,
+                    "period_start": period.get_start(day),
+                    "entries_count": entries_count,
+                    "total": total,
+                    "goal_hits": goal_hits,
+                }
+                for period in RollupPeriod
+            ]
+        )
+        statement = statement.on_conflict_do_update(
+            index_elements=[
+                ActivityRollup.user_id,
+                ActivityRollup.metric,
+                ActivityRollup.period,
+                ActivityRollup.period_start,
+            ],
+            set_={
+                "entries_count": ActivityRollup.entries_count
+                + statement.excluded.entries_count,
+                "total": ActivityRollup.total + statement.excluded.total,
+                "goal_hits": ActivityRollup.goal_hits + statement.excluded.goal_hits,
+            },
+        )
+        await session.execute(statement)
+
+    async def get_buckets(
+        self,
+        session: AsyncSession,
+        user_id: int,
+        metric: RollupMetric,
+        period: RollupPeriod,
+        date_start: date,
+        date_finish: date,
+    ):
+        statement = (
+            select(ActivityRollup)
+            .where(
+                ActivityRollup.user_id == user_id,
+                ActivityRollup.metric == metric.value,
+                ActivityRollup.period == period.value,
+                ActivityRollup.period_start >= period.get_start(date_start),
+                ActivityRollup.period_start <= date_finish,
+            )
+            .order_by(ActivityRollup.period_start)
+        )
+        result = await session.execute(statement)
+        return result.scalars().all()
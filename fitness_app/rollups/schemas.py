@@ -0,0 +1,34 @@
+from datetime import date, timedelta
+from enum import StrEnum
+
+from pydantic import BaseModel, ConfigDict
+
+
+class RollupMetric(StrEnum):
+    STEPS = "steps"
+    WATER = "water"
+
+
+class RollupPeriod(StrEnum):
+    DAY = "day"
+    WEEK = "week"
+    MONTH = "month"
+
+    def get_start(self, day: date) -> date:
+        """First day of the period containing the day, weeks start on Monday"""
+        if self == RollupPeriod.WEEK:
+            return day - timedelta(days=day.weekday())
+        if self == RollupPeriod.MONTH:
+            return day.replace(day=1)
+        return day
+
+
+class RollupBucketSchema(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    period_start: date
+    entries_count: int
+    total: int
+    average: float
+    goal_hits: int
+    goal_hit_ratio: float
@@ -0,0 +1,67 @@
+from datetime import date
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from fitness_app.core.exceptions import BadRequestException
+from fitness_app.rollups.repositories import RollupRepository
+from fitness_app.rollups.schemas import RollupBucketSchema, RollupMetric, RollupPeriod
+
+
+class RollupService:
+    def __init__(self, rollup_repository: RollupRepository):
+        self._rollup_repository = rollup_repository
+
+    async def record(
+        self,
+        session: AsyncSession,
+        user_id: int,
+        metric: RollupMetric,
+        day: date,
+        value: int,
+        goal: int,
+        previous: Optional[tuple[int, int]] = None,
+    ):
+        """Accounts a daily entry which was created (no previous value and goal)
+        or changed from the previous value and goal"""
+        entries_count, total, goal_hits = 1, value, int(value >= goal)
+        if previous is not None:
+            previous_value, previous_goal = previous
+            entries_count = 0
+            total -= previous_value
+            goal_hits -= int(previous_value >= previous_goal)
+
+        if entries_count or total or goal_hits:
+            await self._rollup_repository.add(
+                session, user_id, metric, day, entries_count, total, goal_hits
+            )
+
+    async def get_buckets(
+        self,
+        session: AsyncSession,
+        user_id: int,
+        metric: RollupMetric,
+        period: RollupPeriod,
+        date_start: date,
+        date_finish: date,
+    ) -> list[RollupBucketSchema]:
+        """Whole periods intersecting the range, the ones without entries are
+        omitted"""
+        if date_start > date_finish:
+            raise BadRequestException("date_start must not be after date_finish")
+
+        rollups = await self._rollup_repository.get_buckets(
+            session, user_id, metric, period, date_start, date_finish
+        )
+        return [
+            RollupBucketSchema(
+                period_start=rollup.period_start,
+                entries_count=rollup.entries_count,
+                total=rollup.total,
+                average=rollup.total / rollup.entries_count,
+                goal_hits=rollup.goal_hits,
+                goal_hit_ratio=rollup.goal_hits / rollup.entries_count,
+            )
+            for rollup in rollups
+            if rollup.entries_count
+        ]
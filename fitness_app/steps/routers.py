@@ -4,7 +4,8 @@ from fastapi import APIRouter, Depends, status
 
 from fitness_app.auth.dependencies import AuthenticateUser, HasPermission
 from fitness_app.auth.permissions import Authenticated
-from fitness_app.core.dependencies import DbSession, StepsServiceDep
+from fitness_app.core.dependencies import DbReadSession, DbSession, StepsServiceDep
+from fitness_app.rollups.schemas import RollupBucketSchema, RollupPeriod
 from fitness_app.steps.schemas import StepsCreateSchema, StepsSchema
 
 steps_router = APIRouter(prefix="/steps", tags=["Шаги"])
@@ -22,7 +23,7 @@ steps_router = APIRouter(prefix="/steps", tags=["Шаги"])
     dependencies=[Depends(HasPermission(Authenticated()))],
 )
 async def get_steps_by_dates(
-    session: DbSession,
+    session: DbReadSession,
     service: StepsServiceDep,
     user: AuthenticateUser,
     date_start: date,
@@ -32,6 +33,23 @@ async def get_steps_by_dates(
     return steps
 
 
+@steps_router.get(
+    "/rollups",
+    summary="Получить суммы шагов по дням, неделям или месяцам",
+    response_model=list[RollupBucketSchema],
+    dependencies=[Depends(HasPermission(Authenticated()))],
+)
+async def get_steps_rollups(
+    session: DbReadSession,
+    service: StepsServiceDep,
+    user: AuthenticateUser,
+    date_start: date,
+    date_finish: date,
+    period: RollupPeriod = RollupPeriod.DAY,
+) -> list[RollupBucketSchema]:
+    return await service.get_rollups(session, user.id, period, date_start, date_finish)
+
+
 @steps_router.put(
     "",
     summary="Создать сегодняшние шаги",
@@ -2,15 +2,21 @@ from datetime import date
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from fitness_app.core.utils import update_model_by_schema
-from fitness_app.steps.models import StepsEntry
+from fitness_app.rollups.schemas import RollupBucketSchema, RollupMetric, RollupPeriod
+from fitness_app.rollups.services import RollupService
 from fitness_app.steps.repositories import StepsRepository
 from fitness_app.steps.schemas import StepsCreateSchema
 
 
 class StepsService:
-    def __init__(self, steps_repository: StepsRepository, goal_steps: int):
+    def __init__(
+        self,
+        steps_repository: StepsRepository,
+        rollup_service: RollupService,
+        goal_steps: int,
+    ):
         self._steps_repository = steps_repository
+        self._rollup_service = rollup_service
         self._goal_steps = goal_steps
 
     async def get_by_dates(
@@ -26,20 +32,37 @@ class StepsService:
     async def create_or_update(
         self, session: AsyncSession, user_id: int, schema: StepsCreateSchema
     ):
-        curr_date = date.today()
-        if await self._steps_repository.exists_by_user_id_and_date(
-            session, user_id, curr_date
-        ):
-            steps_entry = await self._steps_repository.get_by_user_id_and_date(
-                session, user_id, curr_date
-            )
-            update_model_by_schema(steps_entry, schema)
-        else:
-            steps_entry = StepsEntry(
-                **schema.model_dump(),
-                user_id=user_id,
-                goal_steps=self._goal_steps,
-                date_field=curr_date,
-            )
-
-        return await self._steps_repository.save(session, steps_entry)
+        values = schema.model_dump()
+        steps_entry, previous_row = await self._steps_repository.upsert(
+            session,
+            user_id,
+            date.today(),
+            {**values, "goal_steps": self._goal_steps},
+            values.keys(),
+        )
+        previous = None
+        if previous_row is not None:
+            previous = previous_row["steps"], previous_row["goal_steps"]
+
+        await self._rollup_service.record(
+            session,
+            user_id,
+            RollupMetric.STEPS,
+            steps_entry.date_field,
+            steps_entry.steps,
+            steps_entry.goal_steps,
+            previous,
+        )
+        return steps_entry
+
+    async def get_rollups(
+        self,
+        session: AsyncSession,
+        user_id: int,
+        period: RollupPeriod,
+        date_start: date,
+        date_finish: date,
+    ) -> list[RollupBucketSchema]:
+        return await self._rollup_service.get_buckets(
+            session, user_id, RollupMetric.STEPS, period, date_start, date_finish
+        )
@@ -1,6 +1,9 @@
-from sqlalchemy import func, select
+from typing import Optional
+
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from fitness_app.core.pagination import CountMode, Keyset, KeysetKey, count_rows
 from fitness_app.store.models import Product
 from fitness_app.store.schemas import ProductCategory
 
@@ -19,36 +22,37 @@ class StoreRepository:
         size: int,
         category: ProductCategory,
         name_part: str,
+        cursor: Optional[str] = None,
     ):
-        statement = select(Product).order_by(Product.id)
+        keyset = Keyset(KeysetKey(Product.id))
+        statement = select(Product)
         if category:
             statement = statement.filter(Product.category == category)
         if name_part:
             statement = statement.where(Product.name.icontains(name_part))
-        statement = statement.offset(page * size).limit(size)
+        statement = keyset.apply(statement, page, size, cursor)
         result = await session.execute(statement)
-        return result.scalars().all()
+        return keyset.get_page(result.scalars().all(), size)
 
     async def count_all(
         self,
         session: AsyncSession,
         category,
         name_part,
+        count_mode: CountMode = CountMode.EXACT,
     ):
-        statement = select(func.count()).select_from(Product)
+        statement = select(Product.id)
         if category:
             statement = statement.filter(Product.category == category)
         if name_part:
             statement = statement.filter(Product.name.icontains(name_part))
-        result = await session.execute(statement)
-        return result.scalar_one()
+        return await count_rows(session, statement, count_mode)
 
     async def save(self, session: AsyncSession, product: Product) -> Product:
         session.add(product)
         await session.flush()
-        await session.commit()
         return product
 
     async def delete(self, session: AsyncSession, product: Product):
         await session.delete(product)
-        await session.commit()
+        await session.flush()
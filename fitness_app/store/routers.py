@@ -2,9 +2,16 @@ from fastapi import APIRouter, Depends, status
 
 from fitness_app.auth.dependencies import HasPermission
 from fitness_app.auth.permissions import Authenticated
-from fitness_app.core.dependencies import DbSession, StoreServiceDep
+from fitness_app.core.dependencies import DbReadSession, DbSession, StoreServiceDep
+from fitness_app.core.pagination import CountMode
 from fitness_app.core.schemas import PageSchema
-from fitness_app.core.utils import IdField, PageField, SizeField
+from fitness_app.core.utils import (
+    CountField,
+    CursorField,
+    IdField,
+    PageField,
+    SizeField,
+)
 from fitness_app.store.schemas import (
     ProductCategory,
     ProductCreateSchema,
@@ -40,7 +47,7 @@ async def create_product(
     response_model=ProductSchema,
 )
 async def get_product_by_id(
-    session: DbSession,
+    session: DbReadSession,
     service: StoreServiceDep,
     product_id: IdField,
 ):
@@ -53,17 +60,20 @@ async def get_product_by_id(
     summary="Получить список товаров",
 )
 async def get_all_products(
-    session: DbSession,
+    session: DbReadSession,
     service: StoreServiceDep,
     page: PageField = 0,
     size: SizeField = 10,
     category: ProductCategory | None = None,
     name: str = None,
+    cursor: CursorField = None,
+    count: CountField = CountMode.EXACT,
 ):
-    products = await service.get_all(session, page, size, category, name)
+    products = await service.get_all(session, page, size, category, name, cursor, count)
     return PageSchema(
         total_items_count=products.total_items_count,
         items=list(map(ProductSchema.model_validate, products.items)),
+        next_cursor=products.next_cursor,
     )
 
 
@@ -1,6 +1,9 @@
+from typing import Optional
+
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from fitness_app.core.exceptions import EntityNotFoundException
+from fitness_app.core.pagination import CountMode
 from fitness_app.core.schemas import PageSchema
 from fitness_app.core.utils import update_model_by_schema
 from fitness_app.store.models import Product
@@ -37,16 +40,20 @@ class StoreService:
         size: int,
         category: ProductCategory,
         name_part: str,
+        cursor: Optional[str] = None,
+        count_mode: CountMode = CountMode.EXACT,
     ) -> PageSchema:
         total_products_count = await self._store_repository.count_all(
-            session,
-            category,
-            name_part,
+            session, category, name_part, count_mode
         )
         products = await self._store_repository.get_all(
-            session, page, size, category, name_part
+            session, page, size, category, name_part, cursor
+        )
+        return PageSchema(
+            total_items_count=total_products_count,
+            items=products.items,
+            next_cursor=products.next_cursor,
         )
-        return PageSchema(total_items_count=total_products_count, items=products)
 
     async def update_by_id(
         self, session: AsyncSession, id: int, schema: ProductCreateSchema
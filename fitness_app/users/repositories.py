@@ -1,4 +1,6 @@
-from sqlalchemy import and_, exists, func, select
+from typing import Optional
+
+from sqlalchemy import and_, exists, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload, selectinload
 
@@ -7,6 +9,7 @@ from fitness_app.core.exceptions import (
     EntityAlreadyExistsException,
     EntityNotFoundException,
 )
+from fitness_app.core.pagination import CountMode, Keyset, KeysetKey, count_rows
 from fitness_app.customers.models import Customer
 from fitness_app.users.models import CoachesCustomers, User
 
@@ -33,15 +36,22 @@ class UserRepository:
         result = await session.execute(statement)
         return result.scalar_one()
 
-    async def get_all(self, session: AsyncSession, page: int, size: int):
-        statement = select(User).order_by(User.id).offset(page * size).limit(size)
+    async def get_all(
+        self,
+        session: AsyncSession,
+        page: int,
+        size: int,
+        cursor: Optional[str] = None,
+    ):
+        keyset = Keyset(KeysetKey(User.id))
+        statement = keyset.apply(select(User), page, size, cursor)
         result = await session.execute(statement)
-        return result.scalars().all()
+        return keyset.get_page(result.scalars().all(), size)
 
-    async def count_all(self, session: AsyncSession):
-        statement = select(func.count()).select_from(User)
-        result = await session.execute(statement)
-        return result.scalar_one()
+    async def count_all(
+        self, session: AsyncSession, count_mode: CountMode = CountMode.EXACT
+    ):
+        return await count_rows(session, select(User.id), count_mode)
 
     async def is_exists_assignment(
         self, session: AsyncSession, customer_id: int, coach_id: int
@@ -94,7 +104,7 @@ class UserRepository:
         if customer not in coach.customers:
             coach.customers.append(customer)
 
-        await session.commit()
+        await session.flush()
         return users
 
     async def unassign_coach_custoemer(
@@ -128,16 +138,14 @@ class UserRepository:
         if customer in coach.customers:
             coach.customers.remove(customer)
         await session.flush()
-        await session.commit()
         return users
 
     async def save(self, session: AsyncSession, user: User):
         session.add(user)
         await session.flush()
-        await session.commit()
         return user
 
     async def delete(self, session: AsyncSession, user: User):
         await session.delete(user)
-        await session.commit()
+        await session.flush()
         return user
@@ -3,8 +3,15 @@ from fastapi import APIRouter, Depends, status
 from fitness_app.auth.dependencies import AuthenticateUser, HasPermission
 from fitness_app.auth.permissions import Authenticated
 from fitness_app.core.dependencies import DbSession, UserServiceDep
+from fitness_app.core.pagination import CountMode
 from fitness_app.core.schemas import PageSchema
-from fitness_app.core.utils import IdField, PageField, SizeField
+from fitness_app.core.utils import (
+    CountField,
+    CursorField,
+    IdField,
+    PageField,
+    SizeField,
+)
 from fitness_app.users.schemas import (
     UserPasswordUpdateSchema,
     UserSchema,
@@ -25,11 +32,14 @@ async def get_all(
     service: UserServiceDep,
     page: PageField = 0,
     size: SizeField = 10,
+    cursor: CursorField = None,
+    count: CountField = CountMode.EXACT,
 ):
-    users = await service.get_all(session, page, size)
+    users = await service.get_all(session, page, size, cursor, count)
     return PageSchema(
         total_items_count=users.total_items_count,
         items=list(map(UserSchema.model_validate, users.items)),
+        next_cursor=users.next_cursor,
     )
 
 
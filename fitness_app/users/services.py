@@ -1,10 +1,13 @@
+from typing import Optional
+
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from fitness_app.auth.services import PasswordService
+from fitness_app.auth.services import PasswordService, PrincipalCache
 from fitness_app.core.exceptions import (
     EntityAlreadyExistsException,
     EntityNotFoundException,
 )
+from fitness_app.core.pagination import CountMode
 from fitness_app.core.schemas import PageSchema
 from fitness_app.core.utils import update_model_by_schema
 from fitness_app.users.models import User
@@ -17,32 +20,38 @@ class UserService:
         self,
         password_service: PasswordService,
         user_repository: UserRepository,
+        principal_cache: PrincipalCache,
     ):
         self._password_service = password_service
         self._user_repository = user_repository
+        self._principal_cache = principal_cache
 
     async def get_all(
         self,
         session: AsyncSession,
         page: int,
         size: int,
+        cursor: Optional[str] = None,
+        count_mode: CountMode = CountMode.EXACT,
     ):
         total_products_count = await self._user_repository.count_all(
-            session,
+            session, count_mode
         )
-        users = await self._user_repository.get_all(
-            session,
-            page,
-            size,
+        users = await self._user_repository.get_all(session, page, size, cursor)
+        return PageSchema(
+            total_items_count=total_products_count,
+            items=users.items,
+            next_cursor=users.next_cursor,
         )
-        return PageSchema(total_items_count=total_products_count, items=users)
 
     async def create(self, session: AsyncSession, schema: UserCreateSchema):
         if await self._user_repository.exists_by_email(session, schema.email):
             raise EntityAlreadyExistsException("User with given login already exists")
 
         user = User(**schema.model_dump(exclude=["password"], exclude_unset=True))
-        user.password_hash = self._password_service.get_password_hash(schema.password)
+        user.password_hash = await self._password_service.get_password_hash(
+            schema.password
+        )
         user.coach_info = None
         user.customer_info = None
         await self._user_repository.save(session, user)
@@ -69,6 +78,7 @@ class UserService:
             raise EntityAlreadyExistsException("User with given login already exists")
 
         update_model_by_schema(user, schema)
+        await self._principal_cache.invalidate(session, user.id)
 
         return await self._user_repository.save(session, user)
 
@@ -79,7 +89,8 @@ class UserService:
         if user is None:
             raise EntityNotFoundException("User with given id was not found")
 
-        user.password_hash = self._password_service.get_password_hash(password)
+        user.password_hash = await self._password_service.get_password_hash(password)
+        await self._principal_cache.invalidate(session, user.id)
 
         return await self._user_repository.save(session, user)
 
@@ -88,4 +99,5 @@ class UserService:
         if user is None:
             raise EntityNotFoundException("User with given id was not found")
 
+        await self._principal_cache.invalidate(session, user.id)
         return await self._user_repository.delete(session, user)
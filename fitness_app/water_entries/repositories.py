@@ -1,8 +1,10 @@
 from datetime import date
+from typing import Iterable
 
-from sqlalchemy import exists, select
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncResult, AsyncSession
 
+from fitness_app.core.upsert import UpsertResult, upsert
 from fitness_app.water_entries.models import WaterEntry
 
 
@@ -10,28 +12,35 @@ class WaterEntryRepository:
     async def save(self, session: AsyncSession, water_entry: WaterEntry):
         session.add(water_entry)
         await session.flush()
-        await session.commit()
         return water_entry
 
+    async def upsert(
+        self,
+        session: AsyncSession,
+        user_id: int,
+        date_field: date,
+        values: dict,
+        update_columns: Iterable[str],
+    ) -> UpsertResult:
+        """Creates the entry of the day or updates the given columns of it"""
+        return await upsert(
+            session,
+            WaterEntry,
+            {"user_id": user_id, "date_field": date_field},
+            values,
+            update_columns,
+        )
+
     async def get_by_id(self, session: AsyncSession, id: int):
         return await session.get(WaterEntry, id)
 
-    async def get_by_user_id_and_date(
-        self, session: AsyncSession, user_id: int, date_field: date
-    ):
-        q = select(WaterEntry).where(
-            WaterEntry.user_id == user_id, WaterEntry.date_field == date_field
-        )
-        s = await session.execute(q)
-        return s.scalar_one_or_none()
-
     async def get_by_dates(
         self, session: AsyncSession, user_id: int, date_start: date, date_finish: date
     ):
         q = (
             select(WaterEntry)
             .where(
-                user_id == user_id,
+                WaterEntry.user_id == user_id,
                 WaterEntry.date_field >= date_start,
                 WaterEntry.date_field <= date_finish,
             )
@@ -40,13 +49,15 @@ class WaterEntryRepository:
         s = await session.execute(q)
         return s.scalars().all()
 
-    async def exists_by_user_id_and_date(
-        self, session: AsyncSession, user_id: int, date_field: date
-    ):
-        q = select(
-            exists().where(
-                WaterEntry.user_id == user_id, WaterEntry.date_field == date_field
-            )
+    async def stream_by_user_id(
+        self, session: AsyncSession, user_id: int, batch_size: int = 500
+    ) -> AsyncResult:
+        """All entries of the user as plain rows, fetched from a server-side
+        cursor in batches"""
+        statement = (
+            select(*WaterEntry.__table__.columns)
+            .where(WaterEntry.user_id == user_id)
+            .order_by(WaterEntry.date_field)
+            .execution_options(yield_per=batch_size)
         )
-        s = await session.execute(q)
-        return s.scalar_one()
+        return await session.stream(statement)
@@ -4,7 +4,8 @@ from fastapi import APIRouter, Depends, status
 
 from fitness_app.auth.dependencies import AuthenticateUser, HasPermission
 from fitness_app.auth.permissions import Authenticated
-from fitness_app.core.dependencies import DbSession, WaterEntryServiceDep
+from fitness_app.core.dependencies import DbReadSession, DbSession, WaterEntryServiceDep
+from fitness_app.rollups.schemas import RollupBucketSchema, RollupPeriod
 from fitness_app.water_entries.schemas import WaterEntryCreateSchema, WaterEntrySchema
 
 water_entries_router = APIRouter(prefix="/waters", tags=["Вода"])
@@ -22,7 +23,7 @@ water_entries_router = APIRouter(prefix="/waters", tags=["Вода"])
     dependencies=[Depends(HasPermission(Authenticated()))],
 )
 async def get_water_entries_by_dates(
-    session: DbSession,
+    session: DbReadSession,
     service: WaterEntryServiceDep,
     user: AuthenticateUser,
     date_start: date,
@@ -35,6 +36,23 @@ async def get_water_entries_by_dates(
     return water_entries
 
 
+@water_entries_router.get(
+    "/rollups",
+    summary="Получить объем воды по дням, неделям или месяцам",
+    response_model=list[RollupBucketSchema],
+    dependencies=[Depends(HasPermission(Authenticated()))],
+)
+async def get_water_rollups(
+    session: DbReadSession,
+    service: WaterEntryServiceDep,
+    user: AuthenticateUser,
+    date_start: date,
+    date_finish: date,
+    period: RollupPeriod = RollupPeriod.DAY,
+) -> list[RollupBucketSchema]:
+    return await service.get_rollups(session, user.id, period, date_start, date_finish)
+
+
 @water_entries_router.put(
     "",
     summary="Создать сущность воды за сегодня",
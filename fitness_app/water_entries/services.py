@@ -2,7 +2,8 @@ from datetime import date
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from fitness_app.core.utils import update_model_by_schema
+from fitness_app.rollups.schemas import RollupBucketSchema, RollupMetric, RollupPeriod
+from fitness_app.rollups.services import RollupService
 from fitness_app.water_entries.models import WaterEntry
 from fitness_app.water_entries.repositories import WaterEntryRepository
 from fitness_app.water_entries.schemas import WaterEntryCreateSchema
@@ -10,9 +11,13 @@ from fitness_app.water_entries.schemas import WaterEntryCreateSchema
 
 class WaterEntryService:
     def __init__(
-        self, water_entry_repository: WaterEntryRepository, goal_water_volume: int
+        self,
+        water_entry_repository: WaterEntryRepository,
+        rollup_service: RollupService,
+        goal_water_volume: int,
     ):
         self._water_entry_repository = water_entry_repository
+        self._rollup_service = rollup_service
         self._goal_water_volume = goal_water_volume
 
     async def get_by_dates(
@@ -27,20 +32,37 @@ class WaterEntryService:
     async def create_or_update(
         self, session: AsyncSession, user_id: int, schema: WaterEntryCreateSchema
     ):
-        curr_date = date.today()
-        if await self._water_entry_repository.exists_by_user_id_and_date(
-            session, user_id, curr_date
-        ):
-            waters_entry = await self._water_entry_repository.get_by_user_id_and_date(
-                session, user_id, curr_date
-            )
-            update_model_by_schema(waters_entry, schema)
-        else:
-            waters_entry = WaterEntry(
-                **schema.model_dump(),
-                user_id=user_id,
-                goal_water_volume=self._goal_water_volume,
-                date_field=curr_date,
-            )
-
-        return await self._water_entry_repository.save(session, waters_entry)
+        values = schema.model_dump()
+        waters_entry, previous_row = await self._water_entry_repository.upsert(
+            session,
+            user_id,
+            date.today(),
+            {**values, "goal_water_volume": self._goal_water_volume},
+            values.keys(),
+        )
+        previous = None
+        if previous_row is not None:
+            previous = previous_row["water_volume"], previous_row["goal_water_volume"]
+
+        await self._rollup_service.record(
+            session,
+            user_id,
+            RollupMetric.WATER,
+            waters_entry.date_field,
+            waters_entry.water_volume,
+            waters_entry.goal_water_volume,
+            previous,
+        )
+        return waters_entry
+
+    async def get_rollups(
+        self,
+        session: AsyncSession,
+        user_id: int,
+        period: RollupPeriod,
+        date_start: date,
+        date_finish: date,
+    ) -> list[RollupBucketSchema]:
+        return await self._rollup_service.get_buckets(
+            session, user_id, RollupMetric.WATER, period, date_start, date_finish
+        )
@@ -10,11 +10,12 @@ from fitness_app.core.exceptions import (
     EntityNotFoundException,
     ForbiddenException,
 )
+from fitness_app.core.pagination import KeysetPage
 from fitness_app.core.utils import update_model_by_schema
 from fitness_app.customers.services import CustomerService
 from fitness_app.exercises.services import ExerciseService
 from fitness_app.users.models import User
-from fitness_app.users.schemas import Role
+from fitness_app.users.schemas import Role, UserSchema
 from fitness_app.users.services import UserService
 from fitness_app.workouts.models import ExerciseWorkout, Workout
 from fitness_app.workouts.repositories import (
@@ -24,6 +25,8 @@ from fitness_app.workouts.repositories import (
 from fitness_app.workouts.schemas import (
     WorkoutCreateSchema,
     WorkoutFindSchema,
+    WorkoutListMode,
+    WorkoutSummarySchema,
     WorkoutUpdateSchema,
 )
 
@@ -83,27 +86,26 @@ class WorkoutService:
             )
             workout.chat_id = workout.chat.id
 
-        workout = await self._workout_repository.save(session, workout)
-
         if schema.exercise_workouts_create:
-            for exercise_workout_schema in schema.exercise_workouts_create:
+            exercises = await self._exercise_service.get_by_ids(
+                session,
+                [
+                    exercise_workout_schema.exercise_id
+                    for exercise_workout_schema in schema.exercise_workouts_create
+                ],
+            )
 
+            for exercise_workout_schema in schema.exercise_workouts_create:
                 exercise_workout = ExerciseWorkout(
                     **exercise_workout_schema.model_dump()
                 )
-                exercise_workout.workout_id = workout.id
-
-                exercise_workout.exercise = await self._exercise_service.get_by_id(
-                    session, exercise_workout_schema.exercise_id
-                )
-
-                workout.exercise_workouts.append(
-                    await self._exercise_workout_repository.save(
-                        session, exercise_workout
-                    )
-                )
+                exercise_workout.exercise = exercises[
+                    exercise_workout_schema.exercise_id
+                ]
+                workout.exercise_workouts.append(exercise_workout)
 
-        return await self._workout_repository.save(session, workout)
+        workout = await self._workout_repository.save(session, workout)
+        return await self._workout_repository.get_by_id(session, workout.id)
 
     async def get_by_id(self, session: AsyncSession, id: int):
         workout = await self._workout_repository.get_by_id(session, id)
@@ -120,31 +122,56 @@ class WorkoutService:
         find_schema: Optional[WorkoutFindSchema],
         page: int,
         size: int,
+        cursor: Optional[str] = None,
+        mode: WorkoutListMode = WorkoutListMode.FULL,
     ):
         user = await self._user_service.get_by_id(session, user_id)
+        return await self.get_workouts_by_user(
+            session, user, find_schema, page, size, cursor, mode
+        )
 
+    async def get_workouts_by_user(
+        self,
+        session: AsyncSession,
+        user: User,
+        find_schema: Optional[WorkoutFindSchema],
+        page: int,
+        size: int,
+        cursor: Optional[str] = None,
+        mode: WorkoutListMode = WorkoutListMode.FULL,
+    ):
+        """Workouts of the user, who must have coach_info or customer_info loaded
+        (as the authenticated principal does)"""
         if user.role == Role.COACH:
-            return (
-                await self._workout_repository.get_workouts_by_coach_id_or_customer_id(
-                    session=session,
-                    coach_id=user.coach_info.id,
-                    customer_id=None,
-                    find_schema=find_schema,
-                    page=page,
-                    size=size,
-                )
-            )
+            coach_id, customer_id = user.coach_info.id, None
         elif user.role == Role.CUSTOMER:
-            return (
-                await self._workout_repository.get_workouts_by_coach_id_or_customer_id(
-                    session=session,
-                    coach_id=None,
-                    customer_id=user.customer_info.id,
-                    find_schema=find_schema,
-                    page=page,
-                    size=size,
-                )
+            coach_id, customer_id = None, user.customer_info.id
+        else:
+            return None
+
+        if mode == WorkoutListMode.SUMMARY:
+            rows = await self._workout_repository.get_workout_summaries(
+                session, coach_id, customer_id, find_schema, page, size, cursor
             )
+            return KeysetPage(
+                [self._to_summary_schema(row) for row in rows.items],
+                rows.next_cursor,
+            )
+
+        return await self._workout_repository.get_workouts_by_coach_id_or_customer_id(
+            session, coach_id, customer_id, find_schema, page, size, cursor
+        )
+
+    @staticmethod
+    def _to_summary_schema(row):
+        return WorkoutSummarySchema(
+            **row._mapping,
+            participants=[
+                UserSchema.model_validate(user)
+                for user in (row.coach_user, row.customer_user)
+                if user is not None
+            ],
+        )
 
     async def update_by_id(
         self,
@@ -42,7 +42,9 @@ class Workout(Base):
     time_start: Mapped[datetime] = mapped_column(nullable=True)
 
     exercise_workouts: Mapped[Optional[list["ExerciseWorkout"]]] = relationship(
-        back_populates="workout", cascade="all, delete-orphan"
+        back_populates="workout",
+        cascade="all, delete-orphan",
+        order_by="ExerciseWorkout.num_order",
     )
     customer: Mapped["Customer"] = relationship(back_populates="workouts")
     coach: Mapped["Coach"] = relationship(back_populates="workouts")
@@ -1,43 +1,161 @@
 from typing import Optional
 
-from sqlalchemy import and_, null, or_, select
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload, selectinload
+from sqlalchemy import Select, and_, func, null, select, union_all
+from sqlalchemy.ext.asyncio import AsyncResult, AsyncSession
+from sqlalchemy.orm import aliased, joinedload, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 
 from fitness_app.chats.models import Chat
+from fitness_app.coaches.models import Coach
+from fitness_app.core.pagination import Keyset, KeysetKey
+from fitness_app.customers.models import Customer
+from fitness_app.exercises.catalogue import ExerciseCatalogue
 from fitness_app.exercises.models import Exercise
+from fitness_app.users.models import User
 from fitness_app.workouts.models import ExerciseWorkout, Workout
 from fitness_app.workouts.schemas import WorkoutFindSchema
 
 
 class WorkoutRepository:
+    def __init__(self, exercise_catalogue: ExerciseCatalogue):
+        self._exercise_catalogue = exercise_catalogue
+
+    async def _load_exercises(self, session: AsyncSession, workouts: list[Workout]):
+        """User exercises are joined to exercise_workouts, shared ones are taken
+        from the catalogue (or queried once, when it does not have them)"""
+        exercise_workouts = [
+            exercise_workout
+            for workout in workouts
+            for exercise_workout in workout.exercise_workouts
+            if exercise_workout.exercise is None
+        ]
+        exercise_ids = {
+            exercise_workout.exercise_id for exercise_workout in exercise_workouts
+        }
+        exercises = await self._exercise_catalogue.get_many(session, exercise_ids)
+
+        missing_ids = exercise_ids - exercises.keys()
+        if missing_ids:
+            statement = (
+                select(Exercise)
+                .where(Exercise.id.in_(missing_ids))
+                .options(selectinload(Exercise.photos))
+            )
+            result = await session.execute(statement)
+            for exercise in result.scalars().all():
+                self._exercise_catalogue.add(exercise)
+                exercises[exercise.id] = exercise
+
+        for exercise_workout in exercise_workouts:
+            set_committed_value(
+                exercise_workout,
+                "exercise",
+                exercises.get(exercise_workout.exercise_id),
+            )
+
+    @staticmethod
+    def _full_graph_options():
+        return (
+            joinedload(Workout.customer),
+            joinedload(Workout.coach),
+            joinedload(Workout.chat).options(selectinload(Chat.users)),
+            selectinload(Workout.exercise_workouts).options(
+                joinedload(
+                    ExerciseWorkout.exercise.and_(Exercise.user_id != null())
+                ).options(selectinload(Exercise.photos)),
+            ),
+        )
+
+    @staticmethod
+    def _get_keyset():
+        return Keyset(
+            KeysetKey(Workout.time_start, nullable=True), KeysetKey(Workout.id)
+        )
+
+    @staticmethod
+    def _owner_conditions(coach_id: Optional[int], customer_id: Optional[int]):
+        if coach_id:
+            # Own workouts without a customer and the ownerless ones. Kept as
+            # separate branches, since an OR of them can not use the indexes
+            return [
+                and_(Workout.coach_id == coach_id, Workout.customer_id == null()),
+                and_(Workout.coach_id == null(), Workout.customer_id == null()),
+            ]
+        if customer_id:
+            return [
+                and_(Workout.customer_id == customer_id, Workout.coach_id != null())
+            ]
+        return []
+
+    @staticmethod
+    def _apply_find_schema(statement: Select, find_schema: Optional[WorkoutFindSchema]):
+        if find_schema:
+            if find_schema.name:
+                statement = statement.where(Workout.name.icontains(find_schema.name))
+            if find_schema.type_connection:
+                statement = statement.where(
+                    Workout.type_connection.icontains(find_schema.type_connection)
+                )
+            if find_schema.from_time_start:
+                statement = statement.where(
+                    Workout.time_start >= find_schema.from_time_start
+                )
+            if find_schema.to_time_start:
+                statement = statement.where(
+                    Workout.time_start <= find_schema.to_time_start
+                )
+
+        return statement
+
+    def _page_workouts(
+        self,
+        statement: Select,
+        coach_id: Optional[int],
+        customer_id: Optional[int],
+        find_schema: Optional[WorkoutFindSchema],
+        page: int,
+        size: int,
+        cursor: Optional[str],
+    ):
+        keyset = self._get_keyset()
+        conditions = self._owner_conditions(coach_id, customer_id)
+        if len(conditions) > 1:
+            # Every branch reads at most a page from its own index, the union
+            # is then joined back and paged as a whole
+            branches = [
+                keyset.apply_to_branch(
+                    self._apply_find_schema(
+                        select(Workout.id).where(condition), find_schema
+                    ),
+                    page,
+                    size,
+                    cursor,
+                )
+                for condition in conditions
+            ]
+            candidates = union_all(*branches).subquery("candidates")
+            statement = statement.join(candidates, candidates.c.id == Workout.id)
+        else:
+            statement = self._apply_find_schema(
+                statement.where(*conditions), find_schema
+            )
+
+        return keyset, keyset.apply(statement, page, size, cursor)
+
     async def save(self, session: AsyncSession, workout: Workout):
         session.add(workout)
         await session.flush()
-        await session.commit()
         return workout
 
     async def get_by_id(self, session: AsyncSession, id: int):
         statement = (
-            select(Workout)
-            .where(Workout.id == id)
-            .options(
-                joinedload(Workout.customer),
-                joinedload(Workout.coach),
-                joinedload(Workout.chat).options(selectinload(Chat.users)),
-                selectinload(Workout.exercise_workouts).options(
-                    joinedload(ExerciseWorkout.exercise).options(
-                        selectinload(Exercise.photos)
-                    ),
-                    joinedload(ExerciseWorkout.workout),
-                ),
-            )
+            select(Workout).where(Workout.id == id).options(*self._full_graph_options())
         )
 
         result = await session.execute(statement)
         workout = result.scalar_one_or_none()
         if workout and workout.exercise_workouts:
-            workout.exercise_workouts.sort(key=lambda workout: workout.num_order)
+            await self._load_exercises(session, [workout])
         return workout
 
     async def get_workouts_by_coach_id_or_customer_id(
@@ -48,72 +166,98 @@ class WorkoutRepository:
         find_schema: Optional[WorkoutFindSchema],
         page: int,
         size: int,
+        cursor: Optional[str] = None,
     ):
-        statement = select(Workout)
-
-        if coach_id:
-            statement = statement.where(
-                or_(
-                    and_(Workout.coach_id == coach_id, Workout.customer_id == null()),
-                    and_(Workout.coach_id == null(), Workout.customer_id == null()),
-                )
-            )
-        elif customer_id:
-            statement = statement.where(
-                and_(Workout.coach_id.isnot(None), Workout.customer_id == customer_id)
-            )
+        keyset, statement = self._page_workouts(
+            select(Workout).options(*self._full_graph_options()),
+            coach_id,
+            customer_id,
+            find_schema,
+            page,
+            size,
+            cursor,
+        )
 
-        if find_schema:
-            if find_schema.name:
-                statement = statement.where(Workout.name.icontains(find_schema.name))
-            if find_schema.type_connection:
-                statement = statement.where(
-                    Workout.type_connection.icontains(find_schema.type_connection)
-                )
-            if find_schema.from_time_start:
-                statement = statement.where(
-                    Workout.time_start >= find_schema.from_time_start
-                )
-            if find_schema.to_time_start:
-                statement = statement.where(
-                    Workout.time_start <= find_schema.to_time_start
-                )
+        result = await session.execute(statement)
+        workouts = keyset.get_page(result.scalars().all(), size)
+        await self._load_exercises(session, workouts.items)
+        return workouts
 
+    async def get_workout_summaries(
+        self,
+        session: AsyncSession,
+        coach_id: Optional[int],
+        customer_id: Optional[int],
+        find_schema: Optional[WorkoutFindSchema],
+        page: int,
+        size: int,
+        cursor: Optional[str] = None,
+    ):
+        """Rows with the workout columns, exercises_count, coach_user and
+        customer_user, without loading the rest of the graph"""
+        coach_user = aliased(User, name="coach_user")
+        customer_user = aliased(User, name="customer_user")
+        exercises_count = (
+            select(func.count())
+            .where(ExerciseWorkout.workout_id == Workout.id)
+            .scalar_subquery()
+        )
         statement = (
-            statement.offset(page * size)
-            .limit(size)
-            .order_by(Workout.time_start)
-            .options(
-                joinedload(Workout.customer),
-                joinedload(Workout.coach),
-                joinedload(Workout.chat).options(selectinload(Chat.users)),
-                selectinload(Workout.exercise_workouts).options(
-                    joinedload(ExerciseWorkout.exercise).options(
-                        selectinload(Exercise.photos)
-                    ),
-                    joinedload(ExerciseWorkout.workout),
-                ),
+            select(
+                Workout.id,
+                Workout.coach_id,
+                Workout.customer_id,
+                Workout.chat_id,
+                Workout.name,
+                Workout.type_connection,
+                Workout.time_start,
+                exercises_count.label("exercises_count"),
+                coach_user,
+                customer_user,
             )
+            .outerjoin(Coach, Coach.id == Workout.coach_id)
+            .outerjoin(coach_user, coach_user.id == Coach.user_id)
+            .outerjoin(Customer, Customer.id == Workout.customer_id)
+            .outerjoin(customer_user, customer_user.id == Customer.user_id)
+        )
+        keyset, statement = self._page_workouts(
+            statement, coach_id, customer_id, find_schema, page, size, cursor
         )
 
         result = await session.execute(statement)
-        workouts = result.scalars().all()
-        for workout in workouts:
-            if workout.exercise_workouts:
-                workout.exercise_workouts.sort(key=lambda workout: workout.num_order)
+        return keyset.get_page(result.all(), size)
 
-        return workouts
+    async def stream_by_coach_id_or_customer_id(
+        self,
+        session: AsyncSession,
+        coach_id: Optional[int],
+        customer_id: Optional[int],
+        batch_size: int = 500,
+    ) -> AsyncResult:
+        """Columns of the workouts as plain rows, fetched from a server-side
+        cursor in batches"""
+        statement = (
+            select(*Workout.__table__.columns)
+            .where(
+                Workout.coach_id == coach_id
+                if coach_id
+                else Workout.customer_id == customer_id
+            )
+            .order_by(Workout.time_start.asc().nulls_last(), Workout.id)
+            .execution_options(yield_per=batch_size)
+        )
+        return await session.stream(statement)
 
     async def update(self, session: AsyncSession, workout: Workout):
         session.add(workout)
         await session.flush()
-        await session.commit()
         await session.refresh(workout)
+        await self._load_exercises(session, [workout])
         return workout
 
     async def delete(self, session: AsyncSession, workout: Workout):
         await session.delete(workout)
-        await session.commit()
+        await session.flush()
         return workout
 
 
@@ -121,7 +265,6 @@ class ExerciseWorkoutRepository:
     async def save(self, session: AsyncSession, exercise_workout: ExerciseWorkout):
         session.add(exercise_workout)
         await session.flush()
-        await session.commit()
         return exercise_workout
 
     async def get_by_id(self, session: AsyncSession, id: int):
@@ -141,11 +284,10 @@ class ExerciseWorkoutRepository:
     async def update(self, session: AsyncSession, exercise_workout: ExerciseWorkout):
         session.add(exercise_workout)
         await session.flush()
-        await session.commit()
         await session.refresh(exercise_workout)
         return exercise_workout
 
     async def delete(self, session: AsyncSession, exercise_workout: ExerciseWorkout):
         await session.delete(exercise_workout)
-        await session.commit()
+        await session.flush()
         return exercise_workout
@@ -1,17 +1,19 @@
 from datetime import datetime
 from typing import Annotated, Optional
 
-from fastapi import APIRouter, Depends, Path, Query, status
+from fastapi import APIRouter, Depends, Path, Query, Response, status
 
 from fitness_app.auth.dependencies import AuthenticateUser, HasPermission
 from fitness_app.auth.permissions import Authenticated
 from fitness_app.core.dependencies import (
+    DbReadSession,
     DbSession,
     ExerciseWorkoutServiceDep,
     FileEntityServiceDep,
     WorkoutServiceDep,
 )
-from fitness_app.core.utils import PageField, SizeField
+from fitness_app.core.pagination import NEXT_CURSOR_HEADER
+from fitness_app.core.utils import CursorField, PageField, SizeField
 from fitness_app.workouts.models import ExerciseWorkout, Workout
 from fitness_app.workouts.schemas import (
     ExerciseWorkoutCreateSchema,
@@ -20,35 +22,57 @@ from fitness_app.workouts.schemas import (
     TypeConnection,
     WorkoutCreateSchema,
     WorkoutFindSchema,
+    WorkoutListMode,
     WorkoutSchema,
+    WorkoutSummarySchema,
     WorkoutUpdateSchema,
 )
 
 
-async def exercise_workout_to_schema(
-    session: DbSession,
+def exercise_workout_to_schema(
     file_service: FileEntityServiceDep,
     exercise_workout: ExerciseWorkout,
 ) -> ExerciseWorkout:
 
     for photo in exercise_workout.exercise.photos:
-        photo.full_url = await file_service.get_by_filename(session, photo.filename)
+        photo.full_url = file_service.get_url(photo.filename)
 
     return exercise_workout
 
 
-async def workout_to_schema(
-    session: DbSession, file_service: FileEntityServiceDep, workout: Workout
+def workout_to_schema(
+    file_service: FileEntityServiceDep, workout: Workout
 ) -> WorkoutSchema:
 
     for exercise_workout in workout.exercise_workouts:
-        exercise_workout = await exercise_workout_to_schema(
-            session, file_service, exercise_workout
-        )
+        exercise_workout = exercise_workout_to_schema(file_service, exercise_workout)
 
     return workout
 
 
+def workouts_page_to_schema(
+    file_service: FileEntityServiceDep, response: Response, workouts
+) -> list[WorkoutSchema] | list[WorkoutSummarySchema]:
+    if workouts is None:
+        return []
+    if workouts.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = workouts.next_cursor
+    return [
+        (
+            workout
+            if isinstance(workout, WorkoutSummarySchema)
+            else workout_to_schema(file_service, workout)
+        )
+        for workout in workouts.items
+    ]
+
+
+WorkoutListModeField = Annotated[
+    WorkoutListMode,
+    Query(description="summary: только поля тренировки, число упражнений и участники"),
+]
+
+
 def get_workout_find_schema(
     name: Optional[str] = Query(None),
     type_connection: Optional[TypeConnection] = Query(None),
@@ -85,7 +109,7 @@ async def create(
     schema: WorkoutCreateSchema,
 ) -> WorkoutSchema:
     workout = await service.create(session, user, schema)
-    return await workout_to_schema(session, file_service, workout)
+    return workout_to_schema(file_service, workout)
 
 
 @workouts_router.get(
@@ -100,61 +124,61 @@ async def create(
     dependencies=[Depends(HasPermission(Authenticated()))],
 )
 async def get_by_id(
-    session: DbSession,
+    session: DbReadSession,
     service: WorkoutServiceDep,
     file_service: FileEntityServiceDep,
     id: Annotated[int, Path],
 ) -> WorkoutSchema:
     workout = await service.get_by_id(session, id)
-    return await workout_to_schema(session, file_service, workout)
+    return workout_to_schema(file_service, workout)
 
 
 @workouts_router.get(
     "/users/{user_id}",
-    response_model=list[WorkoutSchema],
+    response_model=list[WorkoutSchema] | list[WorkoutSummarySchema],
     summary="Получить список тренировок по user_id",
     dependencies=[Depends(HasPermission(Authenticated()))],
 )
 async def get_workouts_by_user_id(
-    session: DbSession,
+    response: Response,
+    session: DbReadSession,
     service: WorkoutServiceDep,
     file_service: FileEntityServiceDep,
     user_id: Annotated[int, Path],
     find_schema: Optional[WorkoutFindSchema] = Depends(get_workout_find_schema),
     page: PageField = 0,
     size: SizeField = 10,
-) -> list[WorkoutSchema]:
+    cursor: CursorField = None,
+    mode: WorkoutListModeField = WorkoutListMode.FULL,
+) -> list[WorkoutSchema] | list[WorkoutSummarySchema]:
     workouts = await service.get_workouts_by_user_id(
-        session, user_id, find_schema, page, size
+        session, user_id, find_schema, page, size, cursor, mode
     )
-    workouts_schema = [
-        await workout_to_schema(session, file_service, workout) for workout in workouts
-    ]
-    return workouts_schema
+    return workouts_page_to_schema(file_service, response, workouts)
 
 
 @workouts_router.get(
     "/users/get/me",
-    response_model=list[WorkoutSchema],
+    response_model=list[WorkoutSchema] | list[WorkoutSummarySchema],
     summary="Получить список тренировок текущего пользователя",
     dependencies=[Depends(HasPermission(Authenticated()))],
 )
 async def get_workouts_by_current_user(
-    session: DbSession,
+    response: Response,
+    session: DbReadSession,
     service: WorkoutServiceDep,
     file_service: FileEntityServiceDep,
     user: AuthenticateUser,
     find_schema: Optional[WorkoutFindSchema] = Depends(get_workout_find_schema),
     page: PageField = 0,
     size: SizeField = 10,
-) -> list[WorkoutSchema]:
-    workouts = await service.get_workouts_by_user_id(
-        session, user.id, find_schema, page, size
+    cursor: CursorField = None,
+    mode: WorkoutListModeField = WorkoutListMode.FULL,
+) -> list[WorkoutSchema] | list[WorkoutSummarySchema]:
+    workouts = await service.get_workouts_by_user(
+        session, user, find_schema, page, size, cursor, mode
     )
-    workouts_schema = [
-        await workout_to_schema(session, file_service, workout) for workout in workouts
-    ]
-    return workouts_schema
+    return workouts_page_to_schema(file_service, response, workouts)
 
 
 @workouts_router.put(
@@ -180,7 +204,7 @@ async def update_by_id(
 ) -> WorkoutSchema:
 
     workout = await service.update_by_id(session, user, schema)
-    return await workout_to_schema(session, file_service, workout)
+    return workout_to_schema(file_service, workout)
 
 
 @workouts_router.delete(
@@ -229,7 +253,7 @@ async def create_exercise_workout(
 ) -> ExerciseWorkoutSchema:
 
     exercise_workout = await service.create(session, user, schema)
-    return await exercise_workout_to_schema(session, file_service, exercise_workout)
+    return exercise_workout_to_schema(file_service, exercise_workout)
 
 
 @workouts_router.put(
@@ -255,7 +279,7 @@ async def update_exercise_workout_by_id(
 ) -> ExerciseWorkoutSchema:
 
     exercise_workout = await service.update_by_id(session, user, schema)
-    return await exercise_workout_to_schema(session, file_service, exercise_workout)
+    return exercise_workout_to_schema(file_service, exercise_workout)
 
 
 @workouts_router.delete(
@@ -8,6 +8,7 @@ from fitness_app.chats.schemas import ChatSchema
 from fitness_app.coaches.schemas import CoachSchema
 from fitness_app.customers.schemas import CustomerSchema
 from fitness_app.exercises.schemas import ExerciseSchema
+from fitness_app.users.schemas import UserSchema
 
 
 class TypeConnection(StrEnum):
@@ -82,6 +83,25 @@ class WorkoutSchema(BaseModel):
     chat: Optional["ChatSchema"] = None
 
 
+class WorkoutListMode(StrEnum):
+    FULL = "full"
+    SUMMARY = "summary"
+
+
+class WorkoutSummarySchema(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    coach_id: Optional[int] = None
+    customer_id: Optional[int] = None
+    chat_id: Optional[int] = None
+    name: str
+    type_connection: Optional[TypeConnection] = None
+    time_start: Optional[datetime] = None
+    exercises_count: int
+    participants: list[UserSchema]
+
+
 class WorkoutCreateSchema(BaseModel):
     coach_id: Optional[int] = None
     customer_id: Optional[int] = None
@@ -0,0 +1,277 @@
+import os
+import unittest
+from datetime import datetime, timedelta
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+import fitness_app.core.setup  # noqa: F401 (registers all the models)
+from fitness_app.chats.repositories import ChatRepository
+from fitness_app.coaches.models import Coach
+from fitness_app.core.migrations import SchemaMigrator
+from fitness_app.customers.models import Customer
+from fitness_app.exercises.catalogue import ExerciseCatalogue
+from fitness_app.messages.models import Message
+from fitness_app.messages.repositories import MessageRepository
+from fitness_app.users.models import User
+from fitness_app.workouts.models import Workout
+from fitness_app.workouts.repositories import WorkoutRepository
+
+DB_URL = os.environ.get("DB_URL")
+
+# Data of other users, so the planner statistics look like a real database
+BACKGROUND_STATEMENTS = [
+    """
+    INSERT INTO users (email, name, password_hash, role)
+    SELECT 'plans-user-' || g || '@example.com', 'User ' || g, '',
+        CASE WHEN g <= 20 THEN 'COACH'::role ELSE 'CUSTOMER'::role END
+    FROM generate_series(1, 200) g
+    """,
+    """
+    INSERT INTO coaches (speciality, user_id)
+    SELECT 'YOGA', id FROM users
+    WHERE email LIKE 'plans-user-%' AND role = 'COACH'
+    """,
+    """
+    INSERT INTO customers (user_id)
+    SELECT id FROM users
+    WHERE email LIKE 'plans-user-%' AND role = 'CUSTOMER'
+    """,
+    """
+    INSERT INTO chats (type, last_timestamp)
+    SELECT 'DIALOGUE', timestamp '2024-01-01' + g * interval '1 minute'
+    FROM generate_series(1, 2000) g
+    """,
+    """
+    INSERT INTO chats_users (chat_id, user_id)
+    SELECT chats.id, user_ids[1 + (chats.id * member) % cardinality(user_ids)]
+    FROM chats, generate_series(1, 2) member,
+        (
+            SELECT array_agg(id) AS user_ids FROM users
+            WHERE email LIKE 'plans-user-%'
+        ) AS background_users
+    """,
+    """
+    INSERT INTO messages (content, timestamp, files_urls, chat_id, sender_id)
+    SELECT 'Message ' || g, timestamp '2024-01-01' + g * interval '1 second',
+        '{}', chats_users.chat_id, chats_users.user_id
+    FROM generate_series(1, 10) g, chats_users
+    """,
+    """
+    INSERT INTO exercises (name)
+    SELECT 'Exercise ' || g FROM generate_series(1, 20) g
+    """,
+    """
+    INSERT INTO workouts (coach_id, customer_id, name, time_start)
+    SELECT
+        coach_ids[1 + g % cardinality(coach_ids)],
+        CASE WHEN g % 5 = 0 THEN NULL
+            ELSE customer_ids[1 + g % cardinality(customer_ids)] END,
+        'Workout ' || g,
+        timestamp '2024-01-01' + g * interval '1 hour'
+    FROM generate_series(1, 5000) g,
+        (SELECT array_agg(id) AS coach_ids FROM coaches) AS background_coaches,
+        (SELECT array_agg(id) AS customer_ids FROM customers) AS background_customers
+    """,
+]
+
+
+def _walk(plan: dict):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from _walk(child)
+
+
+def _is_full_scan(node: dict):
+    """A sequential scan, or a whole index read and filtered row by row, which
+    is what the planner falls back to when sequential scans are disabled"""
+    if node["Node Type"] == "Seq Scan":
+        return True
+    return (
+        node["Node Type"] in ("Index Scan", "Index Only Scan")
+        and "Index Cond" not in node
+        and "Filter" in node
+    )
+
+
+@unittest.skipUnless(DB_URL, "DB_URL is not set")
+class HotQueryPlansTestCase(unittest.IsolatedAsyncioTestCase):
+    """The hot queries must be answered by indexes.
+
+    Sequential scans, hash and merge joins are disabled for the planner, so
+    every table is reached through an index condition whenever a suitable
+    index exists. All the data is written in a transaction which is rolled
+    back.
+    """
+
+    async def asyncSetUp(self):
+        self.engine = create_async_engine(DB_URL)
+        await SchemaMigrator(self.engine).upgrade()
+
+        self.connection = await self.engine.connect()
+        await self.connection.begin()
+        for setting in ("enable_seqscan", "enable_hashjoin", "enable_mergejoin"):
+            await self.connection.execute(text(f"SET LOCAL {setting} = off"))
+        self.session = AsyncSession(
+            bind=self.connection, join_transaction_mode="create_savepoint"
+        )
+        await self._seed()
+
+    async def asyncTearDown(self):
+        await self.session.close()
+        await self.connection.rollback()
+        await self.connection.close()
+        await self.engine.dispose()
+
+    async def _seed(self):
+        for statement in BACKGROUND_STATEMENTS:
+            await self.session.execute(text(statement))
+
+        coach_user = User(
+            email="plans-coach@example.com",
+            name="Coach",
+            password_hash="",
+            role="COACH",
+        )
+        customer_user = User(
+            email="plans-customer@example.com",
+            name="Customer",
+            password_hash="",
+            role="CUSTOMER",
+        )
+        self.session.add_all([coach_user, customer_user])
+        await self.session.flush()
+
+        self.coach = Coach(speciality="YOGA", user_id=coach_user.id)
+        self.customer = Customer(user_id=customer_user.id)
+        self.session.add_all([self.coach, self.customer])
+        await self.session.flush()
+
+        self.user_id = customer_user.id
+        self.chat_id, _ = await ChatRepository().get_or_create_dialogue(
+            self.session, coach_user.id, customer_user.id
+        )
+        started_at = datetime(2024, 1, 1)
+        self.session.add_all(
+            Message(
+                content=f"Message {index}",
+                timestamp=started_at + timedelta(minutes=index),
+                files_urls=[],
+                chat_id=self.chat_id,
+                sender_id=self.user_id,
+            )
+            for index in range(5)
+        )
+        self.session.add_all(
+            Workout(
+                coach_id=self.coach.id,
+                customer_id=self.customer.id if index % 2 else None,
+                name=f"Workout {index}",
+                time_start=started_at + timedelta(days=index),
+            )
+            for index in range(5)
+        )
+        await self.session.flush()
+        # Every workout, the ones of the tested users included, gets exercises
+        await self.session.execute(
+            text(
+                "INSERT INTO exercise_workouts "
+                "(exercise_id, workout_id, num_order, num_sets_done, stage) "
+                "SELECT exercises.id, workouts.id, exercises.id, 0, 'MAIN' "
+                "FROM workouts, (SELECT id FROM exercises LIMIT 3) AS exercises"
+            )
+        )
+        await self.session.execute(
+            text(
+                "ANALYZE users, coaches, customers, chats, chats_users, messages, "
+                "exercises, workouts, exercise_workouts"
+            )
+        )
+
+    async def assertIndexedQueries(self, call):
+        """Runs the call and explains every SELECT it sent to the database"""
+        statements = []
+
+        def capture(connection, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith(("SELECT", "WITH")):
+                statements.append((statement, parameters))
+
+        event.listen(self.engine.sync_engine, "before_cursor_execute", capture)
+        try:
+            await call()
+        finally:
+            event.remove(self.engine.sync_engine, "before_cursor_execute", capture)
+
+        self.assertTrue(statements, "No queries were captured")
+        for statement, parameters in statements:
+            result = await self.connection.exec_driver_sql(
+                f"EXPLAIN (FORMAT JSON) {statement}", parameters
+            )
+            plan = result.scalar_one()[0]["Plan"]
+            full_scans = [
+                node.get("Index Name", node.get("Relation Name"))
+                for node in _walk(plan)
+                if _is_full_scan(node)
+            ]
+            self.assertFalse(full_scans, f"Full scan of {full_scans} in:\n{statement}")
+
+    async def test_message_page(self):
+        repository = MessageRepository()
+        page = await repository.get_messagees(self.session, self.chat_id, 0, 2)
+
+        await self.assertIndexedQueries(
+            lambda: repository.get_messagees(self.session, self.chat_id, 0, 2)
+        )
+        await self.assertIndexedQueries(
+            lambda: repository.get_messagees(
+                self.session, self.chat_id, 0, 2, page.next_cursor
+            )
+        )
+
+    async def test_messages_since(self):
+        repository = MessageRepository()
+        messages = await repository.get_messagees(self.session, self.chat_id, 0, 5)
+
+        await self.assertIndexedQueries(
+            lambda: repository.get_messages_since(
+                self.session, self.chat_id, messages.items[-1].id, None, 50
+            )
+        )
+
+    async def test_chat_membership(self):
+        repository = ChatRepository()
+
+        await self.assertIndexedQueries(
+            lambda: repository.check_membership(
+                self.session, self.chat_id, self.user_id
+            )
+        )
+
+    async def test_chat_list(self):
+        repository = ChatRepository()
+
+        await self.assertIndexedQueries(
+            lambda: repository.get_chats(self.session, self.user_id, 0, 10)
+        )
+        await self.assertIndexedQueries(
+            lambda: repository.count_chats(self.session, self.user_id)
+        )
+
+    async def test_workout_lists(self):
+        repository = WorkoutRepository(ExerciseCatalogue())
+
+        for coach_id, customer_id in (
+            (self.coach.id, None),
+            (None, self.customer.id),
+        ):
+            with self.subTest(coach_id=coach_id, customer_id=customer_id):
+                await self.assertIndexedQueries(
+                    lambda: repository.get_workouts_by_coach_id_or_customer_id(
+                        self.session, coach_id, customer_id, None, 0, 2
+                    )
+                )
+                await self.assertIndexedQueries(
+                    lambda: repository.get_workout_summaries(
+                        self.session, coach_id, customer_id, None, 0, 2
+                    )
+                )